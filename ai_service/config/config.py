@@ -14,9 +14,52 @@ LOGS_DIR = BASE_DIR / "logs"
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3000/api")
 WS_BASE_URL = os.getenv("WS_BASE_URL", "ws://localhost:3000")
 API_KEY = os.getenv("API_KEY", "")
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "5"))
+
+# Tespit gönderim (upload) ayarları
+UPLOAD_MAX_IN_FLIGHT = int(os.getenv("UPLOAD_MAX_IN_FLIGHT", "4"))
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", "1"))
+UPLOAD_FLUSH_INTERVAL = float(os.getenv("UPLOAD_FLUSH_INTERVAL", "1.0"))
+UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", "3"))
+UPLOAD_RETRY_BASE_DELAY = float(os.getenv("UPLOAD_RETRY_BASE_DELAY", "0.5"))
+UPLOAD_RETRY_MAX_DELAY = float(os.getenv("UPLOAD_RETRY_MAX_DELAY", "30"))
+SPOOL_DIR = Path(os.getenv("SPOOL_DIR", str(BASE_DIR / "spool")))
+SPOOL_MAX_BYTES = int(os.getenv("SPOOL_MAX_BYTES", str(512 * 1024 * 1024)))
+SPOOL_DRAIN_INTERVAL = float(os.getenv("SPOOL_DRAIN_INTERVAL", "15"))
+# Kayıt başına gönderilecek en fazla tespit kutusu (güvene göre en iyiler)
+PAYLOAD_MAX_DETECTIONS = int(os.getenv("PAYLOAD_MAX_DETECTIONS", "10"))
+
+# Olay klibi ayarları (uyarı anının öncesi ve sonrası kısa video)
+CLIP_ENABLED = os.getenv("CLIP_ENABLED", "false").lower() == "true"
+# Uyarıdan önce ve sonra klibe girecek süre (saniye)
+CLIP_PRE_SECONDS = float(os.getenv("CLIP_PRE_SECONDS", "5"))
+CLIP_POST_SECONDS = float(os.getenv("CLIP_POST_SECONDS", "5"))
+# Halka tampona alınan kare hızı, genişliği ve JPEG kalitesi
+CLIP_FPS = float(os.getenv("CLIP_FPS", "5"))
+CLIP_WIDTH = int(os.getenv("CLIP_WIDTH", "640"))
+CLIP_JPEG_QUALITY = int(os.getenv("CLIP_JPEG_QUALITY", "70"))
+# Kamera başına halka tampon bellek sınırı (byte)
+CLIP_BUFFER_BYTES = int(os.getenv("CLIP_BUFFER_BYTES", str(32 * 1024 * 1024)))
+# Gönderilemeyen kliplerin klasörü, boyut sınırı ve yeniden deneme aralığı (saniye)
+CLIP_DIR = Path(os.getenv("CLIP_DIR", str(BASE_DIR / "spool" / "clips")))
+CLIP_SPOOL_MAX_BYTES = int(os.getenv("CLIP_SPOOL_MAX_BYTES", str(1024 * 1024 * 1024)))
+CLIP_RETRY_INTERVAL = float(os.getenv("CLIP_RETRY_INTERVAL", "60"))
+# Klip gönderiminde parça boyutu (byte)
+CLIP_CHUNK_SIZE = int(os.getenv("CLIP_CHUNK_SIZE", str(1024 * 1024)))
 
 # Model ayarları
 DEFAULT_MODEL_PATH = os.getenv("MODEL_PATH", str(MODELS_DIR / "best.pt"))
+# Modelin giriş boyutu (kareler bu boyuta letterbox edilerek verilir)
+MODEL_INPUT_SIZE = int(os.getenv("MODEL_INPUT_SIZE", "640"))
+# Çıkarım arka ucu: "auto" (.onnx -> onnxruntime, diğerleri -> ultralytics), "ultralytics", "onnxruntime"
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "auto")
+# Çıkarım cihazı ("cpu", "cuda"); boşsa otomatik seçilir
+INFERENCE_DEVICE = os.getenv("INFERENCE_DEVICE", "")
+# Çıkarımda kullanılacak CPU thread sayısı (0 ise kütüphane varsayılanı)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))
+# Kamera açılmadan önce boş karelerle yapılacak ısınma çıkarımı sayısı
+WARMUP_RUNS = int(os.getenv("WARMUP_RUNS", "2"))
+NMS_IOU_THRESHOLD = float(os.getenv("NMS_IOU_THRESHOLD", "0.7"))
 CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.45"))
 
 # Kamera ayarları
@@ -25,13 +68,57 @@ CAMERA_ID = os.getenv("CAMERA_ID", "1")
 VENUE_ID = os.getenv("VENUE_ID", "1")
 ZONE_ID = os.getenv("ZONE_ID", "1")
 FLOOR_NUMBER = int(os.getenv("FLOOR_NUMBER", "1"))
+# Çoklu kamera modu için kamera tanımlarını içeren JSON dosyası
+CAMERAS_CONFIG = os.getenv("CAMERAS_CONFIG", "")
+# Tekil kamera için tespit bölgeleri (JSON, ör. [[100, 50, 900, 600]])
+CAMERA_ROI = os.getenv("CAMERA_ROI", "")
+# Bölgeleri örtüşen karolara bölerek çıkarım (küçük/uzak nesneler için)
+ROI_TILING = os.getenv("ROI_TILING", "false").lower() == "true"
+ROI_TILE_OVERLAP = float(os.getenv("ROI_TILE_OVERLAP", "0.2"))
+# Backend'deki kamera ayarlarının önbellek süresi (saniye, 0: backend'den alınmaz)
+CAMERA_CONFIG_TTL = float(os.getenv("CAMERA_CONFIG_TTL", "300"))
+# Backend'e erişilemediğinde kullanılan son ayarların klasörü
+CAMERA_CONFIG_CACHE_DIR = Path(os.getenv("CAMERA_CONFIG_CACHE_DIR", str(BASE_DIR / "cache" / "cameras")))
+# WebSocket bağlantısı koptuğunda yeniden bağlanma beklemesi (saniye, üstel artar, jitter'lı)
+WS_RECONNECT_BASE_DELAY = float(os.getenv("WS_RECONNECT_BASE_DELAY", "1"))
+WS_RECONNECT_MAX_DELAY = float(os.getenv("WS_RECONNECT_MAX_DELAY", "60"))
+# Bekleme süresinin sıfırlanması için bağlantının en az açık kalma süresi (saniye);
+# daha erken bir mesaj alınmışsa da sıfırlanır
+WS_STABLE_AFTER = float(os.getenv("WS_STABLE_AFTER", "30"))
+# Ping aralığı ve pong için en fazla bekleme (saniye); pong gelmezse bağlantı yenilenir
+WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.getenv("WS_PING_TIMEOUT", "20"))
+# Gönderilmeyi bekleyen en fazla bildirim sayısı ve bildirimin geçerlilik süresi (saniye)
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+WS_MESSAGE_TTL = float(os.getenv("WS_MESSAGE_TTL", "30"))
 
 # Buffer ayarları
+# Tetik için kısa pencerede bulunması gereken en az kare sayısı (yüksek FPS'te üst sınır;
+# düşük FPS'te gereken sayı gözlenen kare hızına göre WINDOW_MIN_FILL ile ölçeklenir)
 BUFFER_SIZE = int(os.getenv("BUFFER_SIZE", "15"))
 ALERT_COOLDOWN = int(os.getenv("ALERT_COOLDOWN", "10"))
 SEQUENCE_RESET_TIME = int(os.getenv("SEQUENCE_RESET_TIME", "5"))
 DETECTION_THRESHOLD = float(os.getenv("DETECTION_THRESHOLD", "0.7"))
 
+# Kayan pencere ayarları (saniye cinsinden, kare sayısından bağımsız)
+SHORT_WINDOW_SECONDS = float(os.getenv("SHORT_WINDOW_SECONDS", "1"))
+LONG_WINDOW_SECONDS = float(os.getenv("LONG_WINDOW_SECONDS", "10"))
+LONG_WINDOW_THRESHOLD = float(os.getenv("LONG_WINDOW_THRESHOLD", "0.3"))
+# Tetik açıkken kısa pencere oranı bu değerin altına düşünce kapanır (histerezis)
+DETECTION_RELEASE_THRESHOLD = float(os.getenv("DETECTION_RELEASE_THRESHOLD", "0.4"))
+# Pencere kapasitesini belirlemek için beklenen en yüksek FPS
+WINDOW_MAX_FPS = int(os.getenv("WINDOW_MAX_FPS", "60"))
+# Tetik için kısa pencerenin, gözlenen kare hızında beklenen kare sayısının en az bu oranı kadar dolu olması
+WINDOW_MIN_FILL = float(os.getenv("WINDOW_MIN_FILL", "0.8"))
+# Kare hızı ne kadar düşük olursa olsun tetik için gereken en az kare sayısı
+WINDOW_MIN_SAMPLES = int(os.getenv("WINDOW_MIN_SAMPLES", "3"))
+
+# Olay ayarları (kamera tanımında cameraId bazında değiştirilebilir)
+# Olay sürerken kaç saniyede bir ara kare (keyframe) gönderileceği
+EVENT_KEYFRAME_INTERVAL = float(os.getenv("EVENT_KEYFRAME_INTERVAL", "10"))
+# Kaç saniye tespit olmazsa olayın biteceği
+EVENT_END_TIMEOUT = float(os.getenv("EVENT_END_TIMEOUT", "5"))
+
 # Görüntü işleme ayarları
 FRAME_WIDTH = int(os.getenv("FRAME_WIDTH", "1280"))
 FRAME_HEIGHT = int(os.getenv("FRAME_HEIGHT", "720"))
@@ -39,9 +126,123 @@ BLUR_KERNEL_SIZE = (3, 3)
 BRIGHTNESS_ALPHA = 1.1
 BRIGHTNESS_BETA = 10
 
+# Hareket kontrollü çıkarım ayarları
+MOTION_GATING_ENABLED = os.getenv("MOTION_GATING_ENABLED", "true").lower() == "true"
+# Hareket kontrolünün yapıldığı küçültülmüş kare genişliği
+MOTION_DIFF_WIDTH = int(os.getenv("MOTION_DIFF_WIDTH", "160"))
+MOTION_PIXEL_THRESHOLD = int(os.getenv("MOTION_PIXEL_THRESHOLD", "25"))
+# Değişen piksel oranı bu değeri geçerse hareket var sayılır
+MOTION_AREA_THRESHOLD = float(os.getenv("MOTION_AREA_THRESHOLD", "0.002"))
+MOTION_HOLD_SECONDS = float(os.getenv("MOTION_HOLD_SECONDS", "2"))
+DETECTION_HOLD_SECONDS = float(os.getenv("DETECTION_HOLD_SECONDS", "10"))
+# Durağan sahnede modelin çalışma aralığı (saniye)
+STATIC_INFERENCE_INTERVAL = float(os.getenv("STATIC_INFERENCE_INTERVAL", "0.5"))
+# Bu kadar süre tespit yoksa durağan sahnede aralık IDLE_INFERENCE_INTERVAL'e çıkar
+IDLE_AFTER_SECONDS = float(os.getenv("IDLE_AFTER_SECONDS", "60"))
+IDLE_INFERENCE_INTERVAL = float(os.getenv("IDLE_INFERENCE_INTERVAL", "2"))
+
+# Yük uyumlu kalite kontrolü (kare gecikmesi ve CPU/RAM doluluğuna göre kalite basamakları)
+QUALITY_CONTROL_ENABLED = os.getenv("QUALITY_CONTROL_ENABLED", "true").lower() == "true"
+# Kamera başına gerçek zamanlı hedef (işlenen kare/saniye)
+QUALITY_TARGET_FPS = float(os.getenv("QUALITY_TARGET_FPS", "15"))
+# Ölçümlerin değerlendirildiği aralık (saniye) ve en yüksek ile en düşük kalite arasındaki basamak sayısı
+QUALITY_INTERVAL = float(os.getenv("QUALITY_INTERVAL", "5"))
+QUALITY_STEPS = int(os.getenv("QUALITY_STEPS", "4"))
+# En düşük basamaktaki sınırlar: model giriş boyutu (piksel), çıkarım hızı (FPS), gönderilen görüntü
+# ölçeği (%) ve JPEG kalitesi. En yüksek basamak MODEL_INPUT_SIZE, UPLOAD_IMAGE_SCALE ve JPEG_QUALITY'dir
+QUALITY_MIN_INPUT_SIZE = int(os.getenv("QUALITY_MIN_INPUT_SIZE", "320"))
+# İsteğe bağlı: en düşük basamakta kamera çözünürlüğünün FRAME_WIDTH/HEIGHT'a oranı (1.0: değiştirilmez;
+# çoğu RTSP ve dosya kaynağı çalışma sırasındaki çözünürlük değişikliğini yok sayar)
+QUALITY_MIN_RESOLUTION_SCALE = float(os.getenv("QUALITY_MIN_RESOLUTION_SCALE", "1.0"))
+QUALITY_MIN_INFERENCE_FPS = float(os.getenv("QUALITY_MIN_INFERENCE_FPS", "5"))
+QUALITY_MIN_UPLOAD_SCALE = int(os.getenv("QUALITY_MIN_UPLOAD_SCALE", "25"))
+QUALITY_MIN_JPEG_QUALITY = int(os.getenv("QUALITY_MIN_JPEG_QUALITY", "40"))
+# Histerezis: bu değerlerin üstünde kalite düşürülür, "LOW" değerlerin altında geri artırılır (%)
+QUALITY_CPU_HIGH = float(os.getenv("QUALITY_CPU_HIGH", "90"))
+QUALITY_CPU_LOW = float(os.getenv("QUALITY_CPU_LOW", "70"))
+QUALITY_RAM_HIGH = float(os.getenv("QUALITY_RAM_HIGH", "90"))
+QUALITY_RAM_LOW = float(os.getenv("QUALITY_RAM_LOW", "80"))
+# Gecikme, kare bütçesinin (1 / QUALITY_TARGET_FPS) bu oranının altındaysa kalite artırılabilir
+QUALITY_RECOVER_RATIO = float(os.getenv("QUALITY_RECOVER_RATIO", "0.6"))
+# Basamak değişimi için art arda gereken değerlendirme sayısı (düşürme / artırma)
+QUALITY_DEGRADE_AFTER = int(os.getenv("QUALITY_DEGRADE_AFTER", "2"))
+QUALITY_RECOVER_AFTER = int(os.getenv("QUALITY_RECOVER_AFTER", "6"))
+
+# Görüntüleme ayarları
+# Headless modda hiçbir GUI çağrısı (cv2.imshow/waitKey) yapılmaz
+HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+# Önizleme sunucusu (0 ise kapalı)
+PREVIEW_HOST = os.getenv("PREVIEW_HOST", "127.0.0.1")
+PREVIEW_PORT = int(os.getenv("PREVIEW_PORT", "0"))
+PREVIEW_MAX_FPS = float(os.getenv("PREVIEW_MAX_FPS", "5"))
+PREVIEW_WIDTH = int(os.getenv("PREVIEW_WIDTH", "640"))
+PREVIEW_JPEG_QUALITY = int(os.getenv("PREVIEW_JPEG_QUALITY", "70"))
+
+# Gönderilen görüntü ayarları
+# Gönderilecek görüntü varyantları (hepsi tek bir JPEG kodlamasını paylaşır).
+# Üç varyant da aynı işaretlenmiş kare olduğundan varsayılan olarak yalnızca annotatedImage gönderilir
+IMAGE_VARIANTS = [
+    variant.strip()
+    for variant in os.getenv("IMAGE_VARIANTS", "annotatedImage").split(",")
+    if variant.strip()
+]
+# "base64": görüntü JSON içinde, "binary": WebSocket binary frame / octet-stream gövde
+IMAGE_TRANSPORT = os.getenv("IMAGE_TRANSPORT", "base64")
+UPLOAD_IMAGE_SCALE = int(os.getenv("UPLOAD_IMAGE_SCALE", "50"))
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "60"))
+
+# Pipeline ayarları
+FRAME_QUEUE_SIZE = int(os.getenv("FRAME_QUEUE_SIZE", "1"))
+UPLOAD_QUEUE_SIZE = int(os.getenv("UPLOAD_QUEUE_SIZE", "8"))
+# Süreç modu: kameralar bu sayıda çıkarım sürecine paylaştırılır (0: tek süreç)
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", "0"))
+# Süreç modunda kamera başına paylaşımlı bellek kare yuvası sayısı
+SHM_FRAME_SLOTS = int(os.getenv("SHM_FRAME_SLOTS", "3"))
+PIPELINE_STATS_INTERVAL = int(os.getenv("PIPELINE_STATS_INTERVAL", "30"))
+
+# Metrik ayarları (port 0 ise /metrics sunucusu kapalı)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+SYSTEM_METRICS_INTERVAL = float(os.getenv("SYSTEM_METRICS_INTERVAL", "5"))
+
+# Sağlık kontrolü ayarları (port 0 ise /health/live ve /health/ready sunucusu kapalı)
+HEALTH_HOST = os.getenv("HEALTH_HOST", "127.0.0.1")
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", "0"))
+# Bu süre (saniye) boyunca kare okunmayan kamera yayında sayılmaz
+HEALTH_FRAME_TIMEOUT = float(os.getenv("HEALTH_FRAME_TIMEOUT", "5"))
+# Yayın başladıktan sonra bu süre (saniye) kare işlenmezse servis canlı sayılmaz
+HEALTH_STALL_TIMEOUT = float(os.getenv("HEALTH_STALL_TIMEOUT", "30"))
+# Backend'den bu süre (saniye) içinde yanıt alındıysa erişilebilir sayılır; yoksa HTTP ile sorulur
+HEALTH_BACKEND_TTL = float(os.getenv("HEALTH_BACKEND_TTL", "30"))
+
 # Ses ayarları
 ALERT_SOUND_PATH = os.getenv("ALERT_SOUND_PATH", str(BASE_DIR / "anons.mp3"))
+# Ses çıkışı: "pygame", "null" (ses çalınmaz, test için) veya boş (kapalı)
+ALERT_AUDIO_DEVICE = os.getenv("ALERT_AUDIO_DEVICE", "pygame")
+
+# Uyarı bildirim ayarları
+# Uyarının JSON olarak POST edileceği yerel adres (boşsa kapalı)
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+ALERT_WEBHOOK_TIMEOUT = float(os.getenv("ALERT_WEBHOOK_TIMEOUT", "2"))
+# Her uyarıda çalıştırılacak komut; uyarı JSON olarak stdin'den verilir (boşsa kapalı)
+ALERT_COMMAND = os.getenv("ALERT_COMMAND", "")
+ALERT_COMMAND_TIMEOUT = float(os.getenv("ALERT_COMMAND_TIMEOUT", "5"))
+# Aynı mekân ve bölgedeki kameralardan bu süre (saniye) içinde gelen uyarılar tek bildirim sayılır
+ALERT_DEDUPE_WINDOW = float(os.getenv("ALERT_DEDUPE_WINDOW", "30"))
+# Ayrı çalışan servis süreçlerinin tekilleştirme için paylaştığı klasör (boşsa yalnızca süreç içi)
+ALERT_DEDUPE_DIR = os.getenv("ALERT_DEDUPE_DIR", "")
+# Bildirilmeyi bekleyen en fazla uyarı sayısı (dolunca yeni uyarı atılır)
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "16"))
 
 # Loglama ayarları
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s" 
\ No newline at end of file
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Log kayıtları bu kuyruk üzerinden arka plan thread'inde yazılır (dolunca kayıt atılır)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Dosya rotasyonu: boyut (byte) veya zaman ("midnight", "H" gibi; boşsa boyuta göre)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
+# Aynı mesaj için saniyede izin verilen kayıt sayısı ve patlama payı (0: sınırsız, ERROR ve üzeri sınırlanmaz)
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "5"))
+LOG_RATE_BURST = int(os.getenv("LOG_RATE_BURST", "20")) 
\ No newline at end of file
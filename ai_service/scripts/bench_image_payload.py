@@ -0,0 +1,108 @@
+"""
+Tespit mesajı başına görüntü taşıma maliyetini ölçer.
+
+Eski yöntem (aynı JPEG'in üç kez base64'e çevrilip hem WebSocket hem HTTP
+için ayrı ayrı JSON'a yazılması) ile görüntü politikası seçeneklerini
+(tek kodlama + paylaşılan string, tek varyant, binary çerçeve) karşılaştırır.
+
+Kullanım (ai_service dizininden):
+    python -m scripts.bench_image_payload --frames 200
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.image_codec import (  # noqa: E402
+    encode_frame, build_image_data, attach_image, pack_binary
+)
+
+
+def make_frame(width: int, height: int) -> np.ndarray:
+    """JPEG boyutu gerçekçi olsun diye gürültülü, dokulu bir test karesi üretir"""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (9, 9), 0)
+
+
+def base_payload() -> dict:
+    return {
+        "venueId": "1", "floorNumber": 1, "zoneId": "1", "cameraId": "1",
+        "location": {"x": 0, "y": 0, "boundingBox": {"x1": 1, "y1": 2, "x2": 3, "y2": 4}, "confidence": 0.9},
+        "detectionDetails": {"confidence": 0.9, "detectionSequences": 15, "fps": 25.0}
+    }
+
+
+def legacy(frame: np.ndarray) -> int:
+    """Eski prepare_detection_data + iki kanal gönderimi"""
+    image = encode_frame(frame)
+    buffer = image.jpeg
+    payload = base_payload()
+    payload["imageData"] = {
+        "originalImage": base64.b64encode(buffer).decode('utf-8'),
+        "processedImage": base64.b64encode(buffer).decode('utf-8'),
+        "annotatedImage": base64.b64encode(buffer).decode('utf-8'),
+        "confidence": 0.9
+    }
+    ws_message = json.dumps(payload)
+    http_body = json.dumps(payload)
+    return len(ws_message) + len(http_body)
+
+
+def policy(frame: np.ndarray, variants, transport: str) -> int:
+    """Yeni görüntü politikası: tek kodlama, iki kanal aynı veriyi paylaşır"""
+    image = encode_frame(frame)
+    payload = base_payload()
+    payload["imageData"] = build_image_data(image, 0.9, variants, transport)
+    attach_image(payload, image, transport)
+    if transport == "binary":
+        message = pack_binary(payload)
+        return 2 * len(message)
+    message = json.dumps(payload)
+    return len(message) + len(json.dumps(payload))
+
+
+def run(name: str, fn, frame: np.ndarray, frames: int) -> dict:
+    start = time.process_time()
+    total_bytes = 0
+    for _ in range(frames):
+        total_bytes += fn(frame)
+    cpu = time.process_time() - start
+    return {
+        "name": name,
+        "bytesPerMessage": total_bytes // frames,
+        "cpuMsPerMessage": cpu / frames * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    frame = make_frame(args.width, args.height)
+    all_variants = ["originalImage", "processedImage", "annotatedImage"]
+    results = [
+        run("legacy (3x base64, 2x json)", legacy, frame, args.frames),
+        run("base64, 3 variants shared", lambda f: policy(f, all_variants, "base64"), frame, args.frames),
+        run("base64, annotatedImage only", lambda f: policy(f, ["annotatedImage"], "base64"), frame, args.frames),
+        run("binary frame", lambda f: policy(f, all_variants, "binary"), frame, args.frames),
+    ]
+
+    baseline = results[0]
+    for result in results:
+        result["bytesVsLegacy"] = result["bytesPerMessage"] / baseline["bytesPerMessage"]
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
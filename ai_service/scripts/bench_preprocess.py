@@ -0,0 +1,83 @@
+"""
+process_frame ön işleme yolunun kare başına süresini ve bellek ayırımlarını ölçer.
+
+Eski yol: tam çözünürlükte GaussianBlur + convertScaleAbs + işaretleme için
+frame.copy() (model ayrıca kendi içinde giriş boyutuna ölçekler).
+Yeni yol: FramePreprocessor ile giriş boyutuna letterbox, küçük görüntü
+üzerinde yerinde bulanıklaştırma/parlaklık; kopya yalnızca gönderimde.
+
+Kullanım (ai_service dizininden):
+    python -m scripts.bench_preprocess --frames 300
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.config import (  # noqa: E402
+    BLUR_KERNEL_SIZE, BRIGHTNESS_ALPHA, BRIGHTNESS_BETA, MODEL_INPUT_SIZE
+)
+from src.preprocess import FramePreprocessor  # noqa: E402
+
+
+def legacy(frame: np.ndarray):
+    processed = cv2.GaussianBlur(frame, BLUR_KERNEL_SIZE, 0)
+    processed = cv2.convertScaleAbs(processed, alpha=BRIGHTNESS_ALPHA, beta=BRIGHTNESS_BETA)
+    # Modelin kendi letterbox ölçeklemesi
+    scale = MODEL_INPUT_SIZE / max(frame.shape[:2])
+    model_input = cv2.resize(processed, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)))
+    output_frame = frame.copy()
+    return model_input, output_frame
+
+
+def measure(name: str, fn, frame: np.ndarray, frames: int) -> dict:
+    # Isınma (ilk çağrıdaki tampon ayırımları ölçüme dahil edilmez)
+    fn(frame)
+
+    tracemalloc.start()
+    start_snapshot = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn(frame)
+    elapsed = time.perf_counter() - start
+    end_snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = end_snapshot.compare_to(start_snapshot, "filename")
+    allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    return {
+        "name": name,
+        "msPerFrame": elapsed / frames * 1000,
+        "peakTracedBytes": peak,
+        "retainedBytes": allocated
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    preprocessor = FramePreprocessor()
+
+    for result in (
+        measure("legacy", legacy, frame, args.frames),
+        measure("fused", preprocessor, frame, args.frames),
+    ):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Dışa aktarılmış modelin çıktılarını .pt modeliyle örnek bir video üzerinde karşılaştırır.
+
+Her karede iki modelin kutuları IoU'ya göre eşleştirilir; eşleşme oranı,
+ortalama IoU ve güven farkları raporlanır. Sonuçlar toleransın dışındaysa
+süreç 1 koduyla çıkar.
+
+Kullanım (ai_service dizininden):
+    python -m scripts.check_parity --candidate models/best.onnx --source sample.mp4
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.config import DEFAULT_MODEL_PATH, INFERENCE_THREADS  # noqa: E402
+from src.backends import create_backend  # noqa: E402
+from src.preprocess import FramePreprocessor  # noqa: E402
+
+
+def pairwise_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4) ve (M, 4) kutular arasındaki (N, M) IoU matrisi"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+def match(reference, candidate, iou_threshold: float):
+    """Kutuları açgözlü biçimde IoU'ya göre eşleştirir"""
+    if len(reference) == 0 or len(candidate) == 0:
+        return []
+    iou = pairwise_iou(reference.boxes, candidate.boxes)
+    pairs = []
+    while True:
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] < iou_threshold:
+            break
+        pairs.append((float(iou[i, j]), abs(float(reference.confidences[i]) - float(candidate.confidences[j]))))
+        iou[i, :] = -1
+        iou[:, j] = -1
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reference", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--candidate", required=True)
+    parser.add_argument("--source", required=True, help="Örnek video dosyası")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=INFERENCE_THREADS)
+    parser.add_argument("--iou", type=float, default=0.5, help="Eşleşme için en düşük IoU")
+    parser.add_argument("--min-match-rate", type=float, default=0.95)
+    parser.add_argument("--max-conf-delta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    reference = create_backend(args.reference, device="cpu", threads=args.threads)
+    candidate = create_backend(args.candidate, device="cpu", threads=args.threads)
+    preprocessor = FramePreprocessor()
+
+    cap = cv2.VideoCapture(args.source)
+    reference_boxes = candidate_boxes = 0
+    pairs = []
+    frames = 0
+    while frames < args.frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames += 1
+        model_input = preprocessor(frame)
+        reference_result = reference.predict([model_input])[0]
+        candidate_result = candidate.predict([model_input])[0]
+        reference_boxes += len(reference_result)
+        candidate_boxes += len(candidate_result)
+        pairs.extend(match(reference_result, candidate_result, args.iou))
+    cap.release()
+
+    matched = len(pairs)
+    report = {
+        "frames": frames,
+        "referenceBoxes": reference_boxes,
+        "candidateBoxes": candidate_boxes,
+        "matched": matched,
+        "matchRate": matched / max(reference_boxes, candidate_boxes) if max(reference_boxes, candidate_boxes) else 1.0,
+        "meanIou": float(np.mean([iou for iou, _ in pairs])) if pairs else None,
+        "meanConfDelta": float(np.mean([delta for _, delta in pairs])) if pairs else None,
+        "maxConfDelta": float(np.max([delta for _, delta in pairs])) if pairs else None
+    }
+    print(json.dumps(report, indent=2))
+
+    passed = report["matchRate"] >= args.min_match_rate and (
+        report["maxConfDelta"] is None or report["maxConfDelta"] <= args.max_conf_delta
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
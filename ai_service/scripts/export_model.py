@@ -0,0 +1,74 @@
+"""
+PyTorch (.pt) modelini CPU için optimize edilmiş formatlara dönüştürür.
+
+Formatlar:
+    onnx       ONNX (onnxruntime arka ucu ile kullanılır)
+    onnx-int8  ONNX + dinamik INT8 quantization
+    openvino   OpenVINO IR dizini (ultralytics arka ucu ile kullanılır)
+
+Kullanım (ai_service dizininden):
+    python -m scripts.export_model --format onnx-int8
+    MODEL_PATH=models/best-int8.onnx python run.py
+"""
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.config import DEFAULT_MODEL_PATH, MODEL_INPUT_SIZE  # noqa: E402
+
+
+def export_onnx(model_path: Path, input_size: int) -> Path:
+    from ultralytics import YOLO
+
+    exported = YOLO(str(model_path)).export(
+        format="onnx",
+        imgsz=input_size,
+        dynamic=True,
+        simplify=True
+    )
+    return Path(exported)
+
+
+def quantize_int8(onnx_path: Path) -> Path:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = onnx_path.with_name(f"{onnx_path.stem}-int8.onnx")
+    quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QUInt8)
+    return output_path
+
+
+def export_openvino(model_path: Path, input_size: int) -> Path:
+    from ultralytics import YOLO
+
+    return Path(YOLO(str(model_path)).export(format="openvino", imgsz=input_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Kaynak .pt modeli")
+    parser.add_argument("--format", choices=["onnx", "onnx-int8", "openvino"], default="onnx")
+    parser.add_argument("--imgsz", type=int, default=MODEL_INPUT_SIZE)
+    parser.add_argument("--output", help="Çıktı yolu (varsayılan: modelin yanında)")
+    args = parser.parse_args()
+
+    model_path = Path(args.model)
+    if args.format == "openvino":
+        exported = export_openvino(model_path, args.imgsz)
+    else:
+        exported = export_onnx(model_path, args.imgsz)
+        if args.format == "onnx-int8":
+            exported = quantize_int8(exported)
+
+    if args.output:
+        shutil.move(str(exported), args.output)
+        exported = Path(args.output)
+
+    print(f"Model dışa aktarıldı: {exported}")
+    print(f"Parite kontrolü: python -m scripts.check_parity --candidate {exported} --source <video>")
+
+
+if __name__ == "__main__":
+    main()
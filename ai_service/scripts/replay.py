@@ -0,0 +1,249 @@
+"""
+Kaydedilmiş video dosyalarını veya görüntü klasörlerini DetectionService
+üzerinden oynatır ve performans ölçümlerini JSON olarak yazar.
+
+Canlı pipeline'daki yol aynen izlenir: process_frame -> handle_detections
+(metrikler, uyarı kararı, olay, prepare_detection_data).
+Servis, kaynağın FPS'ine göre ilerleyen bir saatle çalışır; böylece uyarı ve
+olay sayıları işlem hızından bağımsız ve tekrarlanabilir olur. Backend'e
+istek gönderilmez ve uyarı bildirilmez; hazırlanan veriler ve uyarılar
+kayıt nesnelerinde sayılır.
+
+Eşikler gibi diğer ayarlar ortam değişkenleriyle (config.py) değiştirilebilir.
+
+Kullanım (ai_service dizininden):
+    python -m scripts.replay kayit.mp4 --model models/best.onnx
+    python -m scripts.replay kareler/ --fps 15 --realtime --output sonuc.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.config import DEFAULT_MODEL_PATH, INFERENCE_BACKEND, INFERENCE_THREADS  # noqa: E402
+from src.backends import create_backend  # noqa: E402
+from src.cameras import default_camera  # noqa: E402
+from src.detection_service import DetectionService  # noqa: E402
+from src.image_codec import has_binary_image, inline_images, pack_binary  # noqa: E402
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+STAGES = ("process", "handle")
+
+
+class ReplayClock:
+    """Kaynak karelerle birlikte ilerleyen saat (gerçek zamandan başlar)"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.now = time.time() if start is None else start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class StubAPIClient:
+    """İstek göndermeyen API istemcisi"""
+
+    def send_ws_notification(self, detection_data: Dict[str, Any]):
+        pass
+
+    async def close_websocket(self):
+        pass
+
+
+class RecordingSink:
+    """handle_detections'ın upload kuyruğu yerine: gönderilecek veriyi ve olayları sayar"""
+
+    def __init__(self):
+        self.payloads = 0
+        self.payload_bytes = 0
+        self.events: Dict[str, int] = {}
+
+    def put(self, detection_data: Dict[str, Any]):
+        # Gerçek istemcinin göndereceği gövde boyutu
+        if has_binary_image(detection_data):
+            body = pack_binary(detection_data)
+        else:
+            body = json.dumps(inline_images(detection_data)).encode("utf-8")
+        self.payloads += 1
+        self.payload_bytes += len(body)
+        event = detection_data.get("event")
+        if event is not None:
+            self.events[event["type"]] = self.events.get(event["type"], 0) + 1
+
+
+class NullAlertDispatcher:
+    """Uyarı sesi çalmaz, bildirim göndermez; yalnızca uyarı kararlarını sayar"""
+
+    def __init__(self):
+        self.alerts = 0
+
+    def submit(self, alert) -> bool:
+        self.alerts += 1
+        return True
+
+
+def iter_frames(source: Path, default_fps: float) -> Iterator[Tuple[np.ndarray, float]]:
+    """
+    Video dosyası veya görüntü klasöründeki kareleri sırayla üretir.
+
+    Yields:
+        tuple: Kare ve kaynağın FPS değeri
+    """
+    if source.is_dir():
+        for path in sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS):
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                yield frame, default_fps
+        return
+
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise RuntimeError(f"Kaynak açılamadı: {source}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or default_fps
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame, fps
+    finally:
+        cap.release()
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples) * 1000
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": len(samples),
+        "meanMs": float(values.mean()),
+        "p50Ms": float(p50),
+        "p90Ms": float(p90),
+        "p99Ms": float(p99),
+        "maxMs": float(values.max())
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Linux'ta KB cinsindendir
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def replay(
+    service: DetectionService,
+    clock: ReplayClock,
+    sources: List[Path],
+    default_fps: float,
+    realtime: bool,
+    width: int,
+    max_frames: int
+) -> Dict[str, Any]:
+    """Kareleri servis üzerinden oynatır ve ölçümleri döndürür"""
+    timings = {stage: [] for stage in STAGES}
+    frame_times: List[float] = []
+    counts = {"frames": 0, "framesWithDetections": 0}
+    sink = RecordingSink()
+    service.alerts = NullAlertDispatcher()
+
+    started = time.perf_counter()
+    for source in sources:
+        for frame, fps in iter_frames(source, default_fps):
+            if max_frames and counts["frames"] >= max_frames:
+                break
+            frame_start = time.perf_counter()
+            if width and frame.shape[1] != width:
+                height = int(frame.shape[0] * width / frame.shape[1])
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+            start = time.perf_counter()
+            frame, detections = service.process_frame(frame)
+            timings["process"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            service.handle_detections(frame, detections, sink)
+            timings["handle"].append(time.perf_counter() - start)
+
+            counts["frames"] += 1
+            if detections:
+                counts["framesWithDetections"] += 1
+
+            elapsed = time.perf_counter() - frame_start
+            frame_times.append(elapsed)
+            clock.advance(1.0 / fps)
+            if realtime:
+                time.sleep(max(0.0, 1.0 / fps - elapsed))
+
+    wall_time = time.perf_counter() - started
+    return {
+        "frames": counts["frames"],
+        "wallTimeSeconds": wall_time,
+        "throughputFps": counts["frames"] / wall_time if wall_time > 0 else 0.0,
+        "videoSeconds": clock() - service.start_time,
+        "frameLatency": percentiles(frame_times),
+        "stages": {stage: percentiles(samples) for stage, samples in timings.items()},
+        "framesWithDetections": counts["framesWithDetections"],
+        "alerts": service.alerts.alerts,
+        "events": sink.events,
+        "payloads": sink.payloads,
+        "payloadBytes": sink.payload_bytes,
+        "scheduler": service.scheduler.get_stats(),
+        "roi": service.roi.describe() if service.roi else None,
+        "peakRssBytes": peak_rss_bytes()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("sources", nargs="+", type=Path, help="Video dosyaları veya görüntü klasörleri")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--backend", default=INFERENCE_BACKEND, help="auto, ultralytics, onnxruntime")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--threads", type=int, default=INFERENCE_THREADS)
+    parser.add_argument("--fps", type=float, default=30.0, help="Görüntü klasörleri (veya FPS bilgisi olmayan videolar) için")
+    parser.add_argument("--realtime", action="store_true", help="Kaynak FPS'ine göre beklet")
+    parser.add_argument("--width", type=int, default=0, help="Kareleri bu genişliğe ölçekle (0: değiştirme)")
+    parser.add_argument("--max-frames", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1, help="Ölçüm öncesi boş çıkarım sayısı")
+    parser.add_argument("--output", type=Path, help="Sonucu dosyaya yaz (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    backend = create_backend(args.model, backend=args.backend, device=args.device, threads=args.threads)
+    backend.warmup(args.warmup)
+
+    clock = ReplayClock()
+    service = DetectionService(default_camera(), backend=backend, api_client=StubAPIClient(), clock=clock)
+    result = replay(service, clock, args.sources, args.fps, args.realtime, args.width, args.max_frames)
+    result["config"] = {
+        "model": args.model,
+        "backend": backend.name,
+        "device": args.device,
+        "threads": args.threads,
+        "width": args.width,
+        "realtime": args.realtime,
+        "sources": [str(source) for source in args.sources]
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
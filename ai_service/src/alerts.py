@@ -0,0 +1,392 @@
+import hashlib
+import json
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from config.config import (
+    ALERT_SOUND_PATH, ALERT_AUDIO_DEVICE, ALERT_WEBHOOK_URL, ALERT_WEBHOOK_TIMEOUT,
+    ALERT_COMMAND, ALERT_COMMAND_TIMEOUT, ALERT_DEDUPE_WINDOW, ALERT_DEDUPE_DIR, ALERT_QUEUE_SIZE
+)
+from .logger import setup_logger
+from .cameras import CameraDefinition
+
+logger = setup_logger("alerts")
+
+
+@dataclass(frozen=True)
+class Alert:
+    """Bir kameranın verdiği uyarı"""
+    camera_id: str
+    venue_id: str
+    zone_id: str
+    timestamp: float
+    confidence: float
+    event_id: Optional[str] = None
+
+    @classmethod
+    def from_camera(
+        cls, camera: CameraDefinition, timestamp: float, confidence: float, event_id: Optional[str] = None
+    ) -> "Alert":
+        return cls(camera.camera_id, camera.venue_id, camera.zone_id, timestamp, confidence, event_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cameraId": self.camera_id,
+            "venueId": self.venue_id,
+            "zoneId": self.zone_id,
+            "timestamp": self.timestamp,
+            "confidence": self.confidence,
+            "eventId": self.event_id
+        }
+
+
+class PygameAudioDevice:
+    """Ses dosyasını bir kez belleğe çözer; her uyarıda bellekten çalar"""
+
+    def __init__(self):
+        self._mixer = None
+        self._sound = None
+
+    def load(self, path: Path):
+        if not Path(path).exists():
+            raise FileNotFoundError(str(path))
+        from pygame import mixer
+
+        mixer.init()
+        self._mixer = mixer
+        self._sound = mixer.Sound(str(path))
+
+    def play(self):
+        # Çalma mikser thread'inde sürer; çağrı beklemez
+        self._sound.play()
+
+    def close(self):
+        if self._mixer is not None:
+            self._mixer.quit()
+            self._mixer = None
+
+
+class NullAudioDevice:
+    """Ses çıkışı olmayan ortamlar ve testler için: çalma isteklerini yalnızca sayar"""
+
+    def __init__(self):
+        self.loaded: Optional[Path] = None
+        self.played = 0
+
+    def load(self, path: Path):
+        self.loaded = Path(path)
+
+    def play(self):
+        self.played += 1
+
+    def close(self):
+        pass
+
+
+AUDIO_DEVICES: Dict[str, Callable[[], Any]] = {
+    "pygame": PygameAudioDevice,
+    "null": NullAudioDevice
+}
+
+
+class AlertSink:
+    """Uyarı bildirim hedeflerinin ortak arayüzü"""
+
+    name = "sink"
+
+    def start(self):
+        """Başlangıçta bir kez yapılacak hazırlık"""
+
+    def send(self, alert: Alert):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class AudioSink(AlertSink):
+    """Uyarı anonsunu yerel ses cihazından çalar"""
+
+    name = "audio"
+
+    def __init__(self, device, path: Path = Path(ALERT_SOUND_PATH)):
+        self.device = device
+        self.path = Path(path)
+        self.ready = False
+
+    def start(self):
+        try:
+            self.device.load(self.path)
+            self.ready = True
+        except Exception as e:
+            logger.error(f"Ses sistemi başlatılamadı: {str(e)}")
+
+    def send(self, alert: Alert):
+        if self.ready:
+            self.device.play()
+
+    def close(self):
+        if self.ready:
+            self.device.close()
+            self.ready = False
+
+
+class WebhookSink(AlertSink):
+    """Uyarıyı JSON olarak bir HTTP adresine POST eder"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = ALERT_WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alert: Alert):
+        response = self.session.post(self.url, json=alert.to_dict(), timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class CommandSink(AlertSink):
+    """Her uyarıda komut çalıştırır; uyarı JSON olarak stdin'den verilir"""
+
+    name = "command"
+
+    def __init__(self, command: str, timeout: float = ALERT_COMMAND_TIMEOUT):
+        self.args = shlex.split(command)
+        self.timeout = timeout
+
+    def send(self, alert: Alert):
+        subprocess.run(
+            self.args,
+            input=json.dumps(alert.to_dict()).encode("utf-8"),
+            timeout=self.timeout,
+            check=True,
+            stdout=subprocess.DEVNULL
+        )
+
+
+def create_sinks() -> List[AlertSink]:
+    """Yapılandırmadaki bildirim hedeflerini oluşturur"""
+    sinks: List[AlertSink] = []
+    if ALERT_AUDIO_DEVICE:
+        device = AUDIO_DEVICES.get(ALERT_AUDIO_DEVICE)
+        if device is None:
+            logger.error(f"Bilinmeyen ses cihazı: {ALERT_AUDIO_DEVICE}")
+        else:
+            sinks.append(AudioSink(device()))
+    if ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(ALERT_WEBHOOK_URL))
+    if ALERT_COMMAND:
+        sinks.append(CommandSink(ALERT_COMMAND))
+    return sinks
+
+
+class SharedAlertLedger:
+    """
+    Bölge başına son uyarı zamanını ortak bir klasörde tutar.
+
+    Aynı mekânı izleyen ve ayrı çalışan servis süreçleri (ör. kamera başına
+    bir süreç) bu klasörü paylaşırsa bir bölge için `window` saniyede tek
+    bildirim yapılır. Her bölge için zaman damgası dosyası, O_EXCL ile
+    oluşturulan kilit dosyası altında okunup yazılır; kilidi başka bir süreç
+    tutuyorsa o süreç aynı bölge için zaten bildirim yapmaktadır.
+    """
+
+    def __init__(self, directory: Path, window: float = ALERT_DEDUPE_WINDOW, lock_timeout: float = 5.0):
+        """
+        Args:
+            directory: Süreçlerin paylaştığı klasör
+            window: Tekilleştirme süresi (saniye)
+            lock_timeout: Bu süreden eski kilit dosyası, kapanmış bir süreçten kalmış sayılır
+        """
+        self.directory = Path(directory)
+        self.window = window
+        self.lock_timeout = lock_timeout
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, venue_id: str, zone_id: str) -> Path:
+        digest = hashlib.sha1(f"{venue_id}\0{zone_id}".encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"zone_{digest}"
+
+    def _lock(self, path: Path) -> Optional[int]:
+        lock = path.with_suffix(".lock")
+        for _ in range(2):
+            try:
+                return os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - lock.stat().st_mtime < self.lock_timeout:
+                        return None
+                    lock.unlink()
+                except FileNotFoundError:
+                    pass
+        return None
+
+    def claim(self, venue_id: str, zone_id: str, now: Optional[float] = None) -> bool:
+        """
+        Bölge için bildirim hakkını alır.
+
+        Returns:
+            bool: Son `window` saniyede başka bir süreç bildirim yapmadıysa True
+        """
+        now = time.time() if now is None else now
+        path = self._path(venue_id, zone_id)
+        fd = self._lock(path)
+        if fd is None:
+            return False
+        try:
+            try:
+                last = float(path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                last = None
+            if last is not None and now - last < self.window:
+                return False
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(repr(now), encoding="utf-8")
+            os.replace(tmp_path, path)
+            return True
+        finally:
+            os.close(fd)
+            path.with_suffix(".lock").unlink(missing_ok=True)
+
+
+class AlertDispatcher:
+    """
+    Uyarıları çıkarım thread'lerinden ayrı bir thread'de bildirim hedeflerine iletir.
+
+    submit() yalnızca tekilleştirme kontrolü yapıp kuyruğa ekler; ses çalma,
+    webhook ve komut çağrıları tespit döngüsünü hiçbir zaman bekletmez.
+    Aynı mekân ve bölgedeki (venue_id, zone_id) kameralardan `window`
+    saniye içinde gelen uyarılar tek bildirim sayılır; bir kişiyi gören üç
+    kamera üç anons yaptırmaz. Süreç modunda tüm uyarılar ana süreçteki
+    dağıtıcıda toplanır; ayrı çalışan servisler arasında tekilleştirme için
+    ALERT_DEDUPE_DIR ile ortak bir SharedAlertLedger kullanılır (kontrol
+    dağıtıcı thread'inde yapılır). Hedeflerden birinin hatası diğerlerini
+    etkilemez.
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[List[AlertSink]] = None,
+        window: float = ALERT_DEDUPE_WINDOW,
+        maxsize: int = ALERT_QUEUE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+        ledger: Optional[SharedAlertLedger] = None
+    ):
+        """
+        Args:
+            sinks: Bildirim hedefleri (None ise start() sırasında yapılandırmadan oluşturulur)
+            window: Tekilleştirme süresi (saniye)
+            maxsize: Bekleyen en fazla uyarı sayısı
+            clock: Tekilleştirmede kullanılan zaman kaynağı
+            ledger: Süreçler arası tekilleştirme (None ise start() sırasında ALERT_DEDUPE_DIR'den)
+        """
+        self.sinks = sinks
+        self.ledger = ledger
+        self.window = window
+        self.clock = clock
+        self._queue: "queue.Queue[Optional[Alert]]" = queue.Queue(maxsize=max(1, maxsize))
+        self._last: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"dispatched": 0, "suppressed": 0, "dropped": 0, "failed": 0}
+
+    def start(self):
+        """Hedefleri hazırlar (ses dosyası bir kez çözülür) ve thread'i başlatır"""
+        if self._thread is not None:
+            return
+        if self.sinks is None:
+            self.sinks = create_sinks()
+        if self.ledger is None and ALERT_DEDUPE_DIR:
+            self.ledger = SharedAlertLedger(Path(ALERT_DEDUPE_DIR), self.window)
+        for sink in self.sinks:
+            sink.start()
+        self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Bekleyen uyarıları iletir, thread'i durdurur ve hedefleri kapatır"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        for sink in self.sinks:
+            sink.close()
+
+    def submit(self, alert: Alert) -> bool:
+        """
+        Uyarıyı bildirim kuyruğuna ekler (beklemez).
+
+        Returns:
+            bool: Uyarı bildirilecekse True, tekilleştirildiyse veya kuyruk doluysa False
+        """
+        key = (alert.venue_id, alert.zone_id)
+        now = self.clock()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < self.window:
+                self.stats["suppressed"] += 1
+                logger.info(
+                    "Aynı bölgede yakın zamanda uyarı verildi, tekrar bildirilmedi",
+                    extra={"camera_id": alert.camera_id, "venue_id": alert.venue_id, "zone_id": alert.zone_id}
+                )
+                return False
+            try:
+                self._queue.put_nowait(alert)
+            except queue.Full:
+                self.stats["dropped"] += 1
+                return False
+            self._last[key] = now
+        return True
+
+    def _run(self):
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                break
+            if not self._claim_shared(alert):
+                continue
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(
+                        f"Uyarı bildirilemedi: {str(e)}",
+                        extra={"sink": sink.name, "alert": asdict(alert)}
+                    )
+            self.stats["dispatched"] += 1
+
+    def _claim_shared(self, alert: Alert) -> bool:
+        """Başka bir servis süreci aynı bölge için yakın zamanda bildirim yaptıysa False"""
+        if self.ledger is None:
+            return True
+        try:
+            claimed = self.ledger.claim(alert.venue_id, alert.zone_id)
+        except OSError as e:
+            # Ortak klasöre erişilemezse uyarı kaçırılmaz, bildirilir
+            logger.error(f"Süreçler arası tekilleştirme yapılamadı: {str(e)}")
+            return True
+        if not claimed:
+            self.stats["suppressed"] += 1
+            logger.info(
+                "Aynı bölgede başka bir süreç yakın zamanda uyarı verdi, tekrar bildirilmedi",
+                extra={"camera_id": alert.camera_id, "venue_id": alert.venue_id, "zone_id": alert.zone_id}
+            )
+        return claimed
+
+
+alert_dispatcher = AlertDispatcher()
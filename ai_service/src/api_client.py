@@ -1,10 +1,16 @@
 import json
-import asyncio
-import websockets
+import math
+import time
 import requests
-from typing import Dict, Any, Optional
-from config.config import API_BASE_URL, WS_BASE_URL, API_KEY
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, Union, Callable, Awaitable
+from config.config import (
+    API_BASE_URL, WS_BASE_URL, API_KEY, REQUEST_TIMEOUT, UPLOAD_MAX_IN_FLIGHT, HEALTH_BACKEND_TTL
+)
 from .logger import setup_logger
+from .image_codec import has_binary_image, inline_images, pack_binary, summarize_payload
+from .ws_channel import WebSocketChannel
 
 logger = setup_logger("api_client")
 
@@ -16,7 +22,71 @@ class APIClient:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {API_KEY}"
         }
-        self.ws_connection = None
+        # Tek, kalıcı WebSocket bağlantısı (arka planda yönetilir)
+        self.ws_channel = WebSocketChannel(
+            f"{self.ws_base_url}/ai",
+            headers={"Authorization": f"Bearer {API_KEY}"},
+            encoder=self._encode_ws
+        )
+        
+        # Bağlantıları yeniden kullanmak için ortak oturum
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPLOAD_MAX_IN_FLIGHT)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Backend'den son yanıt alınma zamanı (gönderim, ayar çekme vb. tüm HTTP istekleri)
+        self.last_response_at: Optional[float] = None
+        self.session.hooks["response"].append(self._record_response)
+        
+    def _record_response(self, response: requests.Response, *args, **kwargs):
+        if response.status_code < 500:
+            self.last_response_at = time.monotonic()
+            
+    def backend_reachable(self, max_age: float = HEALTH_BACKEND_TTL) -> bool:
+        """
+        Backend HTTP üzerinden erişilebilir mi.
+        
+        Son `max_age` saniyede bir istek yanıt aldıysa ağa çıkılmaz;
+        aksi halde API adresine HEAD isteği gönderilir (5xx dışındaki
+        her yanıt backend'in ayakta olduğunu gösterir).
+        """
+        last = self.last_response_at
+        if last is not None and time.monotonic() - last <= max_age:
+            return True
+        try:
+            response = self.session.head(self.api_base_url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            return False
+        return response.status_code < 500
+        
+    def post_detections(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> requests.Response:
+        """
+        Tek bir tespiti veya tespit listesini (toplu gönderim) backend'e gönderir.
+        Hata durumunda istisna fırlatır; yeniden deneme kararı çağırana aittir.
+        
+        Args:
+            payload: Tespit verisi veya tespit verileri listesi
+            
+        Returns:
+            requests.Response: Backend yanıtı
+        """
+        if has_binary_image(payload):
+            # Görüntü base64'e çevrilmeden ham JPEG olarak gönderilir
+            response = self.session.post(
+                f"{self.api_base_url}/detections/binary",
+                data=pack_binary(payload),
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=REQUEST_TIMEOUT
+            )
+        else:
+            response = self.session.post(
+                f"{self.api_base_url}/detections",
+                json=inline_images(payload),
+                timeout=REQUEST_TIMEOUT
+            )
+        response.raise_for_status()
+        return response
         
     def send_detection(self, detection_data: Dict[str, Any]) -> bool:
         """
@@ -29,19 +99,42 @@ class APIClient:
             bool: Başarılı/başarısız durumu
         """
         try:
-            response = requests.post(
-                f"{self.api_base_url}/detections",
-                headers=self.headers,
-                json=detection_data
-            )
-            response.raise_for_status()
-            logger.info("Detection data sent successfully", extra={"detection": detection_data})
+            self.post_detections(detection_data)
+            logger.info("Detection data sent successfully", extra={"detection": summarize_payload(detection_data)})
             return True
         except Exception as e:
             logger.error(f"Detection data not sent: {str(e)}", 
-                        extra={"detection": detection_data, "error": str(e)})
+                        extra={"detection": summarize_payload(detection_data), "error": str(e)})
             return False
             
+    def upload_clip(self, path: Path, metadata: Dict[str, Any], chunk_size: int):
+        """
+        Olay klibini parçalar halinde gönderir; son parçada backend dosyayı birleştirir.
+        Hata durumunda istisna fırlatır (parçalar tekrar gönderilebilir).
+        
+        Args:
+            path: MP4 dosyası
+            metadata: Klip bilgileri (cameraId, eventId, zaman damgaları)
+            chunk_size: Parça boyutu (byte)
+        """
+        size = path.stat().st_size
+        count = max(1, math.ceil(size / chunk_size))
+        with open(path, "rb") as f:
+            for index in range(count):
+                response = self.session.post(
+                    f"{self.api_base_url}/detections/clips/{metadata['eventId']}/chunks",
+                    data=f.read(chunk_size),
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "X-Chunk-Index": str(index),
+                        "X-Chunk-Count": str(count),
+                        "X-Clip-Metadata": json.dumps(metadata)
+                    },
+                    timeout=REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+        logger.info("Olay klibi gönderildi", extra={"clip": metadata, "bytes": size, "chunks": count})
+        
     def get_camera_config(self, camera_id: str) -> Optional[Dict[str, Any]]:
         """
         Get camera configuration from backend.
@@ -53,9 +146,9 @@ class APIClient:
             Dict[str, Any]: Kamera konfigürasyonu veya None
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base_url}/cameras/{camera_id}",
-                headers=self.headers
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
             config = response.json()
@@ -66,42 +159,46 @@ class APIClient:
                         extra={"camera_id": camera_id, "error": str(e)})
             return None
             
-    async def connect_websocket(self):
-        """WebSocket connection starts"""
-        try:
-            self.ws_connection = await websockets.connect(
-                f"{self.ws_base_url}/ai",
-                extra_headers={"Authorization": f"Bearer {API_KEY}"}
-            )
-            logger.info("WebSocket connection successful")
-            return True
-        except Exception as e:
-            logger.error(f"WebSocket connection failed: {str(e)}")
-            return False
-            
-    async def send_ws_notification(self, notification_data: Dict[str, Any]):
+    def _encode_ws(self, notification_data: Dict[str, Any]) -> Union[str, bytes]:
+        """Bildirimi gönderim anında (ağ görevinde) kodlar"""
+        if has_binary_image(notification_data):
+            return pack_binary(notification_data)
+        return json.dumps(notification_data)
+
+    def start_websocket(self):
+        """Arka plan WebSocket bağlantı yöneticisini başlatır"""
+        self.ws_channel.start()
+
+    def send_ws_notification(self, notification_data: Dict[str, Any]):
         """
-        Send notification via WebSocket.
-        
+        Bildirimi WebSocket gönderim kuyruğuna ekler; ağı beklemez.
+
+        Olay başlangıç/bitiş bildirimleri önceliklidir. Aynı olayın henüz
+        gönderilmemiş keyframe'i ve olaysız tespitlerde aynı kameranın
+        bekleyen bildirimi yenisiyle değiştirilir.
+
         Args:
             notification_data: Bildirim verileri
         """
-        if not self.ws_connection:
-            success = await self.connect_websocket()
-            if not success:
-                return
-                
-        try:
-            await self.ws_connection.send(json.dumps(notification_data))
-            logger.info("Notification sent via WebSocket", extra={"notification": notification_data})
-        except Exception as e:
-            logger.error(f"Notification not sent via WebSocket: {str(e)}", 
-                        extra={"notification": notification_data, "error": str(e)})
-            self.ws_connection = None  # Reset connection
-            
+        event = notification_data.get("event") or {}
+        camera_id = notification_data.get("cameraId")
+        if event.get("type") in ("start", "end"):
+            priority, key = 0, None
+        elif event:
+            priority, key = 1, (camera_id, event.get("id"))
+        else:
+            priority, key = 1, (camera_id, None)
+        self.ws_channel.send(notification_data, priority, key)
+
+    def add_ws_handler(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """
+        Backend'den gelen WebSocket mesajları için handler kaydeder.
+
+        Args:
+            handler: JSON mesajı işleyen fonksiyon
+        """
+        self.ws_channel.add_handler(handler)
+
     async def close_websocket(self):
         """Close WebSocket connection"""
-        if self.ws_connection:
-            await self.ws_connection.close()
-            self.ws_connection = None
-            logger.info("WebSocket connection closed") 
\ No newline at end of file
+        await self.ws_channel.stop()
@@ -0,0 +1,257 @@
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from config.config import (
+    DEFAULT_MODEL_PATH, CONFIDENCE_THRESHOLD, MODEL_INPUT_SIZE,
+    INFERENCE_BACKEND, INFERENCE_THREADS, NMS_IOU_THRESHOLD
+)
+from .logger import setup_logger
+
+logger = setup_logger("backends")
+
+
+class InferenceResult:
+    """
+    Tek bir görüntü için model çıktısı (model giriş koordinatlarında).
+
+    Attributes:
+        boxes: (N, 4) float32 x1, y1, x2, y2
+        confidences: (N,) float32
+        class_ids: (N,) int32
+    """
+
+    def __init__(self, boxes: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray):
+        self.boxes = boxes
+        self.confidences = confidences
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls) -> "InferenceResult":
+        return cls(
+            np.empty((0, 4), dtype=np.float32),
+            np.empty((0,), dtype=np.float32),
+            np.empty((0,), dtype=np.int32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+
+class InferenceBackend:
+    """
+    Çıkarım arka uçlarının ortak arayüzü.
+
+    Attributes:
+        input_size: Yükleme sırasındaki giriş boyutu (sabit girişli modellerde tek geçerli boyut)
+        dynamic_input: Model farklı giriş boyutlarını kabul ediyorsa True
+    """
+
+    name = "base"
+    input_size = MODEL_INPUT_SIZE
+    dynamic_input = False
+
+    def input_size_for(self, requested: int) -> int:
+        """İstenen giriş boyutunu modelin kabul ettiği boyuta çevirir"""
+        return requested if self.dynamic_input else self.input_size
+
+    def predict(self, images: List[np.ndarray]) -> List[InferenceResult]:
+        """
+        Letterbox edilmiş (kare, BGR) görüntüler üzerinde tek ileri geçişle
+        çıkarım yapar. Giriş boyutu görüntülerden alınır; bir batch'teki tüm
+        görüntüler aynı boyutta olmalıdır.
+
+        Args:
+            images: Model girişleri
+
+        Returns:
+            List[InferenceResult]: Her görüntü için sonuç
+        """
+        raise NotImplementedError
+
+    def warmup(self, runs: int = 1, batch_size: int = 1):
+        """
+        Grafik kurulum maliyetini ilk gerçek kareden önce öder.
+
+        Args:
+            runs: Boş karelerle yapılacak çıkarım sayısı
+            batch_size: Çalışma sırasında beklenen batch boyutu
+        """
+        dummy = np.full((self.input_size, self.input_size, 3), 114, dtype=np.uint8)
+        for _ in range(runs):
+            self.predict([dummy] * max(1, batch_size))
+
+
+class UltralyticsBackend(InferenceBackend):
+    """
+    Ultralytics YOLO ile çıkarım (.pt ve ultralytics'in yükleyebildiği
+    OpenVINO dizinleri gibi diğer export formatları).
+    """
+
+    name = "ultralytics"
+
+    def __init__(
+        self,
+        model_path: str = DEFAULT_MODEL_PATH,
+        device: Optional[str] = None,
+        threads: int = INFERENCE_THREADS,
+        confidence: float = CONFIDENCE_THRESHOLD,
+        input_size: int = MODEL_INPUT_SIZE
+    ):
+        import torch
+        from ultralytics import YOLO
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.model = YOLO(model_path)
+        self.device = device
+        self.confidence = confidence
+        self.input_size = input_size
+        # PyTorch ağırlıkları her boyutu kabul eder; export edilmiş modeller (OpenVINO vb.)
+        # export boyutunda sabit kabul edilir
+        self.dynamic_input = Path(model_path).suffix == ".pt"
+
+    def predict(self, images: List[np.ndarray]) -> List[InferenceResult]:
+        results = self.model(
+            images,
+            conf=self.confidence,
+            imgsz=images[0].shape[0],
+            device=self.device,
+            verbose=False
+        )
+        return [
+            InferenceResult(
+                result.boxes.xyxy.cpu().numpy().astype(np.float32),
+                result.boxes.conf.cpu().numpy().astype(np.float32),
+                result.boxes.cls.cpu().numpy().astype(np.int32)
+            )
+            for result in results
+        ]
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """
+    ONNX Runtime ile CPU çıkarımı (torch gerektirmez).
+
+    YOLOv8 ONNX çıktısı (B, 4 + sınıf sayısı, aday sayısı) biçimindedir;
+    güven filtresi ve NMS burada uygulanır. INT8 quantize edilmiş modeller
+    de aynı şekilde yüklenir. Grafiğin giriş boyutu yüklemede okunur:
+    scripts/export_model.py dinamik eksenle export eder; sabit boyutlu bir
+    grafikte giriş boyutu o boyuta sabitlenir ve kalite kontrolü model
+    girişini küçültemez.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(
+        self,
+        model_path: str,
+        threads: int = INFERENCE_THREADS,
+        confidence: float = CONFIDENCE_THRESHOLD,
+        iou_threshold: float = NMS_IOU_THRESHOLD,
+        input_size: int = MODEL_INPUT_SIZE
+    ):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.confidence = confidence
+        self.iou_threshold = iou_threshold
+        self.input_size = input_size
+        # Dinamik eksenler isim (str) veya None olarak görünür
+        height, width = model_input.shape[2:4]
+        self.dynamic_input = not (isinstance(height, int) and isinstance(width, int))
+        if not self.dynamic_input:
+            self.input_size = height
+            logger.warning(
+                "ONNX grafiğinin giriş boyutu sabit; model girişi kalite basamağıyla küçültülemez",
+                extra={"inputSize": height, "modelPath": model_path}
+            )
+        self._input: Optional[np.ndarray] = None
+
+    def _to_tensor(self, images: List[np.ndarray]) -> np.ndarray:
+        """BGR uint8 HWC görüntüleri RGB float32 NCHW tensöre çevirir (tampon yeniden kullanılır)"""
+        size = images[0].shape[0]
+        shape = (len(images), 3, size, size)
+        if self._input is None or self._input.shape != shape:
+            self._input = np.empty(shape, dtype=np.float32)
+        for index, image in enumerate(images):
+            # BGR -> RGB ve HWC -> CHW
+            np.multiply(image[..., ::-1].transpose(2, 0, 1), 1 / 255.0, out=self._input[index], casting="unsafe")
+        return self._input
+
+    def _decode(self, output: np.ndarray) -> InferenceResult:
+        predictions = output.T  # (aday sayısı, 4 + sınıf sayısı)
+        scores = predictions[:, 4:]
+        class_ids = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+
+        keep = confidences >= self.confidence
+        if not keep.any():
+            return InferenceResult.empty()
+        predictions, class_ids, confidences = predictions[keep], class_ids[keep], confidences[keep]
+
+        # cx, cy, w, h -> x, y, w, h (NMSBoxes girişi) ve x1, y1, x2, y2
+        xywh = predictions[:, :4].copy()
+        xywh[:, 0] -= xywh[:, 2] / 2
+        xywh[:, 1] -= xywh[:, 3] / 2
+        indices = cv2.dnn.NMSBoxesBatched(
+            xywh.tolist(), confidences.tolist(), class_ids.tolist(),
+            self.confidence, self.iou_threshold
+        )
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        # Ultralytics ile aynı sırada (güvene göre azalan) döndür
+        indices = indices[np.argsort(-confidences[indices])]
+
+        boxes = xywh[indices]
+        boxes[:, 2] += boxes[:, 0]
+        boxes[:, 3] += boxes[:, 1]
+        return InferenceResult(
+            boxes.astype(np.float32),
+            confidences[indices].astype(np.float32),
+            class_ids[indices].astype(np.int32)
+        )
+
+    def predict(self, images: List[np.ndarray]) -> List[InferenceResult]:
+        outputs = self.session.run(None, {self.input_name: self._to_tensor(images)})[0]
+        return [self._decode(output) for output in outputs]
+
+
+def create_backend(
+    model_path: str = DEFAULT_MODEL_PATH,
+    backend: str = INFERENCE_BACKEND,
+    device: Optional[str] = None,
+    threads: int = INFERENCE_THREADS
+) -> InferenceBackend:
+    """
+    Yapılandırmaya göre çıkarım arka ucunu oluşturur.
+
+    Args:
+        model_path: Model dosyası (.pt, .onnx) veya export dizini
+        backend: "auto", "ultralytics" veya "onnxruntime"
+        device: Ultralytics için cihaz ("cpu", "cuda")
+        threads: CPU thread sayısı (0 ise kütüphane varsayılanı)
+
+    Returns:
+        InferenceBackend: Çıkarım arka ucu
+    """
+    if backend == "auto":
+        backend = "onnxruntime" if Path(model_path).suffix == ".onnx" else "ultralytics"
+
+    if backend == "onnxruntime":
+        instance = OnnxRuntimeBackend(model_path, threads=threads)
+    elif backend == "ultralytics":
+        instance = UltralyticsBackend(model_path, device=device, threads=threads)
+    else:
+        raise ValueError(f"Bilinmeyen çıkarım arka ucu: {backend}")
+
+    logger.info(f"Model yüklendi: {model_path}", extra={"backend": instance.name, "threads": threads})
+    return instance
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.config import (
+    CONFIDENCE_THRESHOLD, ALERT_COOLDOWN, DETECTION_THRESHOLD,
+    DETECTION_RELEASE_THRESHOLD, LONG_WINDOW_THRESHOLD,
+    EVENT_KEYFRAME_INTERVAL, EVENT_END_TIMEOUT, FRAME_WIDTH, FRAME_HEIGHT, CAMERA_CONFIG_TTL, CAMERA_CONFIG_CACHE_DIR
+)
+from .cameras import CameraDefinition
+from .logger import setup_logger
+
+logger = setup_logger("camera_config")
+
+# WebSocket üzerinden gelen kamera güncellemesi mesaj tipi
+CAMERA_CONFIG_MESSAGE = "camera_config"
+
+
+@dataclass(frozen=True)
+class CameraSettings:
+    """Model yeniden yüklenmeden değiştirilebilen kamera ayarları"""
+    enabled: bool = True
+    confidence_threshold: float = CONFIDENCE_THRESHOLD
+    alert_cooldown: float = ALERT_COOLDOWN
+    detection_threshold: float = DETECTION_THRESHOLD
+    release_threshold: float = DETECTION_RELEASE_THRESHOLD
+    long_window_threshold: float = LONG_WINDOW_THRESHOLD
+    event_keyframe_interval: float = EVENT_KEYFRAME_INTERVAL
+    event_end_timeout: float = EVENT_END_TIMEOUT
+    frame_width: int = FRAME_WIDTH
+    frame_height: int = FRAME_HEIGHT
+
+    @classmethod
+    def from_camera(cls, camera: CameraDefinition) -> "CameraSettings":
+        """Yerel kamera tanımından varsayılan ayarlar"""
+        return cls(
+            event_keyframe_interval=camera.event_keyframe_interval,
+            event_end_timeout=camera.event_end_timeout
+        )
+
+    def merge(self, data: Dict[str, Any]) -> "CameraSettings":
+        """
+        Backend'deki kamera kaydını (camelCase) bu ayarların üzerine uygular.
+
+        Tespit ayarları `detectionSettings` alanından, açık/kapalı durumu
+        `smokeDetectionEnabled` ve `status` alanlarından, çözünürlük
+        `detectionSettings.resolution` veya `technicalDetails.resolution`
+        ("1280x720") alanından okunur. Eksik alanlar değişmez.
+        """
+        settings = data.get("detectionSettings") or {}
+        changes: Dict[str, Any] = {}
+
+        if "smokeDetectionEnabled" in data or "status" in data:
+            changes["enabled"] = (
+                bool(data.get("smokeDetectionEnabled", True)) and
+                data.get("status", "active") == "active"
+            )
+        for key, field_name, cast in (
+            ("confidenceThreshold", "confidence_threshold", float),
+            ("alertCooldown", "alert_cooldown", float),
+            ("detectionThreshold", "detection_threshold", float),
+            ("releaseThreshold", "release_threshold", float),
+            ("longWindowThreshold", "long_window_threshold", float),
+            ("eventKeyframeInterval", "event_keyframe_interval", float),
+            ("eventEndTimeout", "event_end_timeout", float),
+        ):
+            if settings.get(key) is not None:
+                changes[field_name] = cast(settings[key])
+
+        resolution = settings.get("resolution") or (data.get("technicalDetails") or {}).get("resolution")
+        if resolution:
+            try:
+                width, height = (int(value) for value in str(resolution).lower().split("x"))
+                changes["frame_width"], changes["frame_height"] = width, height
+            except ValueError:
+                logger.warning(f"Geçersiz çözünürlük: {resolution}")
+
+        return replace(self, **changes)
+
+
+class CameraConfigStore:
+    """
+    Kamera ayarlarını backend'den alır, TTL ile önbelleğe alır ve diske yazar.
+
+    Backend'e erişilemezse bellekteki (süresi geçmiş olsa da) veya diskteki
+    son kayıt kullanılır. Güncellemeler (periyodik yenileme veya WebSocket
+    ile gelen `camera_config` mesajı) kayıtlı servislere model yeniden
+    yüklenmeden uygulanır.
+    """
+
+    def __init__(self, api_client, ttl: float = CAMERA_CONFIG_TTL, cache_dir: Path = CAMERA_CONFIG_CACHE_DIR):
+        self.api_client = api_client
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._services: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def attach(self, service):
+        """
+        Servisi kaydeder ve başlangıç ayarlarını uygular (backend'den,
+        erişilemezse diskteki son kayıttan).
+        """
+        with self._lock:
+            self._services.setdefault(service.camera.camera_id, []).append(service)
+        service.apply_settings(self.settings_for(service))
+        self._sync_backend_threshold()
+
+    def _sync_backend_threshold(self):
+        """
+        Paylaşılan modelin güven eşiğini kameraların en düşüğüne çeker;
+        her kamera kendi eşiğini postprocess'te ayrıca uygular.
+        """
+        with self._lock:
+            services = [service for group in self._services.values() for service in group]
+        thresholds: Dict[int, List[float]] = {}
+        backends = {}
+        for service in services:
+            if service.backend is not None and hasattr(service.backend, "confidence"):
+                thresholds.setdefault(id(service.backend), []).append(service.settings.confidence_threshold)
+                backends[id(service.backend)] = service.backend
+        for key, backend in backends.items():
+            backend.confidence = min(thresholds[key])
+
+    def _cache_path(self, camera_id: str) -> Path:
+        return self.cache_dir / f"{camera_id}.json"
+
+    def _write_disk(self, camera_id: str, data: Dict[str, Any]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(camera_id)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def _read_disk(self, camera_id: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(camera_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Kamera ayarları diskten okunamadı: {str(e)}", extra={"camera_id": camera_id})
+            return None
+
+    def _store(self, camera_id: str, data: Dict[str, Any]) -> bool:
+        """Kaydı önbelleğe ve diske yazar; içerik değiştiyse True döner"""
+        with self._lock:
+            previous = self._cache.get(camera_id)
+            self._cache[camera_id] = (time.monotonic(), data)
+        changed = previous is None or previous[1] != data
+        if changed:
+            try:
+                self._write_disk(camera_id, data)
+            except OSError as e:
+                logger.error(f"Kamera ayarları diske yazılamadı: {str(e)}", extra={"camera_id": camera_id})
+        return changed
+
+    def get(self, camera_id: str, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Kamera kaydını döndürür (gerekirse backend'den alır).
+
+        Args:
+            camera_id: Kamera ID'si
+            force: TTL dolmamış olsa da backend'den al
+
+        Returns:
+            Optional[Dict[str, Any]]: Kamera kaydı veya None
+        """
+        with self._lock:
+            cached = self._cache.get(camera_id)
+        if cached is not None and not force and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        if self.enabled:
+            data = self.api_client.get_camera_config(camera_id)
+            if data is not None:
+                self._store(camera_id, data)
+                return data
+
+        # Backend'e erişilemedi: önce bellekteki, sonra diskteki son kayıt
+        if cached is not None:
+            return cached[1]
+        data = self._read_disk(camera_id)
+        if data is not None:
+            logger.warning("Kamera ayarları diskteki kayıttan yüklendi", extra={"camera_id": camera_id})
+            with self._lock:
+                self._cache[camera_id] = (0.0, data)
+        return data
+
+    def settings_for(self, service) -> "CameraSettings":
+        """Servisin kamerası için güncel ayarları döndürür"""
+        base = CameraSettings.from_camera(service.camera)
+        data = self.get(service.camera.camera_id)
+        return base.merge(data) if data else base
+
+    def apply(self, camera_id: str, data: Dict[str, Any]):
+        """Kaydı bu kameranın servislerine uygular"""
+        with self._lock:
+            services = list(self._services.get(camera_id, []))
+        for service in services:
+            service.apply_settings(CameraSettings.from_camera(service.camera).merge(data))
+        if services:
+            self._sync_backend_threshold()
+            logger.info("Kamera ayarları güncellendi", extra={"camera_id": camera_id})
+
+    async def refresh_loop(self):
+        """TTL dolduğunda kayıtlı kameraların ayarlarını yeniler"""
+        while True:
+            await asyncio.sleep(self.ttl)
+            with self._lock:
+                camera_ids = list(self._services)
+            for camera_id in camera_ids:
+                data = await asyncio.to_thread(self.api_client.get_camera_config, camera_id)
+                if data is not None and self._store(camera_id, data):
+                    self.apply(camera_id, data)
+
+    async def handle_message(self, message: Dict[str, Any]):
+        """WebSocket üzerinden gelen kamera güncellemesini uygular"""
+        if message.get("type") != CAMERA_CONFIG_MESSAGE:
+            return
+        data = message.get("data") or {}
+        camera_id = str(data.get("id", ""))
+        with self._lock:
+            known = camera_id in self._services
+        if known and self._store(camera_id, data):
+            self.apply(camera_id, data)
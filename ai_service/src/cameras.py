@@ -0,0 +1,83 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+from config.config import (
+    CAMERAS_CONFIG, CAMERA_SOURCE, CAMERA_ID, VENUE_ID, ZONE_ID, FLOOR_NUMBER,
+    EVENT_KEYFRAME_INTERVAL, EVENT_END_TIMEOUT, CAMERA_ROI, ROI_TILING
+)
+
+
+@dataclass
+class CameraDefinition:
+    """Bir kamera akışının kimlik ve kaynak bilgileri"""
+    camera_id: str
+    venue_id: str
+    zone_id: str
+    floor_number: int
+    source: str
+    event_keyframe_interval: float = EVENT_KEYFRAME_INTERVAL
+    event_end_timeout: float = EVENT_END_TIMEOUT
+    # Tespit bölgeleri: [x1, y1, x2, y2] dikdörtgenler veya [[x, y], ...] çokgenler
+    roi: List[Any] = field(default_factory=list)
+    # Bölgeleri model giriş boyutunda karolara böl (küçük nesneler için)
+    roi_tiling: bool = ROI_TILING
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CameraDefinition":
+        """
+        Backend'deki alan isimleriyle (camelCase) gelen tanımdan nesne oluşturur.
+        Eksik alanlar config.py'deki varsayılanlarla doldurulur.
+        """
+        return cls(
+            camera_id=str(data.get("cameraId", CAMERA_ID)),
+            venue_id=str(data.get("venueId", VENUE_ID)),
+            zone_id=str(data.get("zoneId", ZONE_ID)),
+            floor_number=int(data.get("floorNumber", FLOOR_NUMBER)),
+            source=str(data.get("source", CAMERA_SOURCE)),
+            event_keyframe_interval=float(data.get("eventKeyframeInterval", EVENT_KEYFRAME_INTERVAL)),
+            event_end_timeout=float(data.get("eventEndTimeout", EVENT_END_TIMEOUT)),
+            roi=list(data.get("roi", [])),
+            roi_tiling=bool(data.get("roiTiling", ROI_TILING))
+        )
+
+    def open_capture_source(self):
+        """cv2.VideoCapture'a verilecek kaynağı döndürür (kamera indeksi veya URL)"""
+        return int(self.source) if self.source.isnumeric() else self.source
+
+
+def default_camera() -> CameraDefinition:
+    """Ortam değişkenlerinden tanımlanan tekil kamera"""
+    return CameraDefinition(
+        camera_id=CAMERA_ID,
+        venue_id=VENUE_ID,
+        zone_id=ZONE_ID,
+        floor_number=FLOOR_NUMBER,
+        source=CAMERA_SOURCE,
+        roi=json.loads(CAMERA_ROI) if CAMERA_ROI else []
+    )
+
+
+def load_camera_definitions() -> List[CameraDefinition]:
+    """
+    Kamera tanımlarını yükler.
+
+    CAMERAS_CONFIG bir JSON dosyasını gösteriyorsa dosyadaki liste kullanılır,
+    aksi halde ortam değişkenlerindeki tekil kamera döndürülür.
+
+    Returns:
+        List[CameraDefinition]: Kamera tanımları
+    """
+    if not CAMERAS_CONFIG:
+        return [default_camera()]
+
+    with open(Path(CAMERAS_CONFIG), encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get("cameras", [])
+    cameras = [CameraDefinition.from_dict(item) for item in data]
+    if not cameras:
+        raise ValueError(f"Kamera tanımı bulunamadı: {CAMERAS_CONFIG}")
+    return cameras
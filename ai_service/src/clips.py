@@ -0,0 +1,311 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import (
+    CLIP_PRE_SECONDS, CLIP_POST_SECONDS, CLIP_FPS, CLIP_WIDTH, CLIP_JPEG_QUALITY,
+    CLIP_BUFFER_BYTES, CLIP_DIR, CLIP_SPOOL_MAX_BYTES, CLIP_RETRY_INTERVAL, CLIP_CHUNK_SIZE
+)
+from .logger import setup_logger
+from .uploader import _is_retryable
+
+logger = setup_logger("clips")
+
+
+class FrameRingBuffer:
+    """
+    Bir kameranın son karelerini sıkıştırılmış (JPEG) olarak tutan halka tampon.
+
+    Kareler `fps` hızına seyreltilir ve `width` genişliğe küçültülür. Toplam
+    boyut `budget_bytes`'ı veya en eski kare `max_age` saniyeyi aşarsa en
+    eski kareler atılır; bellek kullanımı kamera başına sabit kalır.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = CLIP_BUFFER_BYTES,
+        fps: float = CLIP_FPS,
+        width: int = CLIP_WIDTH,
+        quality: int = CLIP_JPEG_QUALITY,
+        max_age: float = CLIP_PRE_SECONDS + CLIP_POST_SECONDS
+    ):
+        self.budget_bytes = budget_bytes
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.width = width
+        self.quality = quality
+        self.max_age = max_age
+        self._frames: Deque[Tuple[float, bytes]] = deque()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def push(self, frame: np.ndarray, timestamp: float) -> bool:
+        """
+        Kareyi (sıradaki örnekleme anı geldiyse) sıkıştırıp ekler.
+
+        Returns:
+            bool: Kare eklendiyse True
+        """
+        if self._frames and timestamp - self._frames[-1][0] < self.interval:
+            return False
+        if self.width and frame.shape[1] > self.width:
+            height = int(frame.shape[0] * self.width / frame.shape[1])
+            frame = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return False
+        data = encoded.tobytes()
+
+        with self._lock:
+            self._frames.append((timestamp, data))
+            self.nbytes += len(data)
+            while self._frames and (
+                self.nbytes > self.budget_bytes or timestamp - self._frames[0][0] > self.max_age
+            ):
+                _, old = self._frames.popleft()
+                self.nbytes -= len(old)
+                self.evicted += 1
+        return True
+
+    def between(self, start: float, end: float) -> List[Tuple[float, bytes]]:
+        """[start, end] aralığındaki kareler (eskiden yeniye)"""
+        with self._lock:
+            return [(timestamp, data) for timestamp, data in self._frames if start <= timestamp <= end]
+
+
+class ClipRecorder:
+    """
+    Uyarı anının `pre` saniye öncesini ve `post` saniye sonrasını kapsayan
+    klibi hazırlar.
+
+    Kareler capture thread'inde halka tampona eklenir. Tetiklenen klip,
+    bitiş anından sonraki ilk karede tampondan alınır ve kodlanması için
+    ClipWriter'a verilir; çıkarım thread'inde video kodlanmaz.
+    """
+
+    def __init__(
+        self,
+        camera_id: str,
+        writer: "ClipWriter",
+        buffer: Optional[FrameRingBuffer] = None,
+        pre: float = CLIP_PRE_SECONDS,
+        post: float = CLIP_POST_SECONDS
+    ):
+        self.camera_id = camera_id
+        self.writer = writer
+        self.buffer = buffer if buffer is not None else FrameRingBuffer(max_age=pre + post)
+        self.pre = pre
+        self.post = post
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_frame(self, frame: np.ndarray, timestamp: float):
+        """Capture thread'inden her karede çağrılır"""
+        self.buffer.push(frame, timestamp)
+        if not self._pending:
+            return
+        with self._lock:
+            due = [(event_id, at) for event_id, at in self._pending.items() if timestamp >= at + self.post]
+            for event_id, _ in due:
+                del self._pending[event_id]
+        for event_id, at in due:
+            frames = self.buffer.between(at - self.pre, at + self.post)
+            self.writer.submit(self.camera_id, event_id, at, frames)
+
+    def trigger(self, event_id: str, timestamp: float):
+        """Uyarı anında çağrılır; klip `post` saniye sonra hazırlanır"""
+        with self._lock:
+            self._pending.setdefault(event_id, timestamp)
+
+
+class ClipWriter:
+    """
+    Klipleri arka plan thread'inde MP4'e kodlar ve backend'e parça parça gönderir.
+
+    Kodlanan klip önce CLIP_DIR'e yazılır (yanında .json metadata); gönderim
+    başarılı olursa silinir, olmazsa diskte kalır ve CLIP_RETRY_INTERVAL'de
+    bir tekrar denenir (kuyruk boşalmasını beklemeden, geçen süreye göre).
+    Backend'in kalıcı olarak reddettiği veya metadata'sı okunamayan klipler
+    `rejected/` klasörüne taşınır; sıradaki kliplerin gönderimini engellemez.
+    Klasör boyutu CLIP_SPOOL_MAX_BYTES'ı aşarsa en eski klipler silinir.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CLIP_DIR,
+        max_bytes: int = CLIP_SPOOL_MAX_BYTES,
+        retry_interval: float = CLIP_RETRY_INTERVAL,
+        chunk_size: int = CLIP_CHUNK_SIZE,
+        fps: float = CLIP_FPS
+    ):
+        self.directory = Path(directory)
+        self.rejected_directory = self.directory / "rejected"
+        self.max_bytes = max_bytes
+        self.retry_interval = retry_interval
+        self.chunk_size = chunk_size
+        self.fps = fps
+        self.api_client = None
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"encoded": 0, "uploaded": 0, "spooled": 0, "rejected": 0, "failed": 0}
+
+    def start(self, api_client=None):
+        """
+        Args:
+            api_client: Klipleri gönderecek istemci (None ise yalnızca diske yazılır)
+        """
+        if self._thread is not None:
+            return
+        self.api_client = api_client
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="clip-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Sıradaki klipleri bitirir ve thread'i durdurur"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, camera_id: str, event_id: str, triggered_at: float, frames: List[Tuple[float, bytes]]):
+        """Klibi kodlama kuyruğuna ekler (beklemez)"""
+        if not frames:
+            return
+        self._queue.put((camera_id, event_id, triggered_at, frames))
+
+    def _run(self):
+        self._retry_pending()
+        next_retry = time.monotonic() + self.retry_interval
+        while True:
+            try:
+                job = self._queue.get(timeout=max(0.0, next_retry - time.monotonic()))
+            except queue.Empty:
+                job = ()
+            if job is None:
+                break
+            if job:
+                try:
+                    path = self._encode(*job)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(f"Klip kodlanamadı: {str(e)}", extra={"camera_id": job[0], "event_id": job[1]})
+                else:
+                    self._upload(path)
+            # Sürekli klip gelse de bekleyenler süresi dolunca tekrar denenir
+            if time.monotonic() >= next_retry:
+                self._retry_pending()
+                next_retry = time.monotonic() + self.retry_interval
+
+    def _encode(self, camera_id: str, event_id: str, triggered_at: float, frames: List[Tuple[float, bytes]]) -> Path:
+        """Kareleri MP4'e yazar ve metadata dosyasını oluşturur"""
+        first = cv2.imdecode(np.frombuffer(frames[0][1], dtype=np.uint8), cv2.IMREAD_COLOR)
+        height, width = first.shape[:2]
+        path = self.directory / f"{camera_id}_{event_id}.mp4"
+        tmp_path = path.with_suffix(".tmp.mp4")
+        writer = cv2.VideoWriter(str(tmp_path), cv2.VideoWriter_fourcc(*"mp4v"), self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError("VideoWriter açılamadı")
+        try:
+            for _, data in frames:
+                image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if image.shape[:2] != (height, width):
+                    image = cv2.resize(image, (width, height))
+                writer.write(image)
+        finally:
+            writer.release()
+        os.replace(tmp_path, path)
+
+        metadata = {
+            "cameraId": camera_id,
+            "eventId": event_id,
+            "triggeredAt": triggered_at,
+            "startedAt": frames[0][0],
+            "endedAt": frames[-1][0],
+            "frameCount": len(frames),
+            "fps": self.fps
+        }
+        path.with_suffix(".json").write_text(json.dumps(metadata), encoding="utf-8")
+        self.stats["encoded"] += 1
+        logger.info("Olay klibi kaydedildi", extra={"clip": metadata, "bytes": path.stat().st_size})
+        self._enforce_limit()
+        return path
+
+    def _upload(self, path: Path, retry: bool = False) -> bool:
+        """
+        Returns:
+            bool: Klip gönderildi veya reddedildiyse True; tekrar denenecekse False
+        """
+        if self.api_client is None:
+            self.stats["spooled"] += 1
+            return False
+        try:
+            metadata = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self._reject(path, f"Klip metadata'sı okunamadı: {str(e)}")
+            return True
+        try:
+            self.api_client.upload_clip(path, metadata, self.chunk_size)
+        except Exception as e:
+            if not _is_retryable(e):
+                self._reject(path, f"Klip backend tarafından reddedildi: {str(e)}")
+                return True
+            if not retry:
+                self.stats["spooled"] += 1
+            logger.error(f"Klip gönderilemedi, diskte bekletiliyor: {str(e)}", extra={"clip": path.name})
+            return False
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+        self.stats["uploaded"] += 1
+        return True
+
+    def _reject(self, path: Path, reason: str):
+        """Klibi tekrar denenmemek üzere rejected/ klasörüne taşır"""
+        self.rejected_directory.mkdir(parents=True, exist_ok=True)
+        for file in (path, path.with_suffix(".json")):
+            try:
+                os.replace(file, self.rejected_directory / file.name)
+            except FileNotFoundError:
+                pass
+        self.stats["rejected"] += 1
+        logger.error(reason, extra={"clip": path.name})
+
+    def pending_files(self) -> List[Path]:
+        """Gönderilmeyi bekleyen klipler (eskiden yeniye)"""
+        return sorted(
+            (path for path in self.directory.glob("*.mp4") if not path.name.endswith(".tmp.mp4")),
+            key=lambda path: path.stat().st_mtime
+        )
+
+    def _retry_pending(self):
+        if self.api_client is None:
+            return
+        for path in self.pending_files():
+            # Yalnızca tekrar denenebilir bir hata (ör. backend erişilemez) sırayı durdurur
+            if not self._upload(path, retry=True):
+                break
+
+    def _enforce_limit(self):
+        files = self.pending_files()
+        total = sum(path.stat().st_size for path in files)
+        while files and total > self.max_bytes:
+            oldest = files.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            oldest.with_suffix(".json").unlink(missing_ok=True)
+            logger.warning("Klip klasörü boyut sınırı aşıldı, en eski klip silindi", extra={"clip": oldest.name})
+
+
+clip_writer = ClipWriter()
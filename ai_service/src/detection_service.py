@@ -1,42 +1,92 @@
 import cv2
-import torch
 import time
 import asyncio
-import base64
 import numpy as np
-from pathlib import Path
-from ultralytics import YOLO
-from typing import Dict, Any, Optional, List
-from pygame import mixer
-import psutil
+from typing import Dict, Any, Optional, List, Callable
 
 from config.config import (
-    DEFAULT_MODEL_PATH, CONFIDENCE_THRESHOLD, CAMERA_SOURCE,
-    CAMERA_ID, VENUE_ID, ZONE_ID, FLOOR_NUMBER,
-    BUFFER_SIZE, ALERT_COOLDOWN, SEQUENCE_RESET_TIME, DETECTION_THRESHOLD,
-    FRAME_WIDTH, FRAME_HEIGHT, BLUR_KERNEL_SIZE,
-    BRIGHTNESS_ALPHA, BRIGHTNESS_BETA, ALERT_SOUND_PATH
+    DEFAULT_MODEL_PATH, SEQUENCE_RESET_TIME, HEADLESS, WARMUP_RUNS, CLIP_ENABLED, PAYLOAD_MAX_DETECTIONS
 )
 from .logger import setup_logger
 from .api_client import APIClient
+from .backends import InferenceBackend, InferenceResult, create_backend
+from .pipeline import FramePipeline
+from .cameras import CameraDefinition, default_camera
+from .windows import DetectionWindows
+from .scheduler import InferenceScheduler
+from .preprocess import FramePreprocessor
+from .roi import RoiPlanner
+from .detections import DetectionBatch
+from .events import DetectionEvent, DetectionEventAggregator
+from .image_codec import encode_frame, build_image_data, attach_image
+from .metrics import CameraMetrics, system_metrics
+from .camera_config import CameraConfigStore, CameraSettings
+from .health import health, start_health_server
+from .clips import ClipRecorder, clip_writer
+from .quality import QualityController, QualityLevel, build_levels
+from .alerts import Alert, alert_dispatcher
 
 logger = setup_logger("detection_service")
 
 class DetectionService:
-    def __init__(self):
-        self.model = None
+    def __init__(
+        self,
+        camera: Optional[CameraDefinition] = None,
+        backend: Optional[InferenceBackend] = None,
+        api_client: Optional[APIClient] = None,
+        device: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        config_store: Optional[CameraConfigStore] = None
+    ):
+        """
+        Args:
+            camera: Kamera tanımı (verilmezse ortam değişkenlerindeki kamera)
+            backend: Paylaşılan çıkarım arka ucu (çoklu kamera modunda tek model kullanılır)
+            api_client: Paylaşılan API istemcisi
+            device: Çıkarım cihazı ("cpu", "cuda")
+            clock: Zaman kaynağı (kayıt tekrarında video zamanı verilebilir)
+            config_store: Paylaşılan kamera ayarları önbelleği
+        """
+        self.clock = clock
+        self.camera = camera or default_camera()
+        self.backend = backend
+        self.device = device
         self.cap = None
-        self.api_client = APIClient()
-        self.detection_buffer = []
+        self.pipeline = None
+        self.api_client = api_client or APIClient()
+        self.metrics = CameraMetrics(self.camera.camera_id)
+        self.config_store = config_store or CameraConfigStore(self.api_client)
+        self.settings = CameraSettings.from_camera(self.camera)
+        self.pending_resolution: Optional[tuple] = None
+        # Uyarılar ortak dağıtıcıya verilir (ses, webhook, komut; bölge bazında tekilleştirme)
+        self.alerts = alert_dispatcher
+        # Uyarı öncesi/sonrası klip için kamera başına halka tampon
+        self.clip_recorder = ClipRecorder(self.camera.camera_id, clip_writer) if CLIP_ENABLED else None
+        self.detection_windows = DetectionWindows()
+        self.scheduler = InferenceScheduler()
+        self.roi = RoiPlanner.from_config(self.camera.roi, self.camera.roi_tiling)
+        # Yük altında kalite basamakları; piksel koordinatlı ROI varsa kamera çözünürlüğü değiştirilmez
+        absolute_roi = self.roi is not None and not all(region.normalized for region in self.roi.regions)
+        self.quality = QualityController(
+            self.camera.camera_id,
+            levels=build_levels(min_resolution_scale=1.0) if absolute_roi else None
+        )
+        self.quality.on_change = self.apply_quality
+        self.preprocessors = [FramePreprocessor()]
+        self.preprocessor = self.preprocessors[0]
+        self.event_aggregator = DetectionEventAggregator(
+            keyframe_interval=self.camera.event_keyframe_interval,
+            end_timeout=self.camera.event_end_timeout
+        )
         self.last_alert_time = 0
         self.total_detections = 0
         self.detection_sequences = 0
-        self.sequence_start_time = time.time()
+        self.sequence_start_time = clock()
         self.last_detection_state = False
-        self.start_time = time.time()
+        self.start_time = clock()
         self.frame_count = 0
         self.fps = 0
-        self.fps_start_time = time.time()
+        self.fps_start_time = clock()
         
     def initialize(self) -> bool:
         """
@@ -46,77 +96,221 @@ class DetectionService:
             bool: Başarılı/başarısız durumu
         """
         try:
-            # Model yükleme
-            self.model = YOLO(DEFAULT_MODEL_PATH)
-            logger.info(f"Model yüklendi: {DEFAULT_MODEL_PATH}")
+            health.register_camera(self.camera.camera_id)
+            
+            # Model yükleme (paylaşılan model verilmediyse)
+            owns_backend = self.backend is None
+            if owns_backend:
+                with health.timeline.phase("model_load"):
+                    self.backend = create_backend(DEFAULT_MODEL_PATH, device=self.device)
+            
+            # Kamera ayarları (backend'den, erişilemezse diskteki son kayıttan)
+            with health.timeline.phase("camera_config", camera_id=self.camera.camera_id):
+                self.config_store.attach(self)
+            
+            # İlk gerçek karenin grafik kurulumunu beklememesi için kamera açılmadan ısınma
+            if owns_backend:
+                with health.timeline.phase("warmup", runs=WARMUP_RUNS):
+                    self.backend.warmup(WARMUP_RUNS, batch_size=self.inputs_per_frame())
+                health.model_loaded = True
             
             # Kamera başlatma
-            if CAMERA_SOURCE.isnumeric():
-                self.cap = cv2.VideoCapture(int(CAMERA_SOURCE))
-            else:
-                self.cap = cv2.VideoCapture(CAMERA_SOURCE)
+            with health.timeline.phase("camera_open", camera_id=self.camera.camera_id):
+                self.cap = cv2.VideoCapture(self.camera.open_capture_source())
                 
-            if not self.cap.isOpened():
-                raise Exception("Kamera açılamadı!")
-                
-            # Kamera çözünürlüğünü ayarla
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
-            
-            # Ses sistemini başlat
-            if Path(ALERT_SOUND_PATH).exists():
-                mixer.init()
+                if not self.cap.isOpened():
+                    raise Exception(f"Kamera açılamadı! ({self.camera.camera_id})")
+                    
+                # Kamera çözünürlüğünü ayarla
+                self.apply_resolution()
                 
             logger.info("Servis başarıyla başlatıldı")
             return True
             
         except Exception as e:
+            health.unregister_camera(self.camera.camera_id)
             logger.error(f"Servis başlatılamadı: {str(e)}")
             return False
             
-    def process_frame(self, frame: np.ndarray) -> tuple[np.ndarray, List[Dict[str, Any]]]:
+    def inputs_per_frame(self) -> int:
+        """Ayarlardaki çözünürlükte bir karenin ürettiği model girişi sayısı"""
+        if self.roi is None:
+            return 1
+        return len(self.roi.crops((self.settings.frame_height, self.settings.frame_width)))
+        
+    def apply_settings(self, settings: CameraSettings):
+        """
+        Kamera ayarlarını çalışma sırasında uygular (model yeniden yüklenmez).
+        
+        Çözünürlük değişikliği kamerayı okuyan thread'de, bir sonraki karede
+        uygulanır (apply_resolution).
+        
+        Args:
+            settings: Yeni ayarlar
+        """
+        previous, self.settings = self.settings, settings
+        
+        self.detection_windows.on_threshold = settings.detection_threshold
+        self.detection_windows.off_threshold = settings.release_threshold
+        self.detection_windows.long_threshold = settings.long_window_threshold
+        self.event_aggregator.keyframe_interval = settings.event_keyframe_interval
+        self.event_aggregator.end_timeout = settings.event_end_timeout
+        
+        if (settings.frame_width, settings.frame_height) != (previous.frame_width, previous.frame_height):
+            self.pending_resolution = (settings.frame_width, settings.frame_height)
+            
+    def apply_resolution(self):
+        """
+        Ayarlardaki çözünürlüğü kalite basamağının (isteğe bağlı) oranıyla
+        kameraya uygular (capture thread'inden çağrılır)
+        """
+        self.pending_resolution = None
+        if self.cap is not None:
+            scale = self.quality.level.resolution_scale
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(self.settings.frame_width * scale))
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(self.settings.frame_height * scale))
+            
+    def apply_quality(self, level: QualityLevel, previous: QualityLevel):
+        """
+        Kalite kontrolünün seçtiği basamağı uygular.
+        
+        Çıkarım hızı sınırı hemen, model giriş boyutu bir sonraki ön işlemede
+        (model_input_size), kamera çözünürlüğü bir sonraki karede (apply_resolution),
+        görüntü ölçeği ve JPEG kalitesi sonraki gönderimde geçerli olur.
+        
+        Args:
+            level: Yeni basamak
+            previous: Önceki basamak
+        """
+        self.scheduler.min_interval = level.inference_interval
+        self.metrics.quality_level.set(self.quality.level_index)
+        if level.resolution_scale != previous.resolution_scale:
+            self.pending_resolution = (self.settings.frame_width, self.settings.frame_height)
+            
+    def model_input_size(self) -> int:
+        """Kalite basamağının model giriş boyutu (sabit girişli modelde modelin boyutu)"""
+        return self.backend.input_size_for(self.quality.level.input_size)
+        
+    def process_frame(self, frame: np.ndarray) -> tuple[np.ndarray, DetectionBatch]:
         """
         Görüntü karesini işler ve tespitleri yapar.
         
+        Kare burada kopyalanmaz veya işaretlenmez; işaretli görüntü yalnızca
+        gerçekten gerektiğinde (gönderim veya debug ekranı) annotate ile üretilir.
+        
         Args:
             frame: İşlenecek görüntü karesi
             
         Returns:
-            tuple: İşlenmiş kare ve tespit listesi
+            tuple: Ham kare ve tespitler
         """
-        # Görüntü ön işleme
-        processed_frame = cv2.GaussianBlur(frame, BLUR_KERNEL_SIZE, 0)
-        processed_frame = cv2.convertScaleAbs(
-            processed_frame, 
-            alpha=BRIGHTNESS_ALPHA, 
-            beta=BRIGHTNESS_BETA
-        )
+        # Kamerada tespit kapalıysa modeli çalıştırma
+        if not self.settings.enabled:
+            return frame, DetectionBatch.empty()
+            
+        # Durağan sahnede modeli atla
+        if not self.scheduler.should_infer(frame, self.clock()):
+            self.metrics.inferences_skipped.inc()
+            return frame, DetectionBatch.empty()
+            
+        model_inputs = self.preprocess(frame)
         
-        # Model tahmini
-        results = self.model(processed_frame, conf=CONFIDENCE_THRESHOLD)[0]
+        # Model tahmini (ROI tanımlıysa tüm kırpmalar tek ileri geçişte)
+        with self.metrics.inference.time():
+            results = self.backend.predict(model_inputs)
         
-        # Tespitleri işle
-        detections = []
-        output_frame = frame.copy()
+        frame, detections = self.postprocess(frame, results)
+        self.scheduler.report(bool(detections), self.clock())
+        return frame, detections
         
-        for box in results.boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            conf = float(box.conf[0])
-            
-            # Tespit verilerini hazırla
-            detection = {
-                "boundingBox": {
-                    "x1": x1, "y1": y1,
-                    "x2": x2, "y2": y2
-                },
-                "confidence": conf,
-                "center": {
-                    "x": (x1 + x2) // 2,
-                    "y": (y1 + y2) // 2
-                }
-            }
-            detections.append(detection)
+    def preprocess(self, frame: np.ndarray, input_size: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Görüntü karesine model öncesi ön işleme uygular.
+        
+        ROI tanımlıysa yalnızca bölgeler (veya karoları) kırpılarak işlenir;
+        kırpmalar kopya değil, karenin görünümleridir.
+        
+        Args:
+            frame: Ham görüntü karesi
+            input_size: Model giriş boyutu (verilmezse kalite basamağından)
+            
+        Returns:
+            List[np.ndarray]: Modele verilecek girişler (önceden ayrılmış tamponlar)
+        """
+        input_size = input_size or self.model_input_size()
+        with self.metrics.preprocess.time():
+            if self.roi is None:
+                self.preprocessor.input_size = input_size
+                return [self.preprocessor(frame)]
+                
+            crops = self.roi.crops(frame.shape)
+            while len(self.preprocessors) < len(crops):
+                self.preprocessors.append(FramePreprocessor())
+            for preprocessor in self.preprocessors:
+                preprocessor.input_size = input_size
+            return [
+                preprocessor(frame[y1:y2, x1:x2])
+                for preprocessor, (x1, y1, x2, y2) in zip(self.preprocessors, crops)
+            ]
+        
+    def _to_frame_result(self, frame: np.ndarray, results: List[InferenceResult]) -> InferenceResult:
+        """Kırpma sonuçlarını kare koordinatlarında tek sonuca çevirir"""
+        if self.roi is None:
+            result = results[0]
+            return InferenceResult(self.preprocessor.to_frame_coords(result.boxes), result.confidences, result.class_ids)
+            
+        boxes, confidences, class_ids = [], [], []
+        crops = self.roi.crops(frame.shape)
+        for index, (preprocessor, (x1, y1, _, _), result) in enumerate(zip(self.preprocessors, crops, results)):
+            if len(result) == 0:
+                continue
+            frame_boxes = preprocessor.to_frame_coords(result.boxes) + np.array([x1, y1, x1, y1], dtype=np.int32)
+            # Her kırpmanın kutuları yalnızca kendi bölgesine göre süzülür
+            keep = self.roi.inside(index, frame_boxes)
+            boxes.append(frame_boxes[keep])
+            confidences.append(result.confidences[keep])
+            class_ids.append(result.class_ids[keep])
+        return self.roi.merge(boxes, confidences, class_ids)
+        
+    def postprocess(self, frame: np.ndarray, results: List[InferenceResult]) -> tuple[np.ndarray, DetectionBatch]:
+        """
+        Model çıktısını orijinal kare koordinatlarında tespitlere çevirir.
+        
+        Args:
+            frame: Ham görüntü karesi
+            results: Bu karenin girişlerine (preprocess sırasıyla) ait model sonuçları
+            
+        Returns:
+            tuple: Ham kare ve tespitler
+        """
+        start = time.perf_counter()
+        if not any(len(result) for result in results):
+            self.metrics.postprocess.observe(time.perf_counter() - start)
+            return frame, DetectionBatch.empty()
+            
+        # Kameraya özel güven eşiği (paylaşılan model en düşük eşikle çalışır)
+        detections = DetectionBatch.from_result(self._to_frame_result(frame, results))
+        detections = detections.above(self.settings.confidence_threshold)
+            
+        self.metrics.postprocess.observe(time.perf_counter() - start)
+        return frame, detections
+        
+    def annotate(self, frame: np.ndarray, detections: DetectionBatch) -> np.ndarray:
+        """
+        Tespit kutularını çizilmiş bir kare kopyası üretir.
+        
+        Args:
+            frame: Ham görüntü karesi
+            detections: Karenin tespitleri
             
+        Returns:
+            np.ndarray: İşaretlenmiş kare (tespit yoksa ham kare)
+        """
+        if not detections:
+            return frame
+            
+        output_frame = frame.copy()
+        for (x1, y1, x2, y2), conf in zip(detections.boxes.tolist(), detections.confidences.tolist()):
             # Görüntüye tespit kutusunu çiz
             cv2.rectangle(output_frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
             label = f"Sigara: {conf:.2f}"
@@ -144,19 +338,20 @@ class DetectionService:
                 2
             )
             
-        return output_frame, detections
+        return output_frame
         
-    def update_metrics(self, detections: List[Dict[str, Any]]):
+    def update_metrics(self, detections: DetectionBatch):
         """
         Tespit metriklerini günceller.
         
         Args:
-            detections: Tespit listesi
+            detections: Karenin tespitleri
         """
-        current_time = time.time()
+        current_time = self.clock()
         
         # FPS hesaplama
         self.frame_count += 1
+        self.metrics.frames.inc()
         if self.frame_count % 30 == 0:
             self.fps = 30 / (current_time - self.fps_start_time)
             self.fps_start_time = current_time
@@ -166,10 +361,8 @@ class DetectionService:
         if current_detection:
             self.total_detections += 1
             
-        # Buffer'a ekle
-        self.detection_buffer.append(current_detection)
-        if len(self.detection_buffer) > BUFFER_SIZE:
-            self.detection_buffer.pop(0)
+        # Kayan pencerelere ekle
+        self.detection_windows.add(current_detection, current_time)
             
         # Tespit-kayıp döngüsünü takip et
         if current_detection != self.last_detection_state:
@@ -189,109 +382,113 @@ class DetectionService:
         Returns:
             bool: Uyarı verilmeli mi
         """
-        current_time = time.time()
-        buffer_ratio = sum(self.detection_buffer) / len(self.detection_buffer)
+        current_time = self.clock()
         
         return (
-            buffer_ratio >= DETECTION_THRESHOLD and
+            self.detection_windows.active and
             self.detection_sequences <= 3 and
-            current_time - self.last_alert_time > ALERT_COOLDOWN
+            current_time - self.last_alert_time > self.settings.alert_cooldown
         )
         
-    def play_alert(self):
-        """Sesli uyarı verir"""
-        if Path(ALERT_SOUND_PATH).exists():
-            try:
-                mixer.music.load(ALERT_SOUND_PATH)
-                mixer.music.play()
-            except Exception as e:
-                logger.error(f"Ses çalınamadı: {str(e)}")
-                
-    def prepare_detection_data(self, frame: np.ndarray, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def prepare_detection_data(
+        self,
+        frame: np.ndarray,
+        detections: DetectionBatch,
+        event: Optional[DetectionEvent] = None
+    ) -> Dict[str, Any]:
         """
         Backend'e gönderilecek tespit verilerini hazırlar.
         
         Args:
             frame: Görüntü karesi
-            detections: Tespit listesi
+            detections: Karenin tespitleri
+            event: Verinin ait olduğu olay
             
         Returns:
             Dict[str, Any]: Hazırlanan veri
         """
-        # Görüntüyü küçült ve sıkıştır
-        scale_percent = 50  # orijinal boyutun %50'si
-        width = int(frame.shape[1] * scale_percent / 100)
-        height = int(frame.shape[0] * scale_percent / 100)
-        frame_resized = cv2.resize(frame, (width, height))
-        
-        # JPEG kalitesini düşür
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 60]
-        _, buffer = cv2.imencode('.jpg', frame_resized, encode_param)
-        
-        return {
-            "venueId": VENUE_ID,
-            "floorNumber": FLOOR_NUMBER,
-            "zoneId": ZONE_ID,
-            "cameraId": CAMERA_ID,
+        # İşaretli görüntüyü yalnızca gönderim sırasında üret, küçült ve bir kez sıkıştır;
+        # tüm varyantlar ve her iki kanal aynı kodlamayı kullanır
+        with self.metrics.encode.time():
+            level = self.quality.level
+            image = encode_frame(self.annotate(frame, detections), level.upload_scale, level.jpeg_quality)
+        # Kutular güvene göre sıralı; ilki konum bilgisinde kullanılır
+        boxes = detections.top_k(PAYLOAD_MAX_DETECTIONS).to_list()
+        confidence = detections.max_confidence
+        elapsed_time = self.clock() - self.start_time
+        
+        detection_data = {
+            "venueId": self.camera.venue_id,
+            "floorNumber": self.camera.floor_number,
+            "zoneId": self.camera.zone_id,
+            "cameraId": self.camera.camera_id,
             "location": {
                 "x": 0,  # Kamera konumundan hesaplanabilir
                 "y": 0,
-                "boundingBox": detections[0]["boundingBox"] if detections else None,
-                "confidence": detections[0]["confidence"] if detections else 0
+                "boundingBox": boxes[0]["boundingBox"] if boxes else None,
+                "confidence": confidence
             },
             "detectionDetails": {
-                "confidence": detections[0]["confidence"] if detections else 0,
-                "detectionSequences": len(self.detection_buffer),
-                "fps": self.fps
-            },
-            "imageData": {
-                "originalImage": base64.b64encode(buffer).decode('utf-8'),
-                "processedImage": base64.b64encode(buffer).decode('utf-8'),
-                "annotatedImage": base64.b64encode(buffer).decode('utf-8'),
-                "confidence": detections[0]["confidence"] if detections else 0
+                "confidence": confidence,
+                "detectionSequences": len(self.detection_windows.short),
+                "fps": self.fps,
+                "detections": boxes
             },
+            "imageData": build_image_data(image, confidence),
             "systemMetrics": {
-                "cpuPercent": psutil.cpu_percent(),
-                "ramPercent": psutil.virtual_memory().percent,
-                "detectionRate": self.total_detections / (time.time() - self.start_time) if time.time() - self.start_time > 0 else 0,
+                # Arka planda örneklenen son değerler (payload başına psutil çağrısı yapılmaz)
+                **system_metrics.latest(),
+                "detectionRate": self.total_detections / elapsed_time if elapsed_time > 0 else 0,
                 "totalDetections": self.total_detections,
-                "elapsedTime": time.time() - self.start_time
+                "elapsedTime": elapsed_time
             }
         }
+        if event is not None:
+            detection_data["event"] = event.to_dict()
+        attach_image(detection_data, image)
+        return detection_data
         
+    def handle_detections(self, frame: np.ndarray, detections: DetectionBatch, upload_queue):
+        """
+        İşlenmiş karenin tespitlerine göre metrikleri ve uyarı durumunu günceller,
+        gönderilecek veriyi upload kuyruğuna ekler.
+        
+        Args:
+            frame: Ham görüntü karesi
+            detections: Karenin tespitleri
+            upload_queue: Gönderilecek verilerin kuyruğu
+        """
+        # Metrikleri güncelle
+        self.update_metrics(detections)
+        
+        # Uyarı kontrolü
+        alert = self.should_alert()
+        if alert:
+            self.last_alert_time = self.clock()
+            self.metrics.alerts.inc()
+            
+        # Kareleri olaylara dönüştür; yalnızca olay kayıtları backend'e gönderilir
+        event = self.event_aggregator.update(frame, detections, alert, self.clock())
+        if alert:
+            # Bildirim dağıtıcının thread'inde yapılır; bu çağrı beklemez
+            self.alerts.submit(Alert.from_camera(
+                self.camera, self.last_alert_time, detections.max_confidence, self.event_aggregator.event_id
+            ))
+        if event is not None:
+            self.metrics.event(event.type)
+            if event.type == "start" and self.clip_recorder is not None:
+                self.clip_recorder.trigger(event.event_id, event.timestamp)
+            upload_queue.put(self.prepare_detection_data(event.frame, event.detections, event))
+            
     async def run(self):
         """Ana servis döngüsü"""
+        start_health_server(self.api_client.backend_reachable)
         if not self.initialize():
             return
             
         try:
-            while True:
-                ret, frame = self.cap.read()
-                if not ret:
-                    logger.error("Kameradan görüntü alınamadı")
-                    break
-                    
-                # Görüntüyü işle ve tespitleri yap
-                output_frame, detections = self.process_frame(frame)
-                
-                # Metrikleri güncelle
-                self.update_metrics(detections)
-                
-                # Uyarı kontrolü
-                if self.should_alert():
-                    self.play_alert()
-                    self.last_alert_time = time.time()
-                    
-                # Backend'e veri gönder
-                if detections:
-                    detection_data = self.prepare_detection_data(output_frame, detections)
-                    await self.api_client.send_ws_notification(detection_data)
-                    self.api_client.send_detection(detection_data)
-                    
-                # Görüntüyü göster (debug modu için)
-                cv2.imshow('Sigara Tespiti', output_frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
+            self.pipeline = FramePipeline(self)
+            await self.pipeline.run()
                     
         except Exception as e:
             logger.error(f"Servis çalışırken hata oluştu: {str(e)}")
@@ -303,6 +500,6 @@ class DetectionService:
         """Kaynakları temizler"""
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
-        mixer.quit()
+        if not HEADLESS:
+            cv2.destroyAllWindows()
         asyncio.create_task(self.api_client.close_websocket()) 
\ No newline at end of file
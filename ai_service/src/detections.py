@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .backends import InferenceResult
+
+
+class DetectionBatch:
+    """
+    Bir karenin tespitleri (kare koordinatlarında, sütun bazlı).
+
+    Kutu başına sözlük üretilmez; filtreleme ve sıralama NumPy üzerinde
+    yapılır, sözlüğe çevirme yalnızca payload hazırlanırken gerekir.
+
+    Attributes:
+        boxes: (N, 4) int32 x1, y1, x2, y2
+        confidences: (N,) float32
+        centers: (N, 2) int32 x, y
+        class_ids: (N,) int32
+    """
+
+    def __init__(self, boxes: np.ndarray, confidences: np.ndarray, centers: np.ndarray, class_ids: np.ndarray):
+        self.boxes = boxes
+        self.confidences = confidences
+        self.centers = centers
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        return cls(
+            np.empty((0, 4), dtype=np.int32),
+            np.empty((0,), dtype=np.float32),
+            np.empty((0, 2), dtype=np.int32),
+            np.empty((0,), dtype=np.int32)
+        )
+
+    @classmethod
+    def from_result(cls, result: InferenceResult) -> "DetectionBatch":
+        """Kare koordinatlarındaki model sonucunu tek adımda dönüştürür"""
+        boxes = result.boxes.astype(np.int32)
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        return cls(boxes, result.confidences.astype(np.float32), centers, result.class_ids.astype(np.int32))
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+    def __bool__(self) -> bool:
+        return len(self.confidences) > 0
+
+    def select(self, indices: np.ndarray) -> "DetectionBatch":
+        """Maske veya indis dizisine göre alt küme"""
+        return DetectionBatch(self.boxes[indices], self.confidences[indices], self.centers[indices], self.class_ids[indices])
+
+    def above(self, threshold: float) -> "DetectionBatch":
+        """Güveni eşiğin altında kalanları atar"""
+        keep = self.confidences >= threshold
+        return self if keep.all() else self.select(keep)
+
+    def top_k(self, k: int) -> "DetectionBatch":
+        """Güvene göre azalan sırada en iyi k tespit"""
+        if k <= 0:
+            return DetectionBatch.empty()
+        k = min(k, len(self))
+        if len(self) > k:
+            indices = np.argpartition(-self.confidences, k - 1)[:k]
+        else:
+            indices = np.arange(len(self))
+        return self.select(indices[np.argsort(-self.confidences[indices], kind="stable")])
+
+    @property
+    def max_confidence(self) -> float:
+        return float(self.confidences.max()) if len(self) else 0.0
+
+    @property
+    def best_index(self) -> Optional[int]:
+        return int(self.confidences.argmax()) if len(self) else None
+
+    def bounding_box(self, index: int) -> Dict[str, int]:
+        x1, y1, x2, y2 = self.boxes[index].tolist()
+        return {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Backend formatında tespit listesi (boundingBox, confidence, center)"""
+        return [
+            {
+                "boundingBox": self.bounding_box(index),
+                "confidence": confidence,
+                "center": {"x": cx, "y": cy}
+            }
+            for index, (confidence, (cx, cy)) in enumerate(zip(self.confidences.tolist(), self.centers.tolist()))
+        ]
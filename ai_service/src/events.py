@@ -0,0 +1,150 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.config import EVENT_KEYFRAME_INTERVAL, EVENT_END_TIMEOUT
+from .detections import DetectionBatch
+
+
+@dataclass
+class DetectionEvent:
+    """Backend'e gönderilecek bir olay kaydı (start, keyframe veya end)"""
+    event_id: str
+    type: str
+    frame: np.ndarray
+    detections: DetectionBatch
+    started_at: float
+    timestamp: float
+    frame_count: int
+    max_confidence: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Payload'a eklenecek olay bilgisi"""
+        return {
+            "id": self.event_id,
+            "type": self.type,
+            "startedAt": self.started_at,
+            "durationSec": self.timestamp - self.started_at,
+            "frameCount": self.frame_count,
+            "maxConfidence": self.max_confidence,
+            **self.extra
+        }
+
+
+class DetectionEventAggregator:
+    """
+    Kare bazlı tespitleri olaylara dönüştürür.
+
+    Olay, DetectionService.should_alert() ilk kez True döndüğünde başlar
+    (buffer oranı, döngü sayısı ve ALERT_COOLDOWN kuralları aynen geçerlidir).
+    Olay süresince her `keyframe_interval` saniyede bir, o aralıktaki en
+    yüksek güvenli kare gönderilir; `end_timeout` saniye boyunca tespit
+    olmazsa olay biter. Böylece her pozitif kare yerine olay başına birkaç
+    kayıt gönderilir.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval: float = EVENT_KEYFRAME_INTERVAL,
+        end_timeout: float = EVENT_END_TIMEOUT
+    ):
+        self.keyframe_interval = keyframe_interval
+        self.end_timeout = end_timeout
+        self.event_id: Optional[str] = None
+        self.started_at = 0.0
+        self.last_seen = 0.0
+        self.last_emit = 0.0
+        self.frame_count = 0
+        self.max_confidence = 0.0
+        # Son gönderimden bu yana ve olay boyunca en iyi kareler
+        self._interval_best = None
+        self._event_best = None
+        self.events_emitted = 0
+
+    @property
+    def active(self) -> bool:
+        return self.event_id is not None
+
+    def update(
+        self,
+        frame: np.ndarray,
+        detections: DetectionBatch,
+        alert: bool,
+        now: Optional[float] = None
+    ) -> Optional[DetectionEvent]:
+        """
+        Yeni kareyi işler ve gönderilmesi gereken olay varsa döndürür.
+
+        Args:
+            frame: Görüntü karesi
+            detections: Bu karedeki tespitler
+            alert: should_alert() sonucu
+            now: Zaman damgası (verilmezse time.time())
+
+        Returns:
+            Optional[DetectionEvent]: Gönderilecek olay veya None
+        """
+        now = time.time() if now is None else now
+
+        if detections:
+            confidence = detections.max_confidence
+            if self._interval_best is None or confidence > self._interval_best[0]:
+                self._interval_best = (confidence, frame, detections)
+        else:
+            confidence = 0.0
+
+        if not self.active:
+            if not (alert and detections):
+                # Olay dışındaki kareler saklanmaz
+                self._interval_best = None
+                return None
+            self.event_id = str(uuid.uuid4())
+            self.started_at = now
+            self.last_seen = now
+            self.frame_count = 1
+            self.max_confidence = confidence
+            self._event_best = self._interval_best
+            return self._emit("start", now)
+
+        if detections:
+            self.last_seen = now
+            self.frame_count += 1
+            if confidence > self.max_confidence:
+                self.max_confidence = confidence
+                self._event_best = self._interval_best
+
+        if now - self.last_seen > self.end_timeout:
+            return self._finish()
+
+        if self._interval_best is not None and now - self.last_emit >= self.keyframe_interval:
+            return self._emit("keyframe", now)
+
+        return None
+
+    def _emit(self, event_type: str, now: float, best=None) -> DetectionEvent:
+        confidence, frame, detections = best or self._interval_best
+        self._interval_best = None
+        self.last_emit = now
+        self.events_emitted += 1
+        return DetectionEvent(
+            event_id=self.event_id,
+            type=event_type,
+            frame=frame,
+            detections=detections,
+            started_at=self.started_at,
+            timestamp=now,
+            frame_count=self.frame_count,
+            max_confidence=self.max_confidence
+        )
+
+    def _finish(self) -> DetectionEvent:
+        """Olayı kapatır; bitiş kaydı olay boyunca görülen en iyi kareyi taşır"""
+        event = self._emit("end", self.last_seen, best=self._event_best)
+        event.extra["endedAt"] = self.last_seen
+        self.event_id = None
+        self._event_best = None
+        return event
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.config import HEALTH_HOST, HEALTH_PORT, HEALTH_FRAME_TIMEOUT, HEALTH_STALL_TIMEOUT
+from .logger import setup_logger
+
+logger = setup_logger("health")
+
+
+class StartupTimeline:
+    """Başlangıç aşamalarının süresini (süreç başlangıcına göre) kaydeder"""
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.phases: List[Dict[str, Any]] = []
+        self.completed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, **extra: Any):
+        """Bloğun süresini `name` aşaması olarak kaydeder"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            entry = {
+                "phase": name,
+                "startSec": round(start - self.origin, 3),
+                "durationSec": round(end - start, 3),
+                **extra
+            }
+            with self._lock:
+                self.phases.append(entry)
+            logger.info(f"Başlangıç aşaması tamamlandı: {name}", extra={"startup": entry})
+
+    def complete(self):
+        """İlk kare işlendiğinde bir kez çağrılır"""
+        with self._lock:
+            if self.completed_at is not None:
+                return
+            self.completed_at = time.monotonic()
+        logger.info("Servis hazır", extra={"startup": self.as_dict()})
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self.phases)
+        ready_in = self.completed_at - self.origin if self.completed_at is not None else None
+        return {"phases": phases, "readyInSec": round(ready_in, 3) if ready_in is not None else None}
+
+
+class HealthState:
+    """
+    Hazırlık ve canlılık durumunu tutar.
+
+    Hazır: model yüklü, tüm kameralar kare veriyor ve backend HTTP
+    üzerinden erişilebilir. Canlı: yayın başladıktan sonra kare işleme durmamış (thread
+    kilitlenmesi veya sonsuz bekleme yok). Sıcak yolda yalnızca zaman
+    damgası yazılır.
+    """
+
+    def __init__(self, frame_timeout: float = HEALTH_FRAME_TIMEOUT, stall_timeout: float = HEALTH_STALL_TIMEOUT):
+        self.frame_timeout = frame_timeout
+        self.stall_timeout = stall_timeout
+        self.timeline = StartupTimeline()
+        self.model_loaded = False
+        self.cameras: Dict[str, float] = {}
+        self.last_processed: Optional[float] = None
+        self.backend_probe: Optional[Callable[[], bool]] = None
+
+    def register_camera(self, camera_id: str):
+        """Kamerayı henüz kare vermemiş olarak kaydeder"""
+        self.cameras.setdefault(camera_id, 0.0)
+
+    def unregister_camera(self, camera_id: str):
+        """Başlatılamayan kamera hazırlık kontrolüne katılmaz"""
+        self.cameras.pop(camera_id, None)
+
+    def frame_captured(self, camera_id: str):
+        self.cameras[camera_id] = time.monotonic()
+
+    def frame_processed(self):
+        self.last_processed = time.monotonic()
+        if self.timeline.completed_at is None:
+            self.timeline.complete()
+
+    def ready(self) -> Tuple[bool, Dict[str, Any]]:
+        """Trafik yönlendirilebilir mi ve bileşen durumları"""
+        now = time.monotonic()
+        streaming = {
+            camera_id: bool(last) and now - last <= self.frame_timeout
+            for camera_id, last in list(self.cameras.items())
+        }
+        backend = bool(self.backend_probe()) if self.backend_probe else False
+        checks = {
+            "modelLoaded": self.model_loaded,
+            "cameraStreaming": bool(streaming) and all(streaming.values()),
+            "backendConnected": backend
+        }
+        return all(checks.values()), {**checks, "cameras": streaming}
+
+    def live(self) -> Tuple[bool, Dict[str, Any]]:
+        """Süreç ilerliyor mu (yayın başlamadan önce her zaman canlı)"""
+        if self.last_processed is None:
+            return True, {"stalledSec": 0.0}
+        stalled = time.monotonic() - self.last_processed
+        return stalled <= self.stall_timeout, {"stalledSec": round(stalled, 3)}
+
+
+health = HealthState()
+
+
+class HealthServer:
+    """
+    /health/live ve /health/ready uç noktalarını sunar.
+
+    Durum uygunsa 200, değilse 503 döner; gövdede bileşen durumları ve
+    başlangıç zaman çizelgesi JSON olarak bulunur.
+    """
+
+    def __init__(self, host: str = HEALTH_HOST, port: int = HEALTH_PORT, state: HealthState = health):
+        self.host = host
+        self.port = port
+        self.state = state
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._server is not None:
+            return
+        state = self.state
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/health/live":
+                    ok, body = state.live()
+                elif path == "/health/ready":
+                    ok, body = state.ready()
+                    body["startup"] = state.timeline.as_dict()
+                else:
+                    return self.send_error(404)
+                data = json.dumps({"status": "ok" if ok else "unavailable", **body}).encode("utf-8")
+                self.send_response(200 if ok else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="health", daemon=True)
+        self._thread.start()
+        logger.info(f"Sağlık kontrolü sunucusu başlatıldı: http://{self.host}:{self.port}/health/ready")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+health_server = HealthServer() if HEALTH_PORT else None
+
+
+def start_health_server(backend_probe: Callable[[], bool]):
+    """
+    Sağlık sunucusunu model yüklenmeden ve kameralar açılmadan önce başlatır;
+    başlangıç boyunca /health/live ve /health/ready yanıt verir.
+
+    Args:
+        backend_probe: Backend'e erişilebiliyor mu (ör. APIClient.backend_reachable)
+    """
+    health.backend_probe = backend_probe
+    if health_server is not None:
+        health_server.start()
@@ -0,0 +1,194 @@
+import base64
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import IMAGE_VARIANTS, IMAGE_TRANSPORT, UPLOAD_IMAGE_SCALE, JPEG_QUALITY
+
+# Binary taşımada görüntü, payload içinde bu anahtar altında taşınır
+# (JSON'a yazılmadan önce inline_images ile base64'e çevrilir)
+IMAGE_BYTES_KEY = "_image"
+
+# Binary çerçeve başlığı: 4 byte (big-endian) JSON uzunluğu
+_HEADER_STRUCT = struct.Struct(">I")
+
+
+class EncodedImage:
+    """
+    Bir kez JPEG'e sıkıştırılmış görüntü.
+
+    Base64 karşılığı ilk ihtiyaç duyulduğunda bir kez hesaplanır ve hem
+    WebSocket hem HTTP gönderiminde aynı string kullanılır.
+    """
+
+    def __init__(self, jpeg: bytes):
+        self.jpeg = jpeg
+        self._base64: Optional[str] = None
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.jpeg).decode('utf-8')
+        return self._base64
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.jpeg)
+
+    def __repr__(self) -> str:
+        return f"EncodedImage({self.nbytes} bytes)"
+
+
+def encode_frame(
+    frame: np.ndarray,
+    scale_percent: int = UPLOAD_IMAGE_SCALE,
+    quality: int = JPEG_QUALITY
+) -> EncodedImage:
+    """
+    Görüntüyü küçültüp JPEG olarak sıkıştırır.
+
+    Args:
+        frame: Görüntü karesi
+        scale_percent: Orijinal boyutun yüzdesi
+        quality: JPEG kalitesi
+
+    Returns:
+        EncodedImage: Sıkıştırılmış görüntü
+    """
+    if scale_percent != 100:
+        width = int(frame.shape[1] * scale_percent / 100)
+        height = int(frame.shape[0] * scale_percent / 100)
+        frame = cv2.resize(frame, (width, height))
+
+    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    _, buffer = cv2.imencode('.jpg', frame, encode_param)
+    return EncodedImage(buffer.tobytes())
+
+
+def build_image_data(
+    image: EncodedImage,
+    confidence: float,
+    variants: List[str] = IMAGE_VARIANTS,
+    transport: str = IMAGE_TRANSPORT
+) -> Dict[str, Any]:
+    """
+    Payload'ın imageData alanını görüntü politikasına göre hazırlar.
+
+    base64 taşımada seçilen her varyant aynı (bir kez kodlanmış) string'i
+    paylaşır. binary taşımada görüntü payload'a eklenmez; hangi varyantların
+    doldurulacağı backend'e `variants` alanıyla bildirilir.
+
+    Args:
+        image: Sıkıştırılmış görüntü
+        confidence: Tespit güveni
+        variants: Gönderilecek varyantlar (originalImage, processedImage, annotatedImage)
+        transport: "base64" veya "binary"
+
+    Returns:
+        Dict[str, Any]: imageData alanı
+    """
+    if transport == "binary":
+        return {"variants": list(variants), "confidence": confidence}
+
+    image_data = {variant: image.base64 for variant in variants}
+    image_data["confidence"] = confidence
+    return image_data
+
+
+def attach_image(payload: Dict[str, Any], image: EncodedImage, transport: str = IMAGE_TRANSPORT):
+    """Binary taşımada görüntüyü payload'a (JSON dışı alan olarak) iliştirir"""
+    if transport == "binary":
+        payload[IMAGE_BYTES_KEY] = image
+
+
+def has_binary_image(payload: Any) -> bool:
+    return isinstance(payload, dict) and isinstance(payload.get(IMAGE_BYTES_KEY), EncodedImage)
+
+
+def split_image(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[EncodedImage]]:
+    """Payload'ı JSON kısmı ve iliştirilmiş görüntü olarak ayırır"""
+    if not has_binary_image(payload):
+        return payload, None
+    header = {key: value for key, value in payload.items() if key != IMAGE_BYTES_KEY}
+    return header, payload[IMAGE_BYTES_KEY]
+
+
+def inline_images(payload: Any) -> Any:
+    """
+    İliştirilmiş görüntüleri base64 varyantlarına çevirerek payload'ı
+    JSON'a yazılabilir hale getirir (toplu gönderim ve spool için).
+    """
+    if isinstance(payload, list):
+        return [inline_images(item) for item in payload]
+
+    header, image = split_image(payload)
+    if image is None:
+        return payload
+
+    image_data = dict(header.get("imageData") or {})
+    variants = image_data.pop("variants", IMAGE_VARIANTS)
+    header["imageData"] = {
+        **{variant: image.base64 for variant in variants},
+        **image_data
+    }
+    return header
+
+
+def pack_binary(payload: Dict[str, Any]) -> bytes:
+    """
+    Payload'ı binary çerçeveye çevirir:
+    [4 byte JSON uzunluğu][JSON başlık][JPEG byte'ları]
+
+    Args:
+        payload: İliştirilmiş görüntüsü olan tespit verisi
+
+    Returns:
+        bytes: WebSocket binary frame'i veya HTTP gövdesi
+    """
+    header, image = split_image(payload)
+    header_bytes = json.dumps(header).encode('utf-8')
+    jpeg = image.jpeg if image is not None else b""
+    return _HEADER_STRUCT.pack(len(header_bytes)) + header_bytes + jpeg
+
+
+def unpack_binary(data: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """pack_binary ile oluşturulan çerçeveyi çözer"""
+    (header_length,) = _HEADER_STRUCT.unpack_from(data)
+    start = _HEADER_STRUCT.size
+    header = json.loads(data[start:start + header_length].decode('utf-8'))
+    return header, data[start + header_length:]
+
+
+def summarize_payload(payload: Any) -> Dict[str, Any]:
+    """
+    Loglama için payload özeti: kimlikler, güven ve boyutlar.
+    Görüntü içeriği (base64 veya byte) hiçbir zaman özete girmez.
+    """
+    if isinstance(payload, list):
+        return {"count": len(payload), "items": [summarize_payload(item) for item in payload]}
+    if not isinstance(payload, dict):
+        return {"type": type(payload).__name__}
+
+    image_data = payload.get("imageData") or {}
+    image_bytes = {
+        key: len(value)
+        for key, value in image_data.items()
+        if isinstance(value, str)
+    }
+    if has_binary_image(payload):
+        image_bytes[IMAGE_BYTES_KEY] = payload[IMAGE_BYTES_KEY].nbytes
+
+    event = payload.get("event") or {}
+    details = payload.get("detectionDetails") or {}
+    return {
+        "cameraId": payload.get("cameraId"),
+        "venueId": payload.get("venueId"),
+        "zoneId": payload.get("zoneId"),
+        "eventId": event.get("id"),
+        "eventType": event.get("type"),
+        "confidence": details.get("confidence", image_data.get("confidence")),
+        "imageBytes": image_bytes
+    }
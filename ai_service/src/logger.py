@@ -1,42 +1,224 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from pythonjsonlogger import jsonlogger
-from config.config import LOGS_DIR, LOG_LEVEL, LOG_FORMAT
+from config.config import (
+    LOGS_DIR, LOG_LEVEL, LOG_FORMAT, LOG_QUEUE_SIZE,
+    LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_WHEN,
+    LOG_RATE_LIMIT, LOG_RATE_BURST
+)
 
-def setup_logger(name: str) -> logging.Logger:
+
+class RateLimitFilter(logging.Filter):
+    """
+    Aynı çağrı noktasından gelen kayıtları token bucket ile sınırlar.
+
+    Anahtar mesaj metni değil (f-string'lerde her seferinde farklıdır) kaydın
+    üretildiği dosya/satırdır. Atılan kayıt sayısı, geçen bir sonraki kayda
+    `suppressed` alanı olarak eklenir. ERROR ve üzeri kayıtlar hiçbir zaman
+    sınırlanmaz; tekrarlayan uyarıların arasında hatalar kaybolmaz.
+    """
+
+    def __init__(self, rate: float = LOG_RATE_LIMIT, burst: int = LOG_RATE_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [token sayısı, son güncelleme, atılan kayıt sayısı]
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa çağıranı bekletmek yerine kaydı atar"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _RoutingHandler(logging.Handler):
+    """Kaydı logger ismine ait dosya handler'ına yönlendirir (listener thread'inde çalışır)"""
+
+    def __init__(self):
+        super().__init__()
+        self.handlers: Dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord):
+        handler = self.handlers.get(record.name)
+        if handler is None and getattr(record, "forwarded", False):
+            # Alt süreçten gelen ve bu süreçte kurulmamış logger'ın dosyası
+            handler = self.handlers[record.name] = _file_handler(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+    def close(self):
+        for handler in self.handlers.values():
+            handler.close()
+        super().close()
+
+
+class _RelayHandler(logging.Handler):
+    """Alt süreçlerden gelen kayıtları bu sürecin log kuyruğuna aktarır"""
+
+    def emit(self, record: logging.LogRecord):
+        record.forwarded = True
+        try:
+            _queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(LOG_QUEUE_SIZE)
+_router = _RoutingHandler()
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+# Alt süreçte kayıtların gönderildiği ana süreç kuyruğu (None: dosyaya bu süreç yazar)
+_parent_queue = None
+
+
+def _file_handler(name: str) -> logging.Handler:
+    """Logger'ın JSON dosyası için boyut veya zaman bazlı rotasyonlu handler"""
+    filename = LOGS_DIR / f"{name}.json"
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            filename=filename,
+            when=LOG_ROTATE_WHEN,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+            delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            filename=filename,
+            mode='a',
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+            delay=True
+        )
+    handler.setFormatter(jsonlogger.JsonFormatter(LOG_FORMAT))
+    return handler
+
+
+def _ensure_listener():
+    """Konsol ve dosya yazımını yapan tek arka plan thread'ini başlatır"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _listener = logging.handlers.QueueListener(_queue, console_handler, _router)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Kuyruktaki kayıtları yazar ve listener thread'ini durdurur"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        _router.close()
+
+
+def relay_child_logs(log_queue) -> logging.handlers.QueueListener:
+    """
+    Ana süreçte çağrılır: alt süreçlerin `log_queue`'ya gönderdiği kayıtları
+    bu sürecin konsol ve dosya yazımına aktarır. Log dosyalarını yalnızca
+    ana süreç yazar ve döndürür; süreçler aynı dosyayı ayrı ayrı döndürmez.
+
+    Returns:
+        QueueListener: Kapatırken stop() çağrılmalı
+    """
+    _ensure_listener()
+    relay = logging.handlers.QueueListener(log_queue, _RelayHandler())
+    relay.start()
+    return relay
+
+
+def forward_logs_to_parent(log_queue):
+    """
+    Alt süreçte, başka bir iş yapılmadan önce çağrılır: bu süreçteki tüm
+    logger'lar kayıtlarını dosyaya yazmak yerine ana sürecin kuyruğuna gönderir.
+    """
+    global _parent_queue
+    _parent_queue = log_queue
+    shutdown_logging()
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        for handler in getattr(logger, "handlers", []):
+            if isinstance(handler, DroppingQueueHandler):
+                handler.queue = log_queue
+
+
+def setup_logger(name: str, rate_limit: Optional[float] = None) -> logging.Logger:
     """
     Belirtilen isimde bir logger oluşturur ve yapılandırır.
-    
+
+    Kayıtlar çağıran thread'de yalnızca kuyruğa eklenir; biçimlendirme,
+    JSON serileştirme ve disk yazımı tek bir arka plan thread'inde yapılır.
+
     Args:
         name: Logger ismi
-        
+        rate_limit: Çağrı noktası başına saniyede izin verilen kayıt sayısı
+            (verilmezse LOG_RATE_LIMIT, 0 ise sınırsız)
+
     Returns:
         logging.Logger: Yapılandırılmış logger nesnesi
     """
     # Logs dizinini oluştur
     Path(LOGS_DIR).mkdir(parents=True, exist_ok=True)
-    
+
     # Logger'ı oluştur
     logger = logging.getLogger(name)
     logger.setLevel(LOG_LEVEL)
-    
-    # Formatları oluştur
-    console_formatter = logging.Formatter(LOG_FORMAT)
-    json_formatter = jsonlogger.JsonFormatter(LOG_FORMAT)
-    
-    # Konsol handler'ı
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # Dosya handler'ı (JSON formatında)
-    file_handler = logging.FileHandler(
-        filename=LOGS_DIR / f"{name}.json",
-        mode='a',
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(json_formatter)
-    logger.addHandler(file_handler)
-    
-    return logger 
\ No newline at end of file
+    if any(isinstance(handler, DroppingQueueHandler) for handler in logger.handlers):
+        return logger
+
+    if _parent_queue is None:
+        # Dosya handler'ı (JSON formatında, listener thread'inde yazılır)
+        _router.handlers[name] = _file_handler(name)
+        _ensure_listener()
+
+    # Kuyruk handler'ı (alt süreçte ana sürecin kuyruğuna gönderir)
+    queue_handler = DroppingQueueHandler(_queue if _parent_queue is None else _parent_queue)
+    queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT if rate_limit is None else rate_limit))
+    logger.addHandler(queue_handler)
+
+    return logger
@@ -1,7 +1,10 @@
 import asyncio
-import torch
 from pathlib import Path
+from config.config import DEFAULT_MODEL_PATH, INFERENCE_DEVICE, PROCESS_WORKERS
 from .detection_service import DetectionService
+from .multi_camera import MultiCameraService
+from .sharding import ShardedService
+from .cameras import load_camera_definitions
 from .logger import setup_logger
 
 logger = setup_logger("main")
@@ -11,18 +14,26 @@ async def main():
     Ana uygulama fonksiyonu
     """
     try:
-        # GPU kontrolü
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        logger.info(f"Cihaz: {device}")
+        # Cihaz INFERENCE_DEVICE ile sabitlenebilir; boşsa model yüklenirken
+        # otomatik seçilir (torch yalnızca model yüklenirken import edilir)
+        device = INFERENCE_DEVICE or None
+        logger.info(f"Cihaz: {device or 'otomatik'}")
         
         # Model dosyasını kontrol et
-        model_path = Path("models/best.pt")
+        model_path = Path(DEFAULT_MODEL_PATH)
         if not model_path.exists():
             logger.error(f"Model dosyası bulunamadı: {model_path}")
             return
             
-        # Servisi başlat
-        service = DetectionService()
+        # Servisi başlat: PROCESS_WORKERS > 0 ise kameralar çıkarım süreçlerine
+        # paylaştırılır, değilse birden fazla kamera tek süreçte çalışır
+        cameras = load_camera_definitions()
+        if PROCESS_WORKERS > 0:
+            service = ShardedService(cameras, device=device, workers=PROCESS_WORKERS)
+        elif len(cameras) > 1:
+            service = MultiCameraService(cameras, device=device)
+        else:
+            service = DetectionService(cameras[0], device=device)
         await service.run()
         
     except Exception as e:
@@ -0,0 +1,337 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.config import METRICS_HOST, METRICS_PORT, SYSTEM_METRICS_INTERVAL
+from .logger import setup_logger
+
+logger = setup_logger("metrics")
+
+# Aşama süreleri için kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    """Etiket değerlerine göre alt ölçümleri tutan ortak sınıf"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """
+        Etiket değerlerine ait ölçümü döndürür. Sık kullanılan ölçümler
+        çağıran tarafta saklanmalıdır (her karede sözlük araması yapılmasın).
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return list(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for values, child in self._items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {child.value}")
+        return lines
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for values, child in self._items():
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.label_names, values, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ölçümleri ve okuma anında güncellenen toplayıcıları tutar"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Her okumadan önce çağrılır (ör. kuyruk derinliklerini gauge'lara yazmak için)"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Prometheus metin formatında çıktı üretir"""
+        with self._lock:
+            collectors, metrics = list(self._collectors), list(self._metrics)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"Metrik toplayıcı hatası: {str(e)}")
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "smoke_stage_seconds", "Pipeline aşama süresi (saniye)", ("stage", "camera")
+))
+FRAMES = REGISTRY.register(Counter(
+    "smoke_frames_total", "İşlenen kare sayısı", ("camera",)
+))
+FRAMES_DROPPED = REGISTRY.register(Counter(
+    "smoke_frames_dropped_total", "İşlenmeden atılan kare sayısı", ("camera",)
+))
+INFERENCES_SKIPPED = REGISTRY.register(Counter(
+    "smoke_inferences_skipped_total", "Hareket kapısı nedeniyle atlanan çıkarım sayısı", ("camera",)
+))
+ALERTS = REGISTRY.register(Counter(
+    "smoke_alerts_total", "Verilen uyarı sayısı", ("camera",)
+))
+EVENTS = REGISTRY.register(Counter(
+    "smoke_events_total", "Üretilen olay sayısı", ("camera", "type")
+))
+UPLOADS = REGISTRY.register(Counter(
+    "smoke_uploads_total", "Gönderim sonuçları (sent, failed, spooled, drained, rejected)", ("camera", "status")
+))
+UPLOAD_RETRIES = REGISTRY.register(Counter(
+    "smoke_upload_retries_total", "Yeniden denenen gönderim sayısı"
+))
+QUALITY_LEVEL = REGISTRY.register(Gauge(
+    "smoke_quality_level", "Yük uyumlu kalite basamağı (0: en yüksek kalite)", ("camera",)
+))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "smoke_queue_depth", "Kuyruk derinliği", ("queue", "camera")
+))
+QUEUE_DROPPED = REGISTRY.register(Gauge(
+    "smoke_queue_dropped", "Kuyruktan atılan eleman sayısı", ("queue", "camera")
+))
+SYSTEM_CPU = REGISTRY.register(Gauge("smoke_system_cpu_percent", "Sistem CPU kullanımı (%)"))
+SYSTEM_RAM = REGISTRY.register(Gauge("smoke_system_ram_percent", "Sistem RAM kullanımı (%)"))
+PROCESS_RSS = REGISTRY.register(Gauge("smoke_process_rss_bytes", "Süreç bellek kullanımı (byte)"))
+
+
+class CameraMetrics:
+    """Bir kameranın sık güncellenen ölçümleri (etiket araması bir kez yapılır)"""
+
+    def __init__(self, camera_id: str):
+        self.camera_id = camera_id
+        self.capture = STAGE_SECONDS.labels("capture", camera_id)
+        self.preprocess = STAGE_SECONDS.labels("preprocess", camera_id)
+        self.inference = STAGE_SECONDS.labels("inference", camera_id)
+        self.postprocess = STAGE_SECONDS.labels("postprocess", camera_id)
+        self.encode = STAGE_SECONDS.labels("encode", camera_id)
+        self.upload = STAGE_SECONDS.labels("upload", camera_id)
+        self.frames = FRAMES.labels(camera_id)
+        self.frames_dropped = FRAMES_DROPPED.labels(camera_id)
+        self.inferences_skipped = INFERENCES_SKIPPED.labels(camera_id)
+        self.alerts = ALERTS.labels(camera_id)
+        self.quality_level = QUALITY_LEVEL.labels(camera_id)
+
+    def event(self, event_type: str):
+        EVENTS.labels(self.camera_id, event_type).inc()
+
+
+class SystemMetricsSampler:
+    """
+    Sistem metriklerini arka planda periyodik olarak örnekler.
+
+    Payload hazırlanırken psutil çağrılmaz; son örnek kullanılır.
+    """
+
+    def __init__(self, interval: float = SYSTEM_METRICS_INTERVAL):
+        self.interval = interval
+        self._latest: Optional[Dict[str, float]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Dict[str, float]:
+        import psutil
+
+        snapshot = {
+            "cpuPercent": psutil.cpu_percent(),
+            "ramPercent": psutil.virtual_memory().percent
+        }
+        rss = psutil.Process().memory_info().rss
+        SYSTEM_CPU.labels().set(snapshot["cpuPercent"])
+        SYSTEM_RAM.labels().set(snapshot["ramPercent"])
+        PROCESS_RSS.labels().set(rss)
+        self._latest = snapshot
+        return snapshot
+
+    def latest(self) -> Dict[str, float]:
+        """Son örneği döndürür (henüz örnek yoksa bir kez örnekler)"""
+        return self._latest if self._latest is not None else self.sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Sistem metrikleri okunamadı: {str(e)}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="system-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+
+system_metrics = SystemMetricsSampler()
+
+
+class MetricsServer:
+    """Ölçümleri /metrics adresinde Prometheus metin formatında sunar"""
+
+    def __init__(self, host: str = METRICS_HOST, port: int = METRICS_PORT, registry: MetricsRegistry = REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır"""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    return self.send_error(404)
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrik sunucusu başlatıldı: http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,274 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import cv2
+
+from config.config import (
+    DEFAULT_MODEL_PATH, FRAME_QUEUE_SIZE, HEADLESS, WARMUP_RUNS
+)
+from .logger import setup_logger
+from .api_client import APIClient
+from .backends import create_backend
+from .cameras import CameraDefinition
+from .detection_service import DetectionService
+from .detections import DetectionBatch
+from .camera_config import CameraConfigStore
+from .pipeline import FramePipeline, DropOldestQueue
+from .metrics import QUEUE_DEPTH, QUEUE_DROPPED
+from .health import health, start_health_server
+
+logger = setup_logger("multi_camera")
+
+
+class MultiCameraPipeline(FramePipeline):
+    """
+    Birden fazla kamera akışını tek modelle işleyen pipeline.
+
+    Her kamera kendi capture thread'inde okunur; inference thread'i her
+    akıştan en son kareyi toplayıp tek bir batch halinde modele verir.
+    """
+
+    def __init__(self, service: "MultiCameraService", show_window: bool = not HEADLESS):
+        super().__init__(service, show_window)
+        self.frame_queues = {
+            camera_service.camera.camera_id: DropOldestQueue(FRAME_QUEUE_SIZE)
+            for camera_service in service.services
+        }
+        self.latest_outputs: Dict[str, Any] = {}
+        self.batch_count = 0
+        self.batched_frames = 0
+        self._active_streams = len(service.services)
+        self._active_lock = threading.Lock()
+
+    def _camera_capture_loop(self, camera_service: DetectionService):
+        """Tek bir kameradan kare okuyup o kameranın kuyruğuna yazar"""
+        camera_id = camera_service.camera.camera_id
+        queue = self.frame_queues[camera_id]
+        metrics = camera_service.metrics
+        frame_id = 0
+        while not self.stop_event.is_set():
+            if camera_service.pending_resolution is not None:
+                camera_service.apply_resolution()
+            start = time.perf_counter()
+            ret, frame = camera_service.cap.read()
+            if not ret:
+                logger.error("Kameradan görüntü alınamadı", extra={"camera_id": camera_id})
+                break
+            elapsed = time.perf_counter() - start
+            self.stats["capture"].record(elapsed)
+            metrics.capture.observe(elapsed)
+            health.frame_captured(camera_id)
+            if camera_service.clip_recorder is not None:
+                camera_service.clip_recorder.on_frame(frame, camera_service.clock())
+            frame_id += 1
+            dropped = queue.dropped
+            queue.put((frame_id, time.time(), frame))
+            if queue.dropped != dropped:
+                metrics.frames_dropped.inc()
+
+        # Tüm akışlar kapandıysa pipeline'ı durdur
+        with self._active_lock:
+            self._active_streams -= 1
+            if self._active_streams <= 0:
+                self.stop_event.set()
+
+    def _collect_batch(self) -> List[tuple]:
+        """Her kameranın kuyruğundaki en son kareyi (servis, kare, yakalanma zamanı) toplar"""
+        batch = []
+        for camera_service in self.service.services:
+            item = self.frame_queues[camera_service.camera.camera_id].get(timeout=0)
+            if item is not None:
+                batch.append((camera_service, item[2], item[1]))
+        return batch
+
+    def _publish(self, camera_service: DetectionService, frame, detections):
+        """Son kareyi debug ekranına ve önizleme sunucusuna bırakır"""
+        camera_id = camera_service.camera.camera_id
+        if self.show_window:
+            self.latest_outputs[camera_id] = (camera_service, frame, detections)
+        if self.preview:
+            self.preview.publish(camera_id, frame, detections, camera_service.annotate)
+
+    def _inference_loop(self):
+        """Toplanan kareler üzerinde tek ileri geçişle çıkarım yapar"""
+        while not self.stop_event.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                time.sleep(0.002)
+                continue
+
+            try:
+                # Tespiti kapalı ve durağan sahnedeki kameralar batch'e alınmaz
+                to_infer = []
+                for camera_service, frame, captured_at in batch:
+                    if camera_service.settings.enabled:
+                        if camera_service.scheduler.should_infer(frame, camera_service.clock()):
+                            to_infer.append((camera_service, frame, captured_at))
+                            continue
+                        camera_service.metrics.inferences_skipped.inc()
+                    empty = DetectionBatch.empty()
+                    camera_service.handle_detections(frame, empty, self.upload_queue)
+                    self._publish(camera_service, frame, empty)
+                    camera_service.quality.observe(time.time() - captured_at)
+                if not to_infer:
+                    health.frame_processed()
+                    continue
+
+                start = time.perf_counter()
+                # ROI'li kameralar birden fazla giriş üretir; hepsi aynı batch'e girer.
+                # Batch tek boyutta çalışır: kalitesi en çok düşürülmüş kameranın giriş boyutu
+                input_size = min(camera_service.model_input_size() for camera_service, _, _ in to_infer)
+                processed, spans = [], []
+                for camera_service, frame, _ in to_infer:
+                    inputs = camera_service.preprocess(frame, input_size)
+                    spans.append((len(processed), len(processed) + len(inputs)))
+                    processed.extend(inputs)
+                inference_start = time.perf_counter()
+                results = self.service.backend.predict(processed)
+                inference_time = time.perf_counter() - inference_start
+                self.stats["inference"].record(time.perf_counter() - start)
+                # Batch'teki her kare aynı ileri geçişi bekler
+                for camera_service, _, _ in to_infer:
+                    camera_service.metrics.inference.observe(inference_time)
+                self.batch_count += 1
+                self.batched_frames += len(to_infer)
+
+                start = time.perf_counter()
+                for (camera_service, frame, _), (first, last) in zip(to_infer, spans):
+                    frame, detections = camera_service.postprocess(frame, results[first:last])
+                    camera_service.scheduler.report(bool(detections), camera_service.clock())
+                    camera_service.handle_detections(frame, detections, self.upload_queue)
+                    self._publish(camera_service, frame, detections)
+                self.stats["postprocess"].record(time.perf_counter() - start)
+                health.frame_processed()
+                # Kalite kontrolü: her kamera kendi karesinin yakalamadan itibaren gecikmesini görür
+                for camera_service, _, captured_at in to_infer:
+                    camera_service.quality.observe(time.time() - captured_at)
+            except Exception as e:
+                logger.error(f"Batch işlenirken hata oluştu: {str(e)}", extra={"batch_size": len(batch)})
+
+    def _camera_services(self) -> List[DetectionService]:
+        return self.service.services
+
+    def get_stats(self, reset: bool = False) -> Dict[str, Any]:
+        stats = super().get_stats(reset)
+        stats["queues"]["frames"] = {
+            camera_id: {"depth": queue.qsize(), "dropped": queue.dropped}
+            for camera_id, queue in self.frame_queues.items()
+        }
+        stats["avgBatchSize"] = self.batched_frames / self.batch_count if self.batch_count else 0.0
+        return stats
+
+    def _collect_metrics(self):
+        for camera_id, queue in self.frame_queues.items():
+            QUEUE_DEPTH.labels("frames", camera_id).set(queue.qsize())
+            QUEUE_DROPPED.labels("frames", camera_id).set(queue.dropped)
+        QUEUE_DEPTH.labels("uploads", "").set(self.upload_queue.qsize())
+        QUEUE_DROPPED.labels("uploads", "").set(self.upload_queue.dropped)
+
+    def _create_threads(self) -> List[threading.Thread]:
+        threads = [
+            threading.Thread(
+                target=self._camera_capture_loop,
+                args=(camera_service,),
+                name=f"capture-{camera_service.camera.camera_id}",
+                daemon=True
+            )
+            for camera_service in self.service.services
+        ]
+        threads.append(threading.Thread(target=self._inference_loop, name="inference", daemon=True))
+        return threads
+
+    def _show_frames(self) -> bool:
+        for camera_id, (camera_service, frame, detections) in list(self.latest_outputs.items()):
+            cv2.imshow(f'Sigara Tespiti - {camera_id}', camera_service.annotate(frame, detections))
+        if self.latest_outputs and cv2.waitKey(1) & 0xFF == ord('q'):
+            return False
+        return True
+
+
+class MultiCameraService:
+    """
+    Tek süreçte birden fazla kamerayı tek bir model kopyasıyla çalıştırır.
+
+    Her kamera için ayrı bir DetectionService tutulur; böylece tespit buffer'ı,
+    uyarı zamanlaması gibi durumlar kameralar arasında karışmaz.
+    """
+
+    def __init__(self, cameras: List[CameraDefinition], device: Optional[str] = None):
+        self.cameras = cameras
+        self.device = device
+        self.backend = None
+        self.api_client = APIClient()
+        self.config_store = CameraConfigStore(self.api_client)
+        self.services: List[DetectionService] = []
+        self.pipeline = None
+
+    def initialize(self) -> bool:
+        """
+        Modeli bir kez yükler ve her kamera için servisi başlatır.
+
+        Returns:
+            bool: En az bir kamera açıldıysa True
+        """
+        try:
+            with health.timeline.phase("model_load"):
+                self.backend = create_backend(DEFAULT_MODEL_PATH, device=self.device)
+        except Exception as e:
+            logger.error(f"Model yüklenemedi: {str(e)}")
+            return False
+
+        services = [
+            DetectionService(
+                camera,
+                backend=self.backend,
+                api_client=self.api_client,
+                config_store=self.config_store
+            )
+            for camera in self.cameras
+        ]
+        # Kameralar açılmadan, çalışmadaki batch boyutuyla ısınma
+        batch_size = sum(service.inputs_per_frame() for service in services)
+        try:
+            with health.timeline.phase("warmup", runs=WARMUP_RUNS, batch_size=batch_size):
+                self.backend.warmup(WARMUP_RUNS, batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Model ısınması başarısız: {str(e)}")
+            return False
+        health.model_loaded = True
+
+        for service in services:
+            camera = service.camera
+            if service.initialize():
+                self.services.append(service)
+            else:
+                logger.error("Kamera başlatılamadı", extra={"camera_id": camera.camera_id})
+
+        logger.info(f"{len(self.services)}/{len(self.cameras)} kamera başlatıldı")
+        return bool(self.services)
+
+    async def run(self):
+        """Ana servis döngüsü"""
+        start_health_server(self.api_client.backend_reachable)
+        if not self.initialize():
+            return
+
+        try:
+            self.pipeline = MultiCameraPipeline(self)
+            await self.pipeline.run()
+
+        except Exception as e:
+            logger.error(f"Servis çalışırken hata oluştu: {str(e)}")
+
+        finally:
+            await self.cleanup()
+
+    async def cleanup(self):
+        """Tüm kameraları ve bağlantıları kapatır"""
+        for service in self.services:
+            if service.cap:
+                service.cap.release()
+        if not HEADLESS:
+            cv2.destroyAllWindows()
+        await self.api_client.close_websocket()
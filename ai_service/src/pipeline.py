@@ -0,0 +1,320 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import cv2
+
+from config.config import (
+    FRAME_QUEUE_SIZE, UPLOAD_QUEUE_SIZE, PIPELINE_STATS_INTERVAL, HEADLESS, PREVIEW_PORT,
+    METRICS_PORT, CLIP_ENABLED
+)
+from .logger import setup_logger
+from .uploader import DetectionUploader
+from .preview import PreviewServer
+from .metrics import REGISTRY, QUEUE_DEPTH, QUEUE_DROPPED, MetricsServer, system_metrics
+from .health import health, health_server
+from .clips import clip_writer
+from .alerts import alert_dispatcher
+
+logger = setup_logger("pipeline")
+
+
+class DropOldestQueue:
+    """
+    Sınırlı kapasiteli, thread-safe kuyruk.
+
+    Kuyruk doluyken yeni eleman eklenirse en eski eleman atılır; böylece
+    tüketici her zaman en taze veriyle çalışır.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._items: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item: Any):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Kuyruktan eleman alır.
+
+        Args:
+            timeout: Bekleme süresi (saniye)
+
+        Returns:
+            Eleman veya zaman aşımında None
+        """
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def qsize(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class StageStats:
+    """Bir pipeline aşamasının işlenen eleman sayısı ve gecikme istatistikleri"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float):
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+
+    def snapshot(self, reset: bool = False) -> Dict[str, float]:
+        with self._lock:
+            data = {
+                "count": self.count,
+                "avgMs": (self.total_time / self.count * 1000) if self.count else 0.0,
+                "maxMs": self.max_time * 1000,
+                "lastMs": self.last_time * 1000
+            }
+            if reset:
+                self.count = 0
+                self.total_time = 0.0
+                self.max_time = 0.0
+            return data
+
+
+class FramePipeline:
+    """
+    Yakalama, çıkarım ve gönderim aşamalarını birbirinden ayıran pipeline.
+
+    capture thread -> frame kuyruğu -> inference thread -> upload kuyruğu -> async uploader
+
+    Kuyruklar en eskiyi atma politikasıyla çalışır; yavaş bir backend çağrısı
+    kamerayı bekletmez ve çıkarım her zaman en son kare üzerinde yapılır.
+    """
+
+    def __init__(self, service, show_window: bool = not HEADLESS):
+        self.service = service
+        self.show_window = show_window
+        self.preview = PreviewServer() if PREVIEW_PORT else None
+        self.metrics_server = MetricsServer() if METRICS_PORT else None
+        self.health_server = health_server
+        self.frame_queue = DropOldestQueue(FRAME_QUEUE_SIZE)
+        self.upload_queue = DropOldestQueue(UPLOAD_QUEUE_SIZE)
+        self.stats = {
+            name: StageStats(name)
+            for name in ("capture", "inference", "postprocess", "upload")
+        }
+        self.stop_event = threading.Event()
+        self.latest_output = None
+        self.uploader = None
+        self._threads = []
+
+    def _capture_loop(self):
+        """Kameradan kare okuyup frame kuyruğuna yazar"""
+        metrics = self.service.metrics
+        camera_id = self.service.camera.camera_id
+        frame_id = 0
+        while not self.stop_event.is_set():
+            if self.service.pending_resolution is not None:
+                self.service.apply_resolution()
+            start = time.perf_counter()
+            ret, frame = self.service.cap.read()
+            if not ret:
+                logger.error("Kameradan görüntü alınamadı")
+                self.stop_event.set()
+                break
+            elapsed = time.perf_counter() - start
+            self.stats["capture"].record(elapsed)
+            metrics.capture.observe(elapsed)
+            health.frame_captured(camera_id)
+            if self.service.clip_recorder is not None:
+                self.service.clip_recorder.on_frame(frame, self.service.clock())
+            frame_id += 1
+            dropped = self.frame_queue.dropped
+            self.frame_queue.put((frame_id, time.time(), frame))
+            if self.frame_queue.dropped != dropped:
+                metrics.frames_dropped.inc()
+
+    def _inference_loop(self):
+        """Kareleri işler, metrikleri günceller ve gönderilecek verileri hazırlar"""
+        while not self.stop_event.is_set():
+            item = self.frame_queue.get(timeout=0.5)
+            if item is None:
+                continue
+            frame_id, captured_at, frame = item
+
+            try:
+                start = time.perf_counter()
+                frame, detections = self.service.process_frame(frame)
+                self.stats["inference"].record(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                self.service.handle_detections(frame, detections, self.upload_queue)
+                self.stats["postprocess"].record(time.perf_counter() - start)
+                health.frame_processed()
+                # Yakalamadan itibaren geçen süre kalite kontrolüne bildirilir
+                self.service.quality.observe(time.time() - captured_at)
+
+                if self.show_window:
+                    self.latest_output = (frame, detections)
+                if self.preview:
+                    self.preview.publish(self.service.camera.camera_id, frame, detections, self.service.annotate)
+            except Exception as e:
+                logger.error(f"Kare işlenirken hata oluştu: {str(e)}", extra={"frame_id": frame_id})
+
+    async def _upload_loop(self):
+        """Hazırlanan tespit verilerini backend'e gönderir"""
+        loop = asyncio.get_running_loop()
+        while not self.stop_event.is_set():
+            detection_data = await loop.run_in_executor(None, self.upload_queue.get, 0.5)
+            if detection_data is None:
+                continue
+
+            # Kuyruğa ekleme süresi; HTTP isteğinin süresi uploader'da ölçülür
+            start = time.perf_counter()
+            self.service.api_client.send_ws_notification(detection_data)
+            await self.uploader.submit(detection_data)
+            self.stats["upload"].record(time.perf_counter() - start)
+
+    async def _stats_loop(self):
+        """Aşama başına kuyruk derinliği ve gecikme bilgisini periyodik olarak loglar"""
+        while not self.stop_event.is_set():
+            await asyncio.sleep(PIPELINE_STATS_INTERVAL)
+            logger.info("Pipeline istatistikleri", extra={"pipeline": self.get_stats(reset=True)})
+
+    def _camera_services(self) -> List[Any]:
+        """Pipeline'ın işlediği kamera servisleri"""
+        return [self.service]
+
+    def get_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Aşama istatistiklerini döndürür.
+
+        Args:
+            reset: Okuduktan sonra sayaçları sıfırla
+
+        Returns:
+            Dict[str, Any]: Aşama gecikmeleri ve kuyruk durumları
+        """
+        return {
+            "stages": {name: stats.snapshot(reset) for name, stats in self.stats.items()},
+            "uploader": dict(self.uploader.stats) if self.uploader else {},
+            "alerts": dict(alert_dispatcher.stats),
+            "scheduler": {
+                camera_service.camera.camera_id: camera_service.scheduler.get_stats()
+                for camera_service in self._camera_services()
+            },
+            "quality": {
+                camera_service.camera.camera_id: camera_service.quality.get_stats()
+                for camera_service in self._camera_services()
+            },
+            "queues": {
+                "frames": {"depth": self.frame_queue.qsize(), "dropped": self.frame_queue.dropped},
+                "uploads": {"depth": self.upload_queue.qsize(), "dropped": self.upload_queue.dropped}
+            }
+        }
+
+    def _collect_metrics(self):
+        """/metrics okunurken kuyruk durumlarını gauge'lara yazar"""
+        camera_id = self.service.camera.camera_id
+        QUEUE_DEPTH.labels("frames", camera_id).set(self.frame_queue.qsize())
+        QUEUE_DROPPED.labels("frames", camera_id).set(self.frame_queue.dropped)
+        QUEUE_DEPTH.labels("uploads", "").set(self.upload_queue.qsize())
+        QUEUE_DROPPED.labels("uploads", "").set(self.upload_queue.dropped)
+
+    def _create_threads(self) -> List[threading.Thread]:
+        """Pipeline'ın çalışan thread'lerini oluşturur"""
+        return [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True)
+        ]
+
+    def _show_frames(self) -> bool:
+        """
+        Son işlenmiş kareyi gösterir (debug modu için).
+
+        Returns:
+            bool: Kullanıcı çıkış istediyse False
+        """
+        if self.latest_output is not None:
+            frame, detections = self.latest_output
+            cv2.imshow('Sigara Tespiti', self.service.annotate(frame, detections))
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                return False
+        return True
+
+    async def run(self):
+        """Pipeline thread'lerini başlatır ve durdurulana kadar çalışır"""
+        self.uploader = DetectionUploader(self.service.api_client)
+        await self.uploader.start()
+        if self.preview:
+            self.preview.start()
+        system_metrics.start()
+        REGISTRY.add_collector(self._collect_metrics)
+        if self.metrics_server:
+            self.metrics_server.start()
+        if CLIP_ENABLED:
+            clip_writer.start(self.service.api_client)
+        # Ses dosyası ilk uyarıdan önce, bir kez çözülür
+        alert_dispatcher.start()
+
+        self._threads = self._create_threads()
+        for thread in self._threads:
+            thread.start()
+
+        tasks = [
+            asyncio.create_task(self._upload_loop()),
+            asyncio.create_task(self._stats_loop())
+        ]
+        config_store = self.service.config_store
+        if config_store.enabled:
+            # Kamera ayarları: TTL ile yenileme ve WebSocket ile gelen güncellemeler
+            tasks.append(asyncio.create_task(config_store.refresh_loop()))
+            self.service.api_client.add_ws_handler(config_store.handle_message)
+        self.service.api_client.start_websocket()
+
+        try:
+            while not self.stop_event.is_set():
+                if not self.show_window:
+                    # Headless: GUI çağrısı yok, yalnızca durdurulmayı bekle
+                    await asyncio.sleep(0.5)
+                    continue
+                if not self._show_frames():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            self.stop_event.set()
+            if self.preview:
+                self.preview.stop()
+            if self.metrics_server:
+                self.metrics_server.stop()
+            if self.health_server:
+                self.health_server.stop()
+            REGISTRY.remove_collector(self._collect_metrics)
+            system_metrics.stop()
+            for thread in self._threads:
+                thread.join(timeout=2)
+            if CLIP_ENABLED:
+                await asyncio.to_thread(clip_writer.stop)
+            await asyncio.to_thread(alert_dispatcher.stop)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.uploader.close()
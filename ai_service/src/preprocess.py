@@ -0,0 +1,96 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import (
+    MODEL_INPUT_SIZE, BLUR_KERNEL_SIZE, BRIGHTNESS_ALPHA, BRIGHTNESS_BETA
+)
+
+# Ultralytics'in letterbox dolgu rengi
+PAD_VALUE = 114
+
+
+class FramePreprocessor:
+    """
+    Kareyi modelin giriş boyutuna letterbox ederek ön işler.
+
+    Önce model giriş boyutuna küçültülür, bulanıklaştırma ve parlaklık
+    ayarı küçük görüntü üzerinde yerinde yapılır. Tüm ara tamponlar kare
+    boyutu değişmedikçe yeniden kullanılır; kare başına yeni bellek ayrılmaz.
+    Model zaten giriş boyutunda bir görüntü aldığı için kendi içinde tekrar
+    ölçekleme yapmaz. `input_size` çalışma sırasında değiştirilebilir; yeni
+    boyut bir sonraki karede uygulanır.
+    """
+
+    def __init__(
+        self,
+        input_size: int = MODEL_INPUT_SIZE,
+        blur_kernel: Tuple[int, int] = BLUR_KERNEL_SIZE,
+        alpha: float = BRIGHTNESS_ALPHA,
+        beta: float = BRIGHTNESS_BETA
+    ):
+        self.input_size = input_size
+        self.blur_kernel = blur_kernel
+        self.alpha = alpha
+        self.beta = beta
+        self._source_shape: Optional[Tuple[int, int]] = None
+        self._canvas: Optional[np.ndarray] = None
+        self._view: Optional[np.ndarray] = None
+        self.scale = 1.0
+        self.pad_x = 0
+        self.pad_y = 0
+
+    def _allocate(self, height: int, width: int):
+        """Kare boyutuna göre letterbox parametrelerini ve tamponları hazırlar"""
+        self.scale = min(self.input_size / width, self.input_size / height)
+        new_width = int(round(width * self.scale))
+        new_height = int(round(height * self.scale))
+        self.pad_x = (self.input_size - new_width) // 2
+        self.pad_y = (self.input_size - new_height) // 2
+
+        self._canvas = np.full((self.input_size, self.input_size, 3), PAD_VALUE, dtype=np.uint8)
+        self._view = self._canvas[self.pad_y:self.pad_y + new_height, self.pad_x:self.pad_x + new_width]
+        self._source_shape = (height, width)
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Kareyi modele verilecek hale getirir.
+
+        Args:
+            frame: Ham görüntü karesi
+
+        Returns:
+            np.ndarray: Model girişi (bir sonraki çağrıda üzerine yazılır)
+        """
+        if self._source_shape != frame.shape[:2] or self._canvas.shape[0] != self.input_size:
+            self._allocate(*frame.shape[:2])
+
+        cv2.resize(frame, (self._view.shape[1], self._view.shape[0]), dst=self._view,
+                   interpolation=cv2.INTER_AREA)
+        if self.blur_kernel:
+            cv2.GaussianBlur(self._view, self.blur_kernel, 0, dst=self._view)
+        cv2.convertScaleAbs(self._view, dst=self._view, alpha=self.alpha, beta=self.beta)
+        return self._canvas
+
+    def to_frame_coords(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Model girişindeki kutu koordinatlarını (x1, y1, x2, y2) orijinal kareye çevirir.
+
+        Args:
+            boxes: (N, 4) kutu dizisi
+
+        Returns:
+            np.ndarray: Orijinal kare koordinatlarında (N, 4) int dizi
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        if self._source_shape is None:
+            return boxes.astype(np.int32)
+        height, width = self._source_shape
+        mapped = np.empty_like(boxes)
+        # 0::2 -> x1, x2 / 1::2 -> y1, y2 (görünüm olduğu için yerinde güncellenir)
+        mapped[:, 0::2] = (boxes[:, 0::2] - self.pad_x) / self.scale
+        mapped[:, 1::2] = (boxes[:, 1::2] - self.pad_y) / self.scale
+        np.clip(mapped[:, 0::2], 0, width - 1, out=mapped[:, 0::2])
+        np.clip(mapped[:, 1::2], 0, height - 1, out=mapped[:, 1::2])
+        return mapped.astype(np.int32)
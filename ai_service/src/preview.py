@@ -0,0 +1,219 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from config.config import (
+    PREVIEW_HOST, PREVIEW_PORT, PREVIEW_MAX_FPS, PREVIEW_WIDTH, PREVIEW_JPEG_QUALITY
+)
+from .logger import setup_logger
+from .detections import DetectionBatch
+
+logger = setup_logger("preview")
+
+_BOUNDARY = "frame"
+
+
+class _PreviewSlot:
+    """Bir kameranın en son karesi ve (istendiyse) JPEG'e kodlanmış hali"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.frame: Optional[np.ndarray] = None
+        self.detections: Optional[DetectionBatch] = None
+        self.annotate: Optional[Callable] = None
+        self.encoded_sequence = -1
+        self.jpeg: Optional[bytes] = None
+
+
+class PreviewServer:
+    """
+    İşaretli görüntüyü yerel ağdan izlemek için hafif MJPEG/HTTP sunucusu.
+
+    Pipeline her karede yalnızca kare referansını bırakır (kopya ya da
+    kodlama yok). Kodlama, bağlı bir istemci olduğunda istemcinin kendi
+    thread'inde, `max_fps` ile sınırlı hızda ve küçültülmüş boyutta yapılır;
+    aynı kameraya bağlı istemciler kodlanmış kareyi paylaşır.
+
+    Uç noktalar:
+        /                    kamera listesi
+        /stream/<camera_id>  MJPEG akışı
+        /snapshot/<camera_id> tek JPEG
+    """
+
+    def __init__(
+        self,
+        host: str = PREVIEW_HOST,
+        port: int = PREVIEW_PORT,
+        max_fps: float = PREVIEW_MAX_FPS,
+        width: int = PREVIEW_WIDTH,
+        quality: int = PREVIEW_JPEG_QUALITY
+    ):
+        self.host = host
+        self.port = port
+        self.frame_interval = 1.0 / max(max_fps, 0.1)
+        self.width = width
+        self.quality = quality
+        self._slots: Dict[str, _PreviewSlot] = {}
+        self._slots_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.clients = 0
+
+    def publish(
+        self,
+        camera_id: str,
+        frame: np.ndarray,
+        detections: DetectionBatch,
+        annotate: Callable[[np.ndarray, DetectionBatch], np.ndarray]
+    ):
+        """
+        Kameranın en son karesini bildirir. Bağlı istemci yoksa hiçbir iş yapılmaz.
+
+        Args:
+            camera_id: Kamera ID'si
+            frame: Ham görüntü karesi
+            detections: Karenin tespitleri
+            annotate: Kareyi işaretleyen fonksiyon
+        """
+        slot = self._slot(camera_id)
+        if not self.clients:
+            return
+        with slot.lock:
+            slot.sequence += 1
+            slot.frame = frame
+            slot.detections = detections
+            slot.annotate = annotate
+
+    def _slot(self, camera_id: str) -> _PreviewSlot:
+        with self._slots_lock:
+            slot = self._slots.get(camera_id)
+            if slot is None:
+                slot = self._slots[camera_id] = _PreviewSlot()
+            return slot
+
+    def camera_ids(self) -> List[str]:
+        with self._slots_lock:
+            return list(self._slots)
+
+    def latest_jpeg(self, camera_id: str) -> Optional[bytes]:
+        """Kameranın son karesini (gerekirse kodlayarak) JPEG olarak döndürür"""
+        slot = self._slot(camera_id)
+        with slot.lock:
+            if slot.frame is None:
+                return None
+            if slot.encoded_sequence == slot.sequence:
+                return slot.jpeg
+            sequence, frame, detections, annotate = slot.sequence, slot.frame, slot.detections, slot.annotate
+
+        # Kodlama kilit dışında yapılır; pipeline'ın publish çağrısı beklemez
+        image = annotate(frame, detections) if annotate else frame
+        if image.shape[1] > self.width:
+            height = int(image.shape[0] * self.width / image.shape[1])
+            image = cv2.resize(image, (self.width, height), interpolation=cv2.INTER_AREA)
+        _, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+        jpeg = buffer.tobytes()
+
+        with slot.lock:
+            if sequence > slot.encoded_sequence:
+                slot.jpeg = jpeg
+                slot.encoded_sequence = sequence
+        return jpeg
+
+    def _client_connected(self, connected: bool):
+        with self._slots_lock:
+            self.clients += 1 if connected else -1
+            if self.clients == 0:
+                # İzleyen kalmadı; eski kareler tutulmaz, sonraki istemci taze kare bekler
+                for slot in self._slots.values():
+                    with slot.lock:
+                        slot.frame = None
+                        slot.jpeg = None
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır"""
+        preview = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = [part for part in self.path.split("/") if part]
+                if not parts:
+                    return self._send_index()
+                if len(parts) == 2 and parts[0] == "snapshot":
+                    return self._send_snapshot(parts[1])
+                if len(parts) == 2 and parts[0] == "stream":
+                    return self._send_stream(parts[1])
+                self.send_error(404)
+
+            def _send_index(self):
+                links = "".join(
+                    f'<li><a href="/stream/{camera_id}">{camera_id}</a></li>'
+                    for camera_id in preview.camera_ids()
+                )
+                body = f"<html><body><h3>Kameralar</h3><ul>{links}</ul></body></html>".encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_snapshot(self, camera_id: str):
+                preview._client_connected(True)
+                try:
+                    # İstemci bağlanana kadar kare yayınlanmadığı için kısa süre beklenir
+                    deadline = time.monotonic() + 2
+                    jpeg = preview.latest_jpeg(camera_id)
+                    while jpeg is None and time.monotonic() < deadline:
+                        time.sleep(preview.frame_interval)
+                        jpeg = preview.latest_jpeg(camera_id)
+                finally:
+                    preview._client_connected(False)
+                if jpeg is None:
+                    return self.send_error(404)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(jpeg)))
+                self.end_headers()
+                self.wfile.write(jpeg)
+
+            def _send_stream(self, camera_id: str):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={_BOUNDARY}")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                preview._client_connected(True)
+                try:
+                    while True:
+                        started = time.monotonic()
+                        jpeg = preview.latest_jpeg(camera_id)
+                        if jpeg is not None:
+                            self.wfile.write(
+                                f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                            )
+                            self.wfile.write(jpeg)
+                            self.wfile.write(b"\r\n")
+                        time.sleep(max(0.0, preview.frame_interval - (time.monotonic() - started)))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    preview._client_connected(False)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="preview", daemon=True)
+        self._thread.start()
+        logger.info(f"Önizleme sunucusu başlatıldı: http://{self.host}:{self.port}/")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
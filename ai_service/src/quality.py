@@ -0,0 +1,199 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from config.config import (
+    QUALITY_CONTROL_ENABLED, QUALITY_TARGET_FPS, QUALITY_INTERVAL, QUALITY_STEPS,
+    QUALITY_MIN_INPUT_SIZE, QUALITY_MIN_RESOLUTION_SCALE, QUALITY_MIN_INFERENCE_FPS, QUALITY_MIN_UPLOAD_SCALE,
+    QUALITY_MIN_JPEG_QUALITY, QUALITY_CPU_HIGH, QUALITY_CPU_LOW, QUALITY_RAM_HIGH,
+    QUALITY_RAM_LOW, QUALITY_RECOVER_RATIO, QUALITY_DEGRADE_AFTER, QUALITY_RECOVER_AFTER,
+    UPLOAD_IMAGE_SCALE, JPEG_QUALITY, MODEL_INPUT_SIZE
+)
+from .logger import setup_logger
+from .metrics import system_metrics
+
+logger = setup_logger("quality")
+
+# YOLO modellerinin giriş boyutu bu değerin katı olmalıdır
+MODEL_STRIDE = 32
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Bir kalite basamağında kullanılan değerler"""
+    # Modele verilen kare görüntünün kenar uzunluğu (piksel)
+    input_size: int = MODEL_INPUT_SIZE
+    # Kamera çözünürlüğünün ayarlardaki değere oranı (isteğe bağlı)
+    resolution_scale: float = 1.0
+    # Tespit beklenmeyen karelerde iki çıkarım arasındaki en kısa süre (saniye, 0: sınırsız)
+    inference_interval: float = 0.0
+    upload_scale: int = UPLOAD_IMAGE_SCALE
+    jpeg_quality: int = JPEG_QUALITY
+
+
+def build_levels(
+    steps: int = QUALITY_STEPS,
+    min_input_size: int = QUALITY_MIN_INPUT_SIZE,
+    min_resolution_scale: float = QUALITY_MIN_RESOLUTION_SCALE,
+    min_inference_fps: float = QUALITY_MIN_INFERENCE_FPS,
+    min_upload_scale: int = QUALITY_MIN_UPLOAD_SCALE,
+    min_jpeg_quality: int = QUALITY_MIN_JPEG_QUALITY
+) -> List[QualityLevel]:
+    """
+    En yüksek kaliteden (varsayılan ayarlar) sınırlara kadar eşit aralıklı basamaklar üretir.
+    Model giriş boyutu MODEL_STRIDE'ın katına yuvarlanır.
+
+    Returns:
+        List[QualityLevel]: 0. eleman en yüksek kalite
+    """
+    steps = max(0, steps)
+    top = QualityLevel()
+    max_interval = 1.0 / min_inference_fps if min_inference_fps > 0 else 0.0
+    levels = []
+    for step in range(steps + 1):
+        t = step / steps if steps else 0.0
+        input_size = top.input_size - t * (top.input_size - min(min_input_size, top.input_size))
+        levels.append(QualityLevel(
+            input_size=max(MODEL_STRIDE, int(round(input_size / MODEL_STRIDE)) * MODEL_STRIDE),
+            resolution_scale=round(top.resolution_scale - t * (top.resolution_scale - min_resolution_scale), 3),
+            inference_interval=round(t * max_interval, 3),
+            upload_scale=int(round(top.upload_scale - t * (top.upload_scale - min_upload_scale))),
+            jpeg_quality=int(round(top.jpeg_quality - t * (top.jpeg_quality - min_jpeg_quality)))
+        ))
+    return levels
+
+
+class QualityController:
+    """
+    Bir kameranın kalite basamağını ölçülen yüke göre ayarlayan geri besleme döngüsü.
+
+    Her işlenen karenin yakalamadan itibaren geçen süresi (gecikme) toplanır;
+    `interval` saniyede bir ortalama gecikme kare bütçesiyle (1 / target_fps),
+    CPU/RAM kullanımı da arka planda örneklenen son değerlerle karşılaştırılır:
+    - Gecikme bütçeyi veya CPU/RAM "high" sınırını aşarsa yük fazladır
+    - Gecikme bütçenin `recover_ratio` katının ve CPU/RAM "low" sınırlarının
+      altındaysa yük azdır
+    Yük `degrade_after` değerlendirme boyunca fazla kalırsa bir basamak
+    düşülür, `recover_after` değerlendirme boyunca az kalırsa bir basamak
+    çıkılır. İki sınır arasındaki bölgede ve basamak değiştikten sonra
+    sayaçlar sıfırlanır; böylece kalite sınırda gidip gelmez.
+    """
+
+    def __init__(
+        self,
+        camera_id: str = "",
+        levels: Optional[List[QualityLevel]] = None,
+        enabled: bool = QUALITY_CONTROL_ENABLED,
+        target_fps: float = QUALITY_TARGET_FPS,
+        interval: float = QUALITY_INTERVAL,
+        cpu_high: float = QUALITY_CPU_HIGH,
+        cpu_low: float = QUALITY_CPU_LOW,
+        ram_high: float = QUALITY_RAM_HIGH,
+        ram_low: float = QUALITY_RAM_LOW,
+        recover_ratio: float = QUALITY_RECOVER_RATIO,
+        degrade_after: int = QUALITY_DEGRADE_AFTER,
+        recover_after: int = QUALITY_RECOVER_AFTER,
+        sampler=system_metrics
+    ):
+        self.camera_id = camera_id
+        self.levels = levels if levels else build_levels()
+        self.enabled = enabled and len(self.levels) > 1
+        self.budget = 1.0 / target_fps if target_fps > 0 else float("inf")
+        self.interval = interval
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.ram_high = ram_high
+        self.ram_low = ram_low
+        self.recover_ratio = recover_ratio
+        self.degrade_after = max(1, degrade_after)
+        self.recover_after = max(1, recover_after)
+        self.sampler = sampler
+        self.on_change: Optional[Callable[[QualityLevel, QualityLevel], None]] = None
+
+        self.level_index = 0
+        self._latency_sum = 0.0
+        self._samples = 0
+        self._window_start: Optional[float] = None
+        self._overloaded = 0
+        self._relaxed = 0
+        self.last_latency = 0.0
+        self.changes = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    def observe(self, latency: float, now: Optional[float] = None) -> bool:
+        """
+        İşlenen bir karenin gecikmesini kaydeder; aralık dolduysa yükü değerlendirir.
+
+        Args:
+            latency: Karenin yakalanmasından işlenmesinin bitmesine kadar geçen süre (saniye)
+            now: Monotonik zaman
+
+        Returns:
+            bool: Kalite basamağı değiştiyse True
+        """
+        if not self.enabled:
+            return False
+        now = time.monotonic() if now is None else now
+        self._latency_sum += latency
+        self._samples += 1
+        if self._window_start is None:
+            self._window_start = now
+        if now - self._window_start < self.interval:
+            return False
+        return self._evaluate(now)
+
+    def _evaluate(self, now: float) -> bool:
+        latency = self._latency_sum / self._samples
+        self.last_latency = latency
+        self._latency_sum, self._samples, self._window_start = 0.0, 0, now
+
+        system = self.sampler.latest()
+        cpu = system.get("cpuPercent", 0.0)
+        ram = system.get("ramPercent", 0.0)
+
+        if latency > self.budget or cpu >= self.cpu_high or ram >= self.ram_high:
+            self._overloaded += 1
+            self._relaxed = 0
+        elif latency < self.budget * self.recover_ratio and cpu < self.cpu_low and ram < self.ram_low:
+            self._relaxed += 1
+            self._overloaded = 0
+        else:
+            self._overloaded = self._relaxed = 0
+
+        if self._overloaded >= self.degrade_after and self.level_index < len(self.levels) - 1:
+            self._step(1, latency, cpu, ram)
+            return True
+        if self._relaxed >= self.recover_after and self.level_index > 0:
+            self._step(-1, latency, cpu, ram)
+            return True
+        return False
+
+    def _step(self, direction: int, latency: float, cpu: float, ram: float):
+        previous = self.level
+        self.level_index += direction
+        self._overloaded = self._relaxed = 0
+        self.changes += 1
+        logger.info(
+            "Kalite düşürüldü" if direction > 0 else "Kalite artırıldı",
+            extra={
+                "camera_id": self.camera_id,
+                "level": self.level_index,
+                "quality": asdict(self.level),
+                "latencyMs": round(latency * 1000, 1),
+                "cpuPercent": cpu,
+                "ramPercent": ram
+            }
+        )
+        if self.on_change is not None:
+            self.on_change(self.level, previous)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "level": self.level_index,
+            **asdict(self.level),
+            "latencyMs": self.last_latency * 1000,
+            "changes": self.changes
+        }
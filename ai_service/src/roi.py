@@ -0,0 +1,212 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import MODEL_INPUT_SIZE, NMS_IOU_THRESHOLD, ROI_TILE_OVERLAP
+from .backends import InferenceResult
+from .logger import setup_logger
+
+logger = setup_logger("roi")
+
+Crop = Tuple[int, int, int, int]
+
+
+class Region:
+    """
+    Kamera görüntüsünde tespitin yapılacağı bölge.
+
+    Dikdörtgen ([x1, y1, x2, y2]) veya çokgen ([[x, y], ...]) olarak
+    tanımlanır. Tüm değerler 1'den küçük veya eşitse koordinatlar kare
+    boyutuna oranlı kabul edilir. Model çokgenin sınırlayıcı dikdörtgeni
+    üzerinde çalışır; merkezi çokgenin dışında kalan tespitler atılır.
+    """
+
+    def __init__(self, points: Sequence[Sequence[float]], is_polygon: bool):
+        self.points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.is_polygon = is_polygon
+        self.normalized = bool((self.points <= 1.0).all())
+
+    @classmethod
+    def from_config(cls, data: Any) -> "Region":
+        """
+        Args:
+            data: [x1, y1, x2, y2], [[x, y], ...] veya {"rect": ...} / {"polygon": ...}
+        """
+        if isinstance(data, dict):
+            if "polygon" in data:
+                return cls(data["polygon"], is_polygon=True)
+            data = data["rect"]
+        if len(data) == 4 and not isinstance(data[0], (list, tuple)):
+            x1, y1, x2, y2 = data
+            return cls([(x1, y1), (x2, y2)], is_polygon=False)
+        return cls(data, is_polygon=True)
+
+    def resolve(self, width: int, height: int) -> np.ndarray:
+        """Kare boyutuna göre piksel koordinatlarını döndürür"""
+        if self.normalized:
+            return self.points * np.array([width, height], dtype=np.float32)
+        return self.points
+
+
+class RoiPlanner:
+    """
+    Bölgeleri model girişlerine (kırpmalara) böler ve sonuçları birleştirir.
+
+    Normal modda her bölge tek kırpma olarak letterbox edilir. Döşeme
+    modunda bölge, model giriş boyutunda ve `overlap` oranında örtüşen
+    karolara bölünür; böylece küçük nesneler küçültülmeden modele girer.
+    Karo sınırında ikiye bölünen nesneler kare koordinatlarına çevrildikten
+    sonra ortak NMS ile tekilleştirilir. Kare boyutunda kullanılabilir bölge
+    kalmazsa (ör. piksel koordinatlı bölge daha küçük gelen karenin dışında)
+    tam kare işlenir; model hiçbir zaman boş girişle çağrılmaz.
+    """
+
+    def __init__(
+        self,
+        regions: List[Region],
+        tiled: bool = False,
+        tile_size: int = MODEL_INPUT_SIZE,
+        overlap: float = ROI_TILE_OVERLAP,
+        iou_threshold: float = NMS_IOU_THRESHOLD
+    ):
+        self.regions = regions
+        self.tiled = tiled
+        self.tile_size = tile_size
+        self.overlap = min(max(overlap, 0.0), 0.9)
+        self.iou_threshold = iou_threshold
+        self._shape: Optional[Tuple[int, int]] = None
+        self._crops: List[Crop] = []
+        # Her kırpmanın ait olduğu bölgenin çokgeni (dikdörtgen bölgelerde None)
+        self._crop_polygons: List[Optional[np.ndarray]] = []
+        self._warned = False
+
+    @classmethod
+    def from_config(cls, regions: List[Any], tiled: bool = False) -> Optional["RoiPlanner"]:
+        """Bölge yoksa ve döşeme kapalıysa None döner (tam kare tek girişle işlenir)"""
+        if not regions and not tiled:
+            return None
+        return cls([Region.from_config(region) for region in regions], tiled=tiled)
+
+    def crops(self, frame_shape: Tuple[int, ...]) -> List[Crop]:
+        """Kare boyutu için kırpma listesi (boyut değişmedikçe önbellekten)"""
+        shape = frame_shape[:2]
+        if shape != self._shape:
+            self._plan(*shape)
+        return self._crops
+
+    def _plan(self, height: int, width: int):
+        self._shape = (height, width)
+        self._crops = []
+        self._crop_polygons = []
+
+        bounds = []
+        for region in self.regions or [Region([(0, 0), (width, height)], is_polygon=False)]:
+            points = region.resolve(width, height)
+            x1, y1 = np.floor(points.min(axis=0)).astype(int)
+            x2, y2 = np.ceil(points.max(axis=0)).astype(int)
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(width, int(x2)), min(height, int(y2))
+            if x2 - x1 < 2 or y2 - y1 < 2:
+                continue
+            polygon = points.astype(np.float32) if region.is_polygon else None
+            bounds.append(((x1, y1, x2, y2), polygon))
+
+        if not bounds:
+            if not self._warned:
+                logger.warning(
+                    "Kare boyutunda kullanılabilir ROI bölgesi yok, tam kare işlenecek",
+                    extra={"width": width, "height": height, "regions": len(self.regions)}
+                )
+                self._warned = True
+            bounds.append(((0, 0, width, height), None))
+
+        for bound, polygon in bounds:
+            crops = self._tiles(bound) if self.tiled else [bound]
+            self._crops.extend(crops)
+            self._crop_polygons.extend([polygon] * len(crops))
+
+    def _tiles(self, bound: Crop) -> List[Crop]:
+        """Bölgeyi örtüşen, model giriş boyutundaki karolara böler"""
+        x1, y1, x2, y2 = bound
+        size = self.tile_size
+        stride = max(1, int(size * (1 - self.overlap)))
+
+        def starts(start: int, end: int) -> List[int]:
+            if end - start <= size:
+                return [start]
+            # Karolar aralığa eşit dağıtılır; örtüşme en az `overlap` olur
+            count = int(np.ceil((end - start - size) / stride)) + 1
+            step = (end - start - size) / (count - 1)
+            return [start + int(round(index * step)) for index in range(count)]
+
+        return [
+            (tx, ty, min(tx + size, x2), min(ty + size, y2))
+            for ty in starts(y1, y2)
+            for tx in starts(x1, x2)
+        ]
+
+    def inside(self, crop_index: int, boxes: np.ndarray) -> np.ndarray:
+        """
+        Kırpmadan gelen kutuların merkezi, kırpmanın kendi bölgesinin içinde mi.
+
+        Args:
+            crop_index: crops() listesindeki sıra
+            boxes: Kare koordinatlarında kutular
+
+        Returns:
+            np.ndarray: Tutulacak kutular için True (dikdörtgen bölgelerde hepsi True)
+        """
+        polygon = self._crop_polygons[crop_index]
+        if polygon is None:
+            return np.ones(len(boxes), dtype=bool)
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        return np.array(
+            [cv2.pointPolygonTest(polygon, (float(x), float(y)), False) >= 0 for x, y in centers],
+            dtype=bool
+        )
+
+    def merge(
+        self,
+        boxes: List[np.ndarray],
+        confidences: List[np.ndarray],
+        class_ids: List[np.ndarray]
+    ) -> InferenceResult:
+        """
+        Kare koordinatlarına çevrilmiş kırpma sonuçlarını birleştirir ve
+        karolar arası NMS uygular. Çokgen dışındaki kutular önceden, her
+        kırpma kendi bölgesine göre inside() ile atılmış olmalıdır.
+
+        Returns:
+            InferenceResult: Kare koordinatlarında (güvene göre azalan) sonuç
+        """
+        if not boxes:
+            return InferenceResult.empty()
+        all_boxes = np.concatenate(boxes).astype(np.float32)
+        all_confidences = np.concatenate(confidences).astype(np.float32)
+        all_class_ids = np.concatenate(class_ids).astype(np.int32)
+        if len(all_confidences) == 0:
+            return InferenceResult.empty()
+
+        if len(self._crops) > 1:
+            xywh = all_boxes.copy()
+            xywh[:, 2:] -= xywh[:, :2]
+            indices = cv2.dnn.NMSBoxesBatched(
+                xywh.tolist(), all_confidences.tolist(), all_class_ids.tolist(),
+                0.0, self.iou_threshold
+            )
+            indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        else:
+            indices = np.arange(len(all_confidences))
+        indices = indices[np.argsort(-all_confidences[indices])]
+        return InferenceResult(all_boxes[indices], all_confidences[indices], all_class_ids[indices])
+
+    def describe(self) -> Dict[str, Any]:
+        """Kırpma planının özeti (log ve istatistik için)"""
+        pixels = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in self._crops)
+        frame_pixels = self._shape[0] * self._shape[1] if self._shape else 0
+        return {
+            "crops": len(self._crops),
+            "tiled": self.tiled,
+            "pixelRatio": float(pixels / frame_pixels) if frame_pixels else 0.0
+        }
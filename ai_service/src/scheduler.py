@@ -0,0 +1,142 @@
+import time
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+from config.config import (
+    MOTION_GATING_ENABLED, MOTION_DIFF_WIDTH, MOTION_PIXEL_THRESHOLD,
+    MOTION_AREA_THRESHOLD, MOTION_HOLD_SECONDS, DETECTION_HOLD_SECONDS,
+    STATIC_INFERENCE_INTERVAL, IDLE_AFTER_SECONDS, IDLE_INFERENCE_INTERVAL
+)
+
+
+class InferenceScheduler:
+    """
+    Modelin hangi karelerde çalıştırılacağına karar verir.
+
+    Küçültülmüş gri karelerin farkıyla ucuz bir hareket kontrolü yapılır:
+    - Yakın zamanda tespit veya hareket varsa her kare işlenir
+    - Sahne durağansa model `static_interval` saniyede bir çalışır
+    - Uzun süredir hiç tespit yoksa bu aralık `idle_interval`'e çıkar
+    Durağan sahnede bekleyen bir içiciyi kaçırmamak için model hiçbir zaman
+    tamamen durdurulmaz.
+
+    `min_interval` (kalite kontrolü ayarlar) çıkarım hızını sınırlar; yakın
+    zamanda tespit varsa uygulanmaz, çünkü atlanan kareler kayan pencerelerde
+    tespitsiz sayılır.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = MOTION_GATING_ENABLED,
+        diff_width: int = MOTION_DIFF_WIDTH,
+        pixel_threshold: int = MOTION_PIXEL_THRESHOLD,
+        area_threshold: float = MOTION_AREA_THRESHOLD,
+        motion_hold: float = MOTION_HOLD_SECONDS,
+        detection_hold: float = DETECTION_HOLD_SECONDS,
+        static_interval: float = STATIC_INFERENCE_INTERVAL,
+        idle_after: float = IDLE_AFTER_SECONDS,
+        idle_interval: float = IDLE_INFERENCE_INTERVAL
+    ):
+        self.enabled = enabled
+        self.diff_width = diff_width
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.motion_hold = motion_hold
+        self.detection_hold = detection_hold
+        self.static_interval = static_interval
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.min_interval = 0.0
+
+        self._previous: Optional[np.ndarray] = None
+        self._small: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self.last_motion = 0.0
+        self.last_detection: Optional[float] = None
+        self.last_inference = 0.0
+        self.stats = {"frames": 0, "inferences": 0, "skippedStatic": 0, "skippedIdle": 0, "skippedRate": 0}
+
+    def _has_motion(self, frame: np.ndarray) -> bool:
+        """Önceki kareyle küçültülmüş gri fark üzerinden hareket kontrolü"""
+        height = max(1, int(frame.shape[0] * self.diff_width / frame.shape[1]))
+        if self._small is None or self._small.shape != (height, self.diff_width):
+            self._small = np.empty((height, self.diff_width), dtype=np.uint8)
+            self._diff = np.empty_like(self._small)
+            self._previous = None
+
+        resized = cv2.resize(frame, (self.diff_width, height), interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY, dst=self._small)
+
+        if self._previous is None:
+            self._previous = self._small.copy()
+            return True
+
+        cv2.absdiff(self._small, self._previous, dst=self._diff)
+        cv2.threshold(self._diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self._diff)
+        changed = cv2.countNonZero(self._diff) / self._diff.size
+
+        # Referans kareyi yerinde güncelle (yeni bellek ayırmadan)
+        self._previous, self._small = self._small, self._previous
+        return changed >= self.area_threshold
+
+    def should_infer(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """
+        Bu karede modelin çalıştırılıp çalıştırılmayacağını belirler.
+
+        Args:
+            frame: Ham görüntü karesi
+            now: Zaman damgası
+
+        Returns:
+            bool: Model çalıştırılmalı mı
+        """
+        now = time.time() if now is None else now
+        self.stats["frames"] += 1
+        if self.last_detection is None:
+            # Başlangıçta son tespit "şimdi" kabul edilir; ilk saniyelerde tam hızda çalışılır
+            self.last_detection = now
+
+        if (
+            self.min_interval and
+            now - self.last_detection > self.detection_hold and
+            now - self.last_inference < self.min_interval
+        ):
+            self.stats["skippedRate"] += 1
+            return False
+
+        if not self.enabled:
+            return self._infer(now)
+
+        if self._has_motion(frame):
+            self.last_motion = now
+
+        if now - self.last_motion <= self.motion_hold or now - self.last_detection <= self.detection_hold:
+            return self._infer(now)
+
+        idle = now - self.last_detection > self.idle_after
+        interval = self.idle_interval if idle else self.static_interval
+        if now - self.last_inference >= interval:
+            return self._infer(now)
+
+        self.stats["skippedIdle" if idle else "skippedStatic"] += 1
+        return False
+
+    def _infer(self, now: float) -> bool:
+        self.last_inference = now
+        self.stats["inferences"] += 1
+        return True
+
+    def report(self, detected: bool, now: Optional[float] = None):
+        """Model sonucunu bildirir; tespit varsa tam hıza dönülür"""
+        if detected:
+            self.last_detection = time.time() if now is None else now
+
+    def get_stats(self) -> Dict[str, Any]:
+        saved = self.stats["frames"] - self.stats["inferences"]
+        return {
+            **self.stats,
+            "inferencesSaved": saved,
+            "savedRatio": saved / self.stats["frames"] if self.stats["frames"] else 0.0
+        }
@@ -0,0 +1,678 @@
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import (
+    DEFAULT_MODEL_PATH, PROCESS_WORKERS, SHM_FRAME_SLOTS, WARMUP_RUNS, CLIP_ENABLED,
+    QUALITY_CONTROL_ENABLED, INFERENCE_THREADS, LOG_QUEUE_SIZE
+)
+from .logger import setup_logger, forward_logs_to_parent, relay_child_logs
+from .api_client import APIClient
+from .cameras import CameraDefinition
+from .camera_config import CameraConfigStore, CameraSettings
+from .pipeline import FramePipeline
+from .metrics import CameraMetrics, QUEUE_DEPTH, QUEUE_DROPPED, system_metrics
+from .health import health, start_health_server
+from .alerts import alert_dispatcher
+
+logger = setup_logger("sharding")
+
+
+def _dispose(shm: SharedMemory, unlink: bool):
+    # Kareye ait görünüm hâlâ bir değişkende duruyorsa close başarısız olur;
+    # eşleme GC ile kapanır, blok yine de silinir
+    try:
+        shm.close()
+    except BufferError:
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(name: str) -> SharedMemory:
+    """Ana sürecin ayırdığı bloğa bağlanır (bloğun sahibi ana süreçtir)"""
+    # spawn ile açılan süreçler ana sürecin resource_tracker'ını paylaşır;
+    # kayıt tekrarı zararsızdır, blok ana süreç unlink edince izlemeden çıkar
+    return SharedMemory(name=name)
+
+
+# Yuva durumları (paylaşımlı bloğun başındaki tabloda tutulur)
+_FREE, _WRITING, _QUEUED, _CLAIMED = 0, 1, 2, 3
+
+
+def _header_size(count: int) -> int:
+    # Her yuva için durum ve sıra numarası (int64); kareler 64 byte hizalı başlar
+    return (count * 2 * 8 + 63) // 64 * 64
+
+
+def _layout(buf, count: int, shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Bloğu yuva tablosu ([durum, sıra numarası]) ve kare dizisi olarak görür"""
+    table = np.ndarray((2, count), dtype=np.int64, buffer=buf)
+    frames = np.ndarray((count,) + tuple(shape), dtype=np.uint8, buffer=buf, offset=_header_size(count))
+    return table, frames
+
+
+def _claim(lock, table: np.ndarray, slot: int, sequence: int) -> bool:
+    """Çıkarım süreci yuvayı alır; kamera yuvaya daha yeni kare yazdıysa False"""
+    with lock:
+        if table[0, slot] != _QUEUED or table[1, slot] != sequence:
+            return False
+        table[0, slot] = _CLAIMED
+        return True
+
+
+class SharedFrameSlots:
+    """
+    Bir kameranın kareleri için paylaşımlı bellekte sabit sayıda yuva.
+
+    Kamera kareyi doğrudan boş bir yuvaya okur; çıkarım süreci yuvayı
+    kopyalamadan NumPy görünümü olarak kullanır ve işi bitince geri verir.
+    Boş yuva yoksa çıkarım sürecinin henüz almadığı en eski kare atılır ve
+    yerine yeni kare yazılır (en eskiyi atma); süreç yuvayı alırken sıra
+    numarasını kontrol eder, böylece çıkarım her zaman taze karelerle
+    çalışır. Yuva tablosu bloğun başında durur ve süreçler arası kilitle
+    korunur. Kare boyutu değişirse yeni blok ayrılır; eski blok, dağıtılmış
+    yuvaları geri geldiğinde silinir.
+    """
+
+    def __init__(self, count: int = SHM_FRAME_SLOTS, lock=None):
+        """
+        Args:
+            count: Yuva sayısı
+            lock: Çıkarım süreciyle paylaşılan kilit (multiprocessing Lock)
+        """
+        self.count = max(1, count)
+        self.lock = lock if lock is not None else threading.Lock()
+        self.shm: Optional[SharedMemory] = None
+        self.frames: Optional[np.ndarray] = None
+        self._table: Optional[np.ndarray] = None
+        self._sequence = 0
+        self._retired: Dict[str, List[Any]] = {}
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm is not None else None
+
+    @property
+    def shape(self) -> Optional[Tuple[int, ...]]:
+        return self.frames.shape[1:] if self.frames is not None else None
+
+    @property
+    def in_flight(self) -> int:
+        """Süreç kuyruğunda bekleyen veya işlenen kare sayısı"""
+        table = self._table
+        return int(np.count_nonzero(table[0] >= _QUEUED)) if table is not None else 0
+
+    def ensure(self, shape: Tuple[int, ...]):
+        """Yuvaları `shape` boyutundaki kareler için (yeniden) ayırır"""
+        with self.lock:
+            if self.shape == tuple(shape):
+                return
+            old = self.shm
+            old_in_flight = int(np.count_nonzero(self._table[0] != _FREE)) if self._table is not None else 0
+            self.frames = self._table = None
+            self.shm = SharedMemory(
+                create=True, size=_header_size(self.count) + self.count * int(np.prod(shape))
+            )
+            self._table, self.frames = _layout(self.shm.buf, self.count, shape)
+            self._table[:] = 0
+            if old is not None:
+                if old_in_flight:
+                    self._retired[old.name] = [old, old_in_flight]
+                else:
+                    _dispose(old, unlink=True)
+
+    def acquire(self) -> Tuple[Optional[int], bool]:
+        """
+        Kameranın yazacağı yuvayı ayırır.
+
+        Returns:
+            tuple: Yuva (yoksa None) ve yuvadaki bekleyen karenin atılıp atılmadığı
+        """
+        with self.lock:
+            if self._table is None:
+                return None, False
+            state, sequence = self._table
+            free = np.flatnonzero(state == _FREE)
+            if len(free):
+                slot, reclaimed = int(free[0]), False
+            else:
+                queued = np.flatnonzero(state == _QUEUED)
+                if not len(queued):
+                    return None, False
+                slot, reclaimed = int(queued[np.argmin(sequence[queued])]), True
+            state[slot] = _WRITING
+            return slot, reclaimed
+
+    def publish(self, slot: int) -> int:
+        """Yazılan kareyi çıkarım sürecine açar; sürecin kontrol edeceği sıra numarasını döndürür"""
+        with self.lock:
+            self._sequence += 1
+            self._table[1, slot] = self._sequence
+            self._table[0, slot] = _QUEUED
+            return self._sequence
+
+    def release(self, name: str, slot: int):
+        with self.lock:
+            if self.shm is not None and name == self.shm.name:
+                self._table[0, slot] = _FREE
+                return
+            entry = self._retired.get(name)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._retired[name]
+                    _dispose(entry[0], unlink=True)
+
+    def close(self):
+        with self.lock:
+            self.frames = self._table = None
+            for shm, _ in self._retired.values():
+                _dispose(shm, unlink=True)
+            self._retired.clear()
+            if self.shm is not None:
+                _dispose(self.shm, unlink=True)
+                self.shm = None
+
+
+class _CameraFeed:
+    """
+    Ana süreçte bir kameranın yakalama tarafı.
+
+    CameraConfigStore'a servis gibi kaydedilir: ayar değişikliklerinde
+    çözünürlük burada uygulanır, ayarların tamamı kameranın çıkarım
+    sürecine iletilir. Kalite basamağı çıkarım sürecinde seçilir ve model
+    giriş boyutu orada uygulanır; isteğe bağlı kamera çözünürlüğü oranı
+    buraya bildirilir.
+    """
+
+    backend = None
+
+    def __init__(self, camera: CameraDefinition, worker: int, inbox, lock=None):
+        self.camera = camera
+        self.worker = worker
+        self.inbox = inbox
+        self.settings = CameraSettings.from_camera(camera)
+        self.pending_resolution: Optional[tuple] = None
+        self.resolution_scale = 1.0
+        self.cap = None
+        self.metrics = CameraMetrics(camera.camera_id)
+        self.slots = SharedFrameSlots(lock=lock)
+        self.dropped = 0
+
+    def apply_settings(self, settings: CameraSettings):
+        previous, self.settings = self.settings, settings
+        if (settings.frame_width, settings.frame_height) != (previous.frame_width, previous.frame_height):
+            self.pending_resolution = (settings.frame_width, settings.frame_height)
+        self.inbox.put(("settings", self.camera.camera_id, settings))
+
+    def apply_resolution(self):
+        self.pending_resolution = None
+        if self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(self.settings.frame_width * self.resolution_scale))
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(self.settings.frame_height * self.resolution_scale))
+
+    def apply_quality(self, level_index: int, resolution_scale: float):
+        """Çıkarım sürecinin seçtiği kalite basamağını yakalama tarafına uygular"""
+        self.metrics.quality_level.set(level_index)
+        if resolution_scale != self.resolution_scale:
+            self.resolution_scale = resolution_scale
+            self.pending_resolution = (self.settings.frame_width, self.settings.frame_height)
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.camera.open_capture_source())
+        if not self.cap.isOpened():
+            return False
+        self.apply_resolution()
+        return True
+
+
+class _ResultSink:
+    """
+    handle_detections'ın upload kuyruğu ve uyarı dağıtıcısı yerine sonuçları
+    ana sürece iletir; uyarılar kameralar arası tekilleştirme için tek
+    dağıtıcıda toplanır.
+    """
+
+    def __init__(self, outbox):
+        self.outbox = outbox
+
+    def put(self, payload: Dict[str, Any]):
+        self.outbox.put(("detection", payload))
+
+    def submit(self, alert) -> bool:
+        self.outbox.put(("alert", alert))
+        return True
+
+
+def _drain(inbox, first) -> List[Any]:
+    """İlk mesajla birlikte kuyrukta bekleyen tüm mesajları (beklemeden) alır"""
+    messages = [first]
+    while messages[-1] is not None:
+        try:
+            messages.append(inbox.get_nowait())
+        except queue.Empty:
+            break
+    return messages
+
+
+def _worker_main(
+    index: int, cameras: List[CameraDefinition], device: Optional[str], threads: int,
+    locks: Dict[str, Any], inbox, outbox, log_queue
+):
+    """
+    Çıkarım süreci: kendi model kopyasıyla, kendisine atanan kameraların
+    karelerini sırayla işler. Kamera başına uyarı durumu (pencereler, olaylar,
+    bekleme süresi) yalnızca bu süreçte tutulur. Kuyrukta aynı kameranın
+    birden fazla karesi birikmişse yalnızca en yenisi işlenir.
+    """
+    # Log dosyalarını yalnızca ana süreç yazar ve döndürür
+    forward_logs_to_parent(log_queue)
+    # Ctrl+C ana süreçte ele alınır; çıkarım süreci kuyruktan None ile durur
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Süreçler çekirdekleri paylaşır; her biri kendi payı kadar thread kullanır
+    cv2.setNumThreads(threads)
+
+    from .backends import create_backend
+    from .detection_service import DetectionService
+    from .clips import clip_writer
+
+    try:
+        backend = create_backend(DEFAULT_MODEL_PATH, device=device, threads=threads)
+        api_client = APIClient()
+        services = {
+            camera.camera_id: DetectionService(camera, backend=backend, api_client=api_client)
+            for camera in cameras
+        }
+        backend.warmup(WARMUP_RUNS, batch_size=max(service.inputs_per_frame() for service in services.values()))
+        sink = _ResultSink(outbox)
+        for service in services.values():
+            service.alerts = sink
+        if CLIP_ENABLED:
+            clip_writer.start(api_client)
+        if QUALITY_CONTROL_ENABLED:
+            # Kalite kontrolü CPU/RAM değerlerini bu süreçteki örnekleyiciden okur
+            system_metrics.start()
+    except Exception as e:
+        outbox.put(("error", index, f"Çıkarım süreci başlatılamadı: {str(e)}"))
+        return
+    outbox.put(("ready", index))
+
+    attached: Dict[str, Tuple[SharedMemory, np.ndarray, np.ndarray]] = {}
+    current: Dict[str, str] = {}
+
+    def claim(message) -> Optional[np.ndarray]:
+        """Kareyi yuvadan alır; kamera yuvaya daha yeni kare yazdıysa None"""
+        _, camera_id, name, count, shape, slot, sequence, _ = message
+        if current.get(camera_id) != name:
+            previous = attached.pop(current.get(camera_id, ""), None)
+            if previous is not None:
+                _dispose(previous[0], unlink=False)
+            shm = _attach(name)
+            attached[name] = (shm, *_layout(shm.buf, count, shape))
+            current[camera_id] = name
+        _, table, frames = attached[name]
+        if not _claim(locks[camera_id], table, slot, sequence):
+            return None
+        return frames[slot]
+
+    def skip(message):
+        """Aynı kameranın daha yeni karesi beklerken eski kareyi işlemeden geri verir"""
+        try:
+            if claim(message) is not None:
+                outbox.put(("skip", message[1], message[2], message[5]))
+        except Exception as e:
+            outbox.put(("error", index, f"Kare alınamadı: {str(e)}"))
+
+    def process(message):
+        _, camera_id, name, _, _, slot, _, captured_at = message
+        service = services[camera_id]
+        alerted = False
+        start = time.perf_counter()
+        try:
+            frame = claim(message)
+        except Exception as e:
+            outbox.put(("error", index, f"Kare alınamadı: {str(e)}"))
+            return
+        if frame is None:
+            return
+        try:
+            frame, detections = service.process_frame(frame)
+            if service.clip_recorder is not None:
+                service.clip_recorder.on_frame(frame, service.clock())
+            if detections:
+                # Olay kaydı kareyi saklayabilir; yuva geri verileceği için kopyalanır
+                frame = frame.copy()
+            last_alert = service.last_alert_time
+            service.handle_detections(frame, detections, sink)
+            alerted = service.last_alert_time != last_alert
+            if service.quality.observe(time.time() - captured_at):
+                quality = service.quality
+                outbox.put(("quality", camera_id, quality.level_index, quality.level.resolution_scale))
+        except Exception as e:
+            outbox.put(("error", index, f"Kare işlenirken hata oluştu: {str(e)}"))
+        finally:
+            frame = None
+            outbox.put(("release", camera_id, name, slot, time.perf_counter() - start, alerted))
+
+    running = True
+    while running:
+        messages = _drain(inbox, inbox.get())
+        # Kamera başına en yeni kare; öncekiler işlenmeden geri verilir
+        latest = {message[1]: message for message in messages if message is not None and message[0] == "frame"}
+        for message in messages:
+            if message is None:
+                running = False
+                break
+            kind, camera_id = message[0], message[1]
+            if kind == "settings":
+                services[camera_id].apply_settings(message[2])
+                # Paylaşılan model bu süreçteki kameraların en düşük eşiğiyle çalışır
+                backend.confidence = min(item.settings.confidence_threshold for item in services.values())
+            elif latest[camera_id] is message:
+                process(message)
+            else:
+                skip(message)
+
+    if CLIP_ENABLED:
+        clip_writer.stop()
+    system_metrics.stop()
+    for shm, _ in attached.values():
+        _dispose(shm, unlink=False)
+
+
+class ShardedPipeline(FramePipeline):
+    """
+    Süreç modunda ana sürecin pipeline'ı.
+
+    Her kamera kendi capture thread'inde kareyi doğrudan paylaşımlı bellek
+    yuvasına okur ve yuva numarasını kameranın çıkarım sürecine gönderir.
+    Sonuç thread'i yuvaları geri alır ve hazırlanan tespit verilerini
+    upload kuyruğuna aktarır; gönderim FramePipeline'daki gibi yapılır.
+    """
+
+    def __init__(self, service: "ShardedService"):
+        # Kareler ana süreçte işaretlenmediği için debug penceresi yok
+        super().__init__(service, show_window=False)
+        self.preview = None
+
+    def _camera_capture_loop(self, feed: _CameraFeed):
+        camera_id = feed.camera.camera_id
+        slots = feed.slots
+        scratch = None
+        while not self.stop_event.is_set():
+            if feed.pending_resolution is not None:
+                feed.apply_resolution()
+
+            slot, reclaimed = slots.acquire()
+            if reclaimed:
+                # Sürecin henüz almadığı eski kare yerine yeni kare yazılır
+                feed.dropped += 1
+                feed.metrics.frames_dropped.inc()
+            target = slots.frames[slot] if slot is not None else None
+            start = time.perf_counter()
+            ret, frame = feed.cap.read(target) if target is not None else feed.cap.read(scratch)
+            if not ret:
+                logger.error("Kameradan görüntü alınamadı", extra={"camera_id": camera_id})
+                if slot is not None:
+                    slots.release(slots.name, slot)
+                break
+            elapsed = time.perf_counter() - start
+            captured_at = time.time()
+            self.stats["capture"].record(elapsed)
+            feed.metrics.capture.observe(elapsed)
+            health.frame_captured(camera_id)
+
+            if slots.shape != frame.shape:
+                # İlk kare veya çözünürlük değişikliği: yuvalar kare boyutuna göre ayrılır
+                if slot is not None:
+                    slots.release(slots.name, slot)
+                slots.ensure(frame.shape)
+                slot, _ = slots.acquire()
+                target = None
+            if slot is None:
+                # Tek yuva ve o da işleniyor: kare atılır
+                scratch = frame
+                feed.dropped += 1
+                feed.metrics.frames_dropped.inc()
+                continue
+            if target is None or frame.ctypes.data != target.ctypes.data:
+                np.copyto(slots.frames[slot], frame)
+            frame = target = None
+
+            sequence = slots.publish(slot)
+            feed.inbox.put(("frame", camera_id, slots.name, slots.count, slots.shape, slot, sequence, captured_at))
+
+    def _result_loop(self):
+        """Çıkarım süreçlerinden gelen sonuçları işler"""
+        feeds = {feed.camera.camera_id: feed for feed in self.service.feeds}
+        while not self.stop_event.is_set():
+            try:
+                message = self.service.outbox.get(timeout=0.5)
+            except queue.Empty:
+                if not self.service.workers_alive():
+                    logger.error("Çıkarım süreci beklenmedik şekilde sonlandı")
+                    self.stop_event.set()
+                continue
+
+            kind = message[0]
+            if kind == "release":
+                _, camera_id, name, slot, elapsed, alerted = message
+                feed = feeds.get(camera_id)
+                if feed is None:
+                    continue
+                feed.slots.release(name, slot)
+                self.stats["inference"].record(elapsed)
+                feed.metrics.inference.observe(elapsed)
+                feed.metrics.frames.inc()
+                if alerted:
+                    feed.metrics.alerts.inc()
+                health.frame_processed()
+            elif kind == "skip":
+                # Süreç daha yeni bir kare bulduğu için işlemediği eski kare
+                _, camera_id, name, slot = message
+                feed = feeds.get(camera_id)
+                if feed is None:
+                    continue
+                feed.slots.release(name, slot)
+                feed.dropped += 1
+                feed.metrics.frames_dropped.inc()
+            elif kind == "detection":
+                payload = message[1]
+                feed = feeds.get(payload.get("cameraId"))
+                if feed is not None and payload.get("event"):
+                    feed.metrics.event(payload["event"]["type"])
+                self.upload_queue.put(payload)
+            elif kind == "alert":
+                alert_dispatcher.submit(message[1])
+            elif kind == "quality":
+                _, camera_id, level_index, resolution_scale = message
+                feed = feeds.get(camera_id)
+                if feed is not None:
+                    feed.apply_quality(level_index, resolution_scale)
+            elif kind == "error":
+                logger.error(message[2], extra={"worker": message[1]})
+
+    def get_stats(self, reset: bool = False) -> Dict[str, Any]:
+        return {
+            "stages": {name: stats.snapshot(reset) for name, stats in self.stats.items()},
+            "uploader": dict(self.uploader.stats) if self.uploader else {},
+            "alerts": dict(alert_dispatcher.stats),
+            "workers": len(self.service.processes),
+            "queues": {
+                "frames": {
+                    feed.camera.camera_id: {"inFlight": feed.slots.in_flight, "dropped": feed.dropped}
+                    for feed in self.service.feeds
+                },
+                "uploads": {"depth": self.upload_queue.qsize(), "dropped": self.upload_queue.dropped}
+            }
+        }
+
+    def _collect_metrics(self):
+        for feed in self.service.feeds:
+            QUEUE_DEPTH.labels("frames", feed.camera.camera_id).set(feed.slots.in_flight)
+            QUEUE_DROPPED.labels("frames", feed.camera.camera_id).set(feed.dropped)
+        QUEUE_DEPTH.labels("uploads", "").set(self.upload_queue.qsize())
+        QUEUE_DROPPED.labels("uploads", "").set(self.upload_queue.dropped)
+
+    def _create_threads(self) -> List[threading.Thread]:
+        threads = [
+            threading.Thread(
+                target=self._camera_capture_loop,
+                args=(feed,),
+                name=f"capture-{feed.camera.camera_id}",
+                daemon=True
+            )
+            for feed in self.service.feeds
+        ]
+        threads.append(threading.Thread(target=self._result_loop, name="results", daemon=True))
+        return threads
+
+
+class ShardedService:
+    """
+    Kameraları birden fazla çıkarım sürecine paylaştıran çalışma modu.
+
+    Her kamera sabit bir sürece atanır; böylece karelerin sırası ve kamera
+    başına uyarı durumu süreçler arası eşitleme gerekmeden korunur.
+    Ön işleme, çıkarım, olay takibi ve JPEG kodlama çıkarım süreçlerinde,
+    yakalama ve gönderim ana süreçte yapılır. Kareler süreçler arasında
+    kopyalanmaz (paylaşımlı bellek yuvaları); kuyruklardan yalnızca yuva
+    numarası ve hazırlanan tespit verisi geçer.
+    """
+
+    def __init__(self, cameras: List[CameraDefinition], device: Optional[str] = None, workers: int = PROCESS_WORKERS):
+        self.cameras = cameras
+        self.device = device
+        self.workers = max(1, min(workers, len(cameras)))
+        self.api_client = APIClient()
+        self.config_store = CameraConfigStore(self.api_client)
+        self.feeds: List[_CameraFeed] = []
+        self.processes: List[Any] = []
+        self.outbox = None
+        self.log_relay = None
+        self.pipeline = None
+
+    def workers_alive(self) -> bool:
+        return all(process.is_alive() for process in self.processes)
+
+    def _start_workers(self) -> bool:
+        # fork, model/OpenCV thread'leri olan süreçte güvenli değil
+        context = mp.get_context("spawn")
+        self.outbox = context.Queue()
+        inboxes = [context.Queue() for _ in range(self.workers)]
+        log_queue = context.Queue(LOG_QUEUE_SIZE)
+        self.log_relay = relay_child_logs(log_queue)
+        # Ayarlanmamışsa çekirdekler süreçler arasında paylaştırılır
+        threads = INFERENCE_THREADS or max(1, (os.cpu_count() or 1) // self.workers)
+
+        assigned: List[List[CameraDefinition]] = [[] for _ in range(self.workers)]
+        for position, camera in enumerate(self.cameras):
+            worker = position % self.workers
+            assigned[worker].append(camera)
+            feed = _CameraFeed(camera, worker, inboxes[worker], context.Lock())
+            # Başlangıç ayarları ilk kareden önce sürecin kuyruğuna girer
+            self.config_store.attach(feed)
+            self.feeds.append(feed)
+
+        for index in range(self.workers):
+            process = context.Process(
+                target=_worker_main,
+                args=(
+                    index, assigned[index], self.device, threads,
+                    {feed.camera.camera_id: feed.slots.lock for feed in self.feeds if feed.worker == index},
+                    inboxes[index], self.outbox, log_queue
+                ),
+                name=f"inference-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        ready = 0
+        with health.timeline.phase("workers_ready", workers=self.workers):
+            while ready < self.workers:
+                try:
+                    message = self.outbox.get(timeout=1.0)
+                except queue.Empty:
+                    if not self.workers_alive():
+                        logger.error("Çıkarım süreci başlatılamadı")
+                        return False
+                    continue
+                if message[0] == "ready":
+                    ready += 1
+                elif message[0] == "error":
+                    logger.error(message[2], extra={"worker": message[1]})
+                    return False
+        health.model_loaded = True
+        return True
+
+    def initialize(self) -> bool:
+        """
+        Çıkarım süreçlerini başlatır (model yükleme ve ısınma), ardından kameraları açar.
+
+        Returns:
+            bool: En az bir kamera açıldıysa True
+        """
+        if not self._start_workers():
+            return False
+
+        for feed in list(self.feeds):
+            camera_id = feed.camera.camera_id
+            health.register_camera(camera_id)
+            with health.timeline.phase("camera_open", camera_id=camera_id):
+                opened = feed.open()
+            if not opened:
+                logger.error("Kamera başlatılamadı", extra={"camera_id": camera_id})
+                health.unregister_camera(camera_id)
+                self.feeds.remove(feed)
+
+        logger.info(
+            f"{len(self.feeds)}/{len(self.cameras)} kamera {self.workers} çıkarım sürecinde başlatıldı"
+        )
+        return bool(self.feeds)
+
+    async def run(self):
+        """Ana servis döngüsü"""
+        start_health_server(self.api_client.backend_reachable)
+        try:
+            if not self.initialize():
+                return
+            self.pipeline = ShardedPipeline(self)
+            await self.pipeline.run()
+
+        except Exception as e:
+            logger.error(f"Servis çalışırken hata oluştu: {str(e)}")
+
+        finally:
+            await self.cleanup()
+
+    async def cleanup(self):
+        """Çıkarım süreçlerini durdurur, kameraları ve paylaşımlı belleği kapatır"""
+        inboxes = {id(feed.inbox): feed.inbox for feed in self.feeds}
+        for inbox in inboxes.values():
+            inbox.put(None)
+        for process in self.processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        if self.log_relay is not None:
+            self.log_relay.stop()
+            self.log_relay = None
+        for feed in self.feeds:
+            if feed.cap:
+                feed.cap.release()
+            feed.slots.close()
+        await self.api_client.close_websocket()
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import requests
+
+from config.config import (
+    UPLOAD_MAX_IN_FLIGHT, UPLOAD_BATCH_SIZE, UPLOAD_FLUSH_INTERVAL,
+    UPLOAD_MAX_RETRIES, UPLOAD_RETRY_BASE_DELAY, UPLOAD_RETRY_MAX_DELAY,
+    SPOOL_DIR, SPOOL_MAX_BYTES, SPOOL_DRAIN_INTERVAL
+)
+from .logger import setup_logger
+from .image_codec import has_binary_image, inline_images
+from .metrics import UPLOADS, UPLOAD_RETRIES, STAGE_SECONDS
+
+logger = setup_logger("uploader")
+
+
+class DetectionSpool:
+    """
+    Gönderilemeyen tespitleri diskte saklayan kuyruk.
+
+    Her başarısız gönderim ayrı bir .jsonl dosyasına yazılır; toplam boyut
+    sınırı aşılırsa en eski dosyalar silinir. Okunamayan veya backend'in
+    kalıcı olarak reddettiği dosyalar `rejected/` klasörüne taşınır; böylece
+    sıradaki dosyaların gönderimini engellemezler.
+    """
+
+    def __init__(self, directory: Path = SPOOL_DIR, max_bytes: int = SPOOL_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.rejected_directory = self.directory / "rejected"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, payloads: List[Dict[str, Any]]) -> Path:
+        """
+        Tespitleri yeni bir spool dosyasına yazar.
+
+        Args:
+            payloads: Tespit verileri
+
+        Returns:
+            Path: Yazılan dosya
+        """
+        path = self.directory / f"{time.time_ns()}.jsonl"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for payload in payloads:
+                f.write(json.dumps(inline_images(payload)) + "\n")
+        os.replace(tmp_path, path)
+        self._enforce_limit()
+        return path
+
+    def pending_files(self) -> List[Path]:
+        """Gönderilmeyi bekleyen dosyalar (eskiden yeniye)"""
+        return sorted(self.directory.glob("*.jsonl"))
+
+    def read(self, path: Path) -> List[Dict[str, Any]]:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def remove(self, path: Path):
+        path.unlink(missing_ok=True)
+
+    def reject(self, path: Path):
+        """Dosyayı tekrar denenmemek üzere rejected/ klasörüne taşır"""
+        self.rejected_directory.mkdir(parents=True, exist_ok=True)
+        os.replace(path, self.rejected_directory / path.name)
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.pending_files())
+
+    def _enforce_limit(self):
+        files = self.pending_files()
+        total = sum(path.stat().st_size for path in files)
+        while files and total > self.max_bytes:
+            oldest = files.pop(0)
+            total -= oldest.stat().st_size
+            self.remove(oldest)
+            logger.warning("Spool boyut sınırı aşıldı, en eski kayıt silindi", extra={"file": oldest.name})
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Bağlantı hataları, zaman aşımı, 429 ve 5xx yanıtları yeniden denenir"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class DetectionUploader:
+    """
+    Tespitleri backend'e event loop'u bloklamadan gönderen uploader.
+
+    - APIClient'ın ortak oturumu üzerinden bağlantıları yeniden kullanır
+    - Aynı anda en fazla `max_in_flight` istek gönderir
+    - `batch_size` > 1 ise tespitleri biriktirip tek `POST /detections`
+      isteğinde liste olarak gönderir (boyut veya süre dolunca)
+    - Geçici hatalarda üstel bekleme ile yeniden dener, başarısız olursa
+      tespitleri diske yazar ve backend geri geldiğinde tekrar gönderir
+    - Kalıcı hatalarda (429 dışındaki 4xx) tespitler diske yazılmaz;
+      tekrar denemek aynı yanıtı alacaktır
+    """
+
+    def __init__(
+        self,
+        api_client,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        flush_interval: float = UPLOAD_FLUSH_INTERVAL,
+        max_in_flight: int = UPLOAD_MAX_IN_FLIGHT,
+        max_retries: int = UPLOAD_MAX_RETRIES,
+        spool: Optional[DetectionSpool] = None
+    ):
+        self.api_client = api_client
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spool = spool or DetectionSpool()
+        self._semaphore = asyncio.Semaphore(max(1, max_in_flight))
+        self._batch: List[Dict[str, Any]] = []
+        self._batch_started = 0.0
+        self._in_flight: Set[asyncio.Task] = set()
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"sent": 0, "failed": 0, "retries": 0, "spooled": 0, "drained": 0, "rejected": 0}
+
+    async def start(self):
+        """Zamanlı flush ve spool boşaltma görevlerini başlatır"""
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._drain_loop())
+        ]
+
+    async def submit(self, detection_data: Dict[str, Any]):
+        """
+        Tespiti gönderim kuyruğuna ekler. Batch dolduysa gönderimi başlatır.
+
+        Args:
+            detection_data: Tespit verisi
+        """
+        # Binary görüntülü tespitler toplu gövdeye konamaz, tek tek gönderilir
+        if has_binary_image(detection_data):
+            await self.flush()
+            self._batch.append(detection_data)
+            await self.flush()
+            return
+
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append(detection_data)
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Biriken tespitleri gönderir (eşzamanlı istek sınırına uyarak)"""
+        if not self._batch:
+            return
+        payloads, self._batch = self._batch, []
+
+        # Sınır doluysa burada beklenir; üst katmandaki kuyruk en eskiyi atar
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._send_batch(payloads))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, payloads: List[Dict[str, Any]]):
+        try:
+            single = len(payloads) == 1 and (self.batch_size == 1 or has_binary_image(payloads[0]))
+            body = payloads[0] if single else payloads
+            error = await self._send_with_retry(body)
+            if error is None:
+                self._count("sent", payloads)
+                return
+
+            self._count("failed", payloads)
+            if not _is_retryable(error):
+                self._count("rejected", payloads)
+                return
+            try:
+                await asyncio.to_thread(self.spool.write, payloads)
+                self._count("spooled", payloads)
+            except OSError as e:
+                logger.error(f"Tespitler diske yazılamadı: {str(e)}", extra={"count": len(payloads)})
+        finally:
+            self._semaphore.release()
+
+    def _count(self, status: str, payloads: List[Dict[str, Any]]):
+        """Gönderim sonucunu istatistiklere ve kamera bazlı metriklere işler"""
+        self.stats[status] += len(payloads)
+        for payload in payloads:
+            UPLOADS.labels(payload.get("cameraId"), status).inc()
+
+    async def _send_with_retry(self, body, max_retries: Optional[int] = None) -> Optional[Exception]:
+        """
+        İsteği üstel bekleme (jitter'lı) ile yeniden deneyerek gönderir.
+
+        Returns:
+            Optional[Exception]: Başarılıysa None, değilse son hata
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        # Toplu gönderimde kameralar karışıksa etiket boş kalır
+        cameras = {payload.get("cameraId") for payload in (body if isinstance(body, list) else [body])}
+        histogram = STAGE_SECONDS.labels("upload", cameras.pop() if len(cameras) == 1 else "")
+        for attempt in range(max_retries + 1):
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.api_client.post_detections, body)
+                error = None
+            except Exception as e:
+                error = e
+            # Her denemede HTTP isteğinin süresi (bekleme hariç)
+            histogram.observe(time.perf_counter() - start)
+            if error is None:
+                return None
+            if not _is_retryable(error) or attempt == max_retries:
+                logger.error(f"Detection data not sent: {str(error)}", extra={"attempt": attempt + 1})
+                return error
+            self.stats["retries"] += 1
+            UPLOAD_RETRIES.labels().inc()
+            delay = min(UPLOAD_RETRY_MAX_DELAY, UPLOAD_RETRY_BASE_DELAY * (2 ** attempt))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _flush_loop(self):
+        """Batch süresi dolan tespitleri gönderir"""
+        while True:
+            await asyncio.sleep(self.flush_interval / 2)
+            if self._batch and time.monotonic() - self._batch_started >= self.flush_interval:
+                await self.flush()
+
+    async def _drain_loop(self):
+        """Diskteki tespitleri backend erişilebilir olduğunda tekrar gönderir"""
+        while True:
+            await asyncio.sleep(SPOOL_DRAIN_INTERVAL)
+            for path in self.spool.pending_files():
+                try:
+                    if not await self._drain_file(path):
+                        # Backend hâlâ erişilemiyor, sonraki turda tekrar denenecek
+                        break
+                except Exception as e:
+                    logger.error(f"Spool dosyası işlenemedi: {str(e)}", extra={"file": path.name})
+
+    async def _drain_file(self, path: Path) -> bool:
+        """
+        Tek bir spool dosyasını gönderir.
+
+        Returns:
+            bool: Sıradaki dosyaya geçilebilirse True (gönderildi veya ayrıldı),
+            backend'e ulaşılamadıysa False
+        """
+        try:
+            payloads = await asyncio.to_thread(self.spool.read, path)
+        except (OSError, ValueError) as e:
+            # Yarım yazılmış veya bozuk dosya: tekrar okumak aynı hatayı verir
+            await asyncio.to_thread(self.spool.reject, path)
+            logger.error(f"Spool dosyası okunamadı, ayrıldı: {str(e)}", extra={"file": path.name})
+            return True
+
+        async with self._semaphore:
+            error = await self._send_with_retry(payloads, max_retries=0)
+        if error is None:
+            self.spool.remove(path)
+            self._count("drained", payloads)
+            logger.info("Spool'daki tespitler gönderildi", extra={"count": len(payloads)})
+            return True
+        if _is_retryable(error):
+            return False
+
+        await asyncio.to_thread(self.spool.reject, path)
+        self._count("rejected", payloads)
+        logger.error("Backend spool dosyasını reddetti, ayrıldı", extra={"file": path.name, "count": len(payloads)})
+        return True
+
+    async def close(self):
+        """Kalan tespitleri gönderir ve görevleri durdurur"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
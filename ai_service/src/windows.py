@@ -0,0 +1,157 @@
+import math
+from typing import Optional
+
+from config.config import (
+    BUFFER_SIZE, DETECTION_THRESHOLD, DETECTION_RELEASE_THRESHOLD,
+    SHORT_WINDOW_SECONDS, LONG_WINDOW_SECONDS, LONG_WINDOW_THRESHOLD, WINDOW_MAX_FPS,
+    WINDOW_MIN_FILL, WINDOW_MIN_SAMPLES
+)
+
+
+class SlidingWindow:
+    """
+    Zaman tabanlı kayan pencere (ring buffer).
+
+    Her kare için (zaman, tespit var mı) kaydı tutulur; pozitif kare sayısı
+    ekleme/çıkarma sırasında güncellendiği için oran hesabı pencere
+    boyutundan bağımsız olarak sabit maliyetlidir. `duration` None ise pencere
+    yalnızca kare sayısıyla (`capacity`) sınırlanır.
+    """
+
+    def __init__(self, duration: Optional[float], capacity: int):
+        self.duration = duration
+        self.capacity = max(1, capacity)
+        self._times = [0.0] * self.capacity
+        self._values = [False] * self.capacity
+        self._head = 0
+        self._size = 0
+        self.positives = 0
+
+    def add(self, value: bool, now: float):
+        """
+        Pencereye yeni kare ekler, süresi dolan kareleri çıkarır.
+
+        Args:
+            value: Karede tespit var mı
+            now: Karenin zamanı
+        """
+        self.expire(now)
+        if self._size == self.capacity:
+            self._pop()
+        index = (self._head + self._size) % self.capacity
+        self._times[index] = now
+        self._values[index] = value
+        self._size += 1
+        if value:
+            self.positives += 1
+
+    def expire(self, now: float):
+        """Pencere süresinden eski kareleri çıkarır"""
+        if self.duration is None:
+            return
+        limit = now - self.duration
+        while self._size and self._times[self._head] < limit:
+            self._pop()
+
+    def _pop(self):
+        if self._values[self._head]:
+            self.positives -= 1
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.positives = 0
+
+    @property
+    def rate(self) -> float:
+        """Penceredeki karelerin geliş hızı (kare/saniye, en az iki kare gerekir)"""
+        if self._size < 2:
+            return 0.0
+        newest = self._times[(self._head + self._size - 1) % self.capacity]
+        span = newest - self._times[self._head]
+        return (self._size - 1) / span if span > 0 else 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.positives / self._size if self._size else 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class DetectionWindows:
+    """
+    Bir kamera için kısa ve uzun tespit pencereleri ve histerezisli tetik durumu.
+
+    Tetik, kısa penceredeki oran `on_threshold`'a ve uzun penceredeki oran
+    `long_threshold`'a ulaştığında açılır; kısa penceredeki oran
+    `off_threshold`'un altına düşene kadar açık kalır. Böylece eşiğin hemen
+    çevresinde gidip gelen oran, tetiği sürekli açıp kapatmaz.
+
+    Kısa pencerede gereken en az kare sayısı `min_samples` ile sınırlıdır,
+    ancak uzun pencereden gözlenen kare hızında kısa pencereye sığabilecek
+    kare sayısının `min_fill` oranına indirilir; böylece 15 FPS'in altında
+    işlenen kameralar (CPU, batch, kalite kontrolü) da tetiklenebilir.
+    """
+
+    def __init__(
+        self,
+        short_seconds: float = SHORT_WINDOW_SECONDS,
+        long_seconds: float = LONG_WINDOW_SECONDS,
+        on_threshold: float = DETECTION_THRESHOLD,
+        off_threshold: float = DETECTION_RELEASE_THRESHOLD,
+        long_threshold: float = LONG_WINDOW_THRESHOLD,
+        min_samples: int = BUFFER_SIZE,
+        max_fps: int = WINDOW_MAX_FPS,
+        min_fill: float = WINDOW_MIN_FILL,
+        floor_samples: int = WINDOW_MIN_SAMPLES
+    ):
+        self.short = SlidingWindow(short_seconds, max(min_samples, int(short_seconds * max_fps) + 1))
+        self.long = SlidingWindow(long_seconds, max(min_samples, int(long_seconds * max_fps) + 1))
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.long_threshold = long_threshold
+        self.short_seconds = short_seconds
+        self.min_samples = min_samples
+        self.min_fill = min_fill
+        self.floor_samples = max(1, floor_samples)
+        self.active = False
+
+    @property
+    def required_samples(self) -> int:
+        """Tetik için kısa pencerede gereken kare sayısı (gözlenen kare hızına göre)"""
+        rate = self.long.rate
+        if rate <= 0:
+            # Kare hızı henüz bilinmiyor (ilk kare)
+            return self.min_samples
+        expected = math.ceil(self.min_fill * rate * self.short_seconds)
+        # Alt sınır, bu hızda kısa pencereye sığabilecek kare sayısını geçemez
+        holdable = int(rate * self.short_seconds) + 1
+        return min(self.min_samples, max(expected, min(self.floor_samples, holdable)))
+
+    def add(self, detected: bool, now: float) -> bool:
+        """
+        Kareyi iki pencereye ekler ve tetik durumunu günceller.
+
+        Args:
+            detected: Karede tespit var mı
+            now: Karenin zamanı
+
+        Returns:
+            bool: Tetik durumu
+        """
+        self.short.add(detected, now)
+        self.long.add(detected, now)
+
+        if self.active:
+            if self.short.ratio < self.off_threshold:
+                self.active = False
+        elif (
+            len(self.short) >= self.required_samples and
+            self.short.ratio >= self.on_threshold and
+            self.long.ratio >= self.long_threshold
+        ):
+            self.active = True
+        return self.active
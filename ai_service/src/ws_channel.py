@@ -0,0 +1,293 @@
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import websockets
+
+from config.config import (
+    WS_PING_INTERVAL, WS_PING_TIMEOUT, WS_RECONNECT_BASE_DELAY, WS_RECONNECT_MAX_DELAY,
+    WS_STABLE_AFTER, WS_SEND_QUEUE_SIZE, WS_MESSAGE_TTL
+)
+from .logger import setup_logger
+
+logger = setup_logger("ws_channel")
+
+Message = Union[str, bytes]
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _encode_json(message: Any) -> Message:
+    return message if isinstance(message, (str, bytes)) else json.dumps(message)
+
+
+class _Entry:
+    __slots__ = ("priority", "sequence", "key", "message", "created_at")
+
+    def __init__(self, priority: int, sequence: int, key: Optional[Hashable], message: Any, created_at: float):
+        self.priority = priority
+        self.sequence = sequence
+        self.key = key
+        self.message = message
+        self.created_at = created_at
+
+
+class CoalescingQueue:
+    """
+    Sınırlı kapasiteli öncelik kuyruğu.
+
+    Küçük öncelik değeri önce gönderilir; eşit öncelikte sıra korunur.
+    Aynı anahtarla bekleyen bir mesaj varsa yenisi onun yerine geçer
+    (ör. aynı olayın eski keyframe'i gönderilmez). Kuyruk doluyken en düşük
+    öncelikli en eski mesaj atılır; yeni mesaj ondan da düşük öncelikliyse
+    yeni mesaj atılır. `ttl` saniyeden eski mesajlar gönderilmeden atılır.
+    """
+
+    def __init__(self, maxsize: int = WS_SEND_QUEUE_SIZE, ttl: float = WS_MESSAGE_TTL):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._heap: List[Tuple[int, int, _Entry]] = []
+        self._by_key: Dict[Hashable, _Entry] = {}
+        self._live = 0
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self.stats = {"queued": 0, "coalesced": 0, "dropped": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return self._live
+
+    def put(self, message: Any, priority: int = 1, key: Optional[Hashable] = None):
+        """Mesajı kuyruğa ekler (beklemez)"""
+        now = time.monotonic()
+        if key is not None and key in self._by_key:
+            entry = self._by_key[key]
+            entry.message = message
+            entry.created_at = now
+            self.stats["coalesced"] += 1
+            return
+
+        if self._live >= self.maxsize:
+            self.stats["dropped"] += 1
+            victim = self._lowest()
+            if victim is None or victim.priority < priority:
+                return
+            self._discard(victim)
+
+        entry = _Entry(priority, next(self._sequence), key, message, now)
+        heapq.heappush(self._heap, (priority, entry.sequence, entry))
+        if key is not None:
+            self._by_key[key] = entry
+        self._live += 1
+        self.stats["queued"] += 1
+        self._ready.set()
+
+    def requeue(self, entry: _Entry):
+        """Gönderilemeyen mesajı sırasını koruyarak geri koyar"""
+        if entry.key is not None and entry.key in self._by_key:
+            return
+        heapq.heappush(self._heap, (entry.priority, entry.sequence, entry))
+        if entry.key is not None:
+            self._by_key[entry.key] = entry
+        self._live += 1
+        self._ready.set()
+
+    def _lowest(self) -> Optional[_Entry]:
+        """En düşük öncelikli, en eski mesaj"""
+        candidates = [entry for _, _, entry in self._heap if entry.message is not None]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda entry: (entry.priority, -entry.sequence))
+
+    def _discard(self, entry: _Entry):
+        # Yığından silmek yerine işaretlenir; get() atlar
+        entry.message = None
+        if entry.key is not None and self._by_key.get(entry.key) is entry:
+            del self._by_key[entry.key]
+        self._live -= 1
+
+    async def get(self) -> _Entry:
+        """Gönderilecek sıradaki mesajı bekler"""
+        while True:
+            while self._heap:
+                _, _, entry = heapq.heappop(self._heap)
+                if entry.message is None:
+                    continue
+                if entry.key is not None and self._by_key.get(entry.key) is entry:
+                    del self._by_key[entry.key]
+                self._live -= 1
+                if self.ttl and time.monotonic() - entry.created_at > self.ttl:
+                    self.stats["expired"] += 1
+                    continue
+                return entry
+            self._ready.clear()
+            await self._ready.wait()
+
+
+class WebSocketChannel:
+    """
+    Backend ile tek, kalıcı WebSocket bağlantısını arka planda yönetir.
+
+    - Bağlantı ping/pong ile canlı tutulur; kopunca jitter'lı üstel
+      beklemeyle yeniden kurulur. Bekleme yalnızca bağlantı `stable_after`
+      saniye açık kaldıysa veya sunucudan mesaj alındıysa sıfırlanır;
+      el sıkışmadan hemen sonra kapatan bir sunucu (ör. yetkilendirme
+      hatası) sürekli yeniden bağlanma döngüsüne sokmaz
+    - Gönderilecek mesajlar CoalescingQueue'da bekler; çağıran taraf
+      yalnızca kuyruğa ekler, ağ işlemini hiçbir zaman beklemez
+    - Gelen JSON mesajlar kayıtlı handler'lara iletilir
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        queue: Optional[CoalescingQueue] = None,
+        encoder: Callable[[Any], Message] = _encode_json,
+        ping_interval: float = WS_PING_INTERVAL,
+        ping_timeout: float = WS_PING_TIMEOUT,
+        base_delay: float = WS_RECONNECT_BASE_DELAY,
+        max_delay: float = WS_RECONNECT_MAX_DELAY,
+        stable_after: float = WS_STABLE_AFTER
+    ):
+        self.url = url
+        self.headers = headers or {}
+        self.queue = queue if queue is not None else CoalescingQueue()
+        self.encoder = encoder
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stable_after = stable_after
+        self.connection = None
+        self._received = False
+        self._handlers: List[Handler] = []
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"connects": 0, "disconnects": 0, "sent": 0, "sendErrors": 0}
+
+    @property
+    def connected(self) -> bool:
+        return self.connection is not None
+
+    def add_handler(self, handler: Handler):
+        """Gelen mesajları işleyecek fonksiyonu kaydeder"""
+        self._handlers.append(handler)
+
+    def send(self, message: Any, priority: int = 1, key: Optional[Hashable] = None):
+        """
+        Mesajı gönderim kuyruğuna ekler ve hemen döner.
+
+        Args:
+            message: Gönderim anında `encoder` ile kodlanacak mesaj
+            priority: Küçük değer önce gönderilir
+            key: Aynı anahtarlı bekleyen mesajın yerine geçer
+        """
+        self.queue.put(message, priority, key)
+
+    def start(self):
+        """Bağlantı yöneticisini arka plan görevi olarak başlatır"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Bağlantıyı kapatır ve görevi durdurur"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+            logger.info("WebSocket connection closed")
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            try:
+                self.connection = await websockets.connect(
+                    self.url,
+                    extra_headers=self.headers,
+                    ping_interval=self.ping_interval,
+                    ping_timeout=self.ping_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self._backoff(attempt)
+                attempt += 1
+                logger.error(f"WebSocket connection failed: {str(e)}", extra={"retryIn": round(delay, 1)})
+                await asyncio.sleep(delay)
+                continue
+
+            self.stats["connects"] += 1
+            self._received = False
+            connected_at = time.monotonic()
+            logger.info("WebSocket connection successful")
+            try:
+                await self._serve(self.connection)
+            finally:
+                self.connection = None
+                self.stats["disconnects"] += 1
+
+            if self._received or time.monotonic() - connected_at >= self.stable_after:
+                attempt = 0
+            delay = self._backoff(attempt)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _serve(self, connection):
+        """Bağlantı kapanana kadar gönderim ve alım döngülerini çalıştırır"""
+        tasks = [
+            asyncio.create_task(self._send_loop(connection)),
+            asyncio.create_task(self._receive_loop(connection))
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await connection.close()
+
+    async def _send_loop(self, connection):
+        while True:
+            entry = await self.queue.get()
+            try:
+                message = self.encoder(entry.message)
+            except Exception as e:
+                logger.error(f"Notification not encoded: {str(e)}")
+                continue
+            try:
+                await connection.send(message)
+                self.stats["sent"] += 1
+            except Exception as e:
+                # Mesaj kaybolmaz; bağlantı yenilendikten sonra tekrar denenir
+                self.stats["sendErrors"] += 1
+                self.queue.requeue(entry)
+                logger.error(f"Notification not sent via WebSocket: {str(e)}")
+                return
+
+    async def _receive_loop(self, connection):
+        try:
+            async for raw in connection:
+                self._received = True
+                if isinstance(raw, bytes):
+                    continue
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                for handler in self._handlers:
+                    try:
+                        await handler(data)
+                    except Exception as e:
+                        logger.error(f"WebSocket message not handled: {str(e)}")
+        except websockets.ConnectionClosed:
+            pass
@@ -1,57 +1,216 @@
+import argparse
 import base64
+import hashlib
 import json
-import psycopg2
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-# Veritabanı bağlantı bilgileri
-conn = psycopg2.connect(
-    dbname="smoke_detection_db",
-    user="postgres",
-    password="X2JNe&0tO6h.",
-    host="localhost",
-    port="5432"
-)
-
-# Çıktı klasörü oluştur
-output_dir = Path("decoded_images")
-output_dir.mkdir(exist_ok=True)
-
-try:
-    cur = conn.cursor()
-    
-    # Son tespitleri al
-    cur.execute("SELECT id, \"imageData\", \"detectedAt\" FROM detection_events ORDER BY \"detectedAt\" DESC")
-    rows = cur.fetchall()
-    
-    for row in rows:
-        detection_id = row[0]
-        image_data = row[1]
-        detected_at = row[2]
-        
-        # Base64 görüntüyü çöz
-        if isinstance(image_data, str):
-            image_data = json.loads(image_data)
-        
-        # Original ve annotated görüntüleri kaydet
-        for img_type in ['originalImage', 'annotatedImage']:
-            if img_type in image_data:
-                img_base64 = image_data[img_type]
-                
-                # Base64 başlığını kaldır
-                if ',' in img_base64:
-                    img_base64 = img_base64.split(',')[1]
-                
-                # Görüntüyü kaydet
-                img_bytes = base64.b64decode(img_base64)
-                
-                filename = f"{detection_id}_{img_type}_{detected_at.strftime('%Y%m%d_%H%M%S')}.jpg"
-                with open(output_dir / filename, 'wb') as f:
-                    f.write(img_bytes)
-                print(f"Kaydedildi: {filename}")
-
-finally:
-    cur.close()
-    conn.close()
-
-print("Tüm görüntüler başarıyla çözüldü ve kaydedildi.") 
\ No newline at end of file
+# Dışa aktarılan görüntü türleri
+IMAGE_TYPES = ['originalImage', 'annotatedImage']
+
+# Son dışa aktarılan kayıt (detectedAt, id); sonraki çalıştırma buradan devam eder.
+# detectedAt veritabanının kendi biçiminde saklanır (SQLite'ta metin olarak, olduğu gibi)
+WATERMARK_FILE = ".watermark.json"
+# İçerik özetleri (aynı görüntü ikinci kez yazılmaz); bellek yerine diskte tutulur
+HASHES_DIR = ".hashes"
+
+
+def connect_postgres():
+    """Veritabanı bağlantısı (ortam değişkenleri backend .env ile aynı isimleri kullanır)"""
+    import psycopg2
+
+    return psycopg2.connect(
+        dbname=os.getenv("DB_NAME", "smoke_detection_db"),
+        user=os.getenv("DB_USERNAME", "postgres"),
+        password=os.getenv("DB_PASSWORD", "X2JNe&0tO6h."),
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432")
+    )
+
+
+def load_watermark(output_dir: Path):
+    path = output_dir / WATERMARK_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("text"):
+        return data["detectedAt"], data["id"]
+    return datetime.fromisoformat(data["detectedAt"]), data["id"]
+
+
+def save_watermark(output_dir: Path, detected_at, detection_id):
+    """
+    Args:
+        detected_at: Veritabanının döndürdüğü değer; metinse (SQLite) aynen
+            saklanır ve sonraki sorguda aynen karşılaştırılır
+    """
+    path = output_dir / WATERMARK_FILE
+    tmp_path = path.with_suffix(".tmp")
+    is_text = isinstance(detected_at, str)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "detectedAt": detected_at if is_text else detected_at.isoformat(),
+            "text": is_text,
+            "id": str(detection_id)
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def iter_batches(conn, watermark, batch_size: int, is_sqlite: bool):
+    """
+    Tespitleri (detectedAt, id) sırasıyla ve parça parça okur.
+
+    PostgreSQL'de sunucu taraflı (isimli) cursor kullanılır; tüm tablo
+    belleğe alınmaz. Watermark verilmişse yalnızca ondan sonraki kayıtlar okunur.
+    """
+    placeholder = "?" if is_sqlite else "%s"
+    query = 'SELECT id, "imageData", "detectedAt" FROM detection_events'
+    params = ()
+    if watermark is not None:
+        query += f' WHERE ("detectedAt", id) > ({placeholder}, {placeholder})'
+        detected_at = watermark[0]
+        if is_sqlite and isinstance(detected_at, datetime):
+            # Eski biçimli watermark: SQLite zaman damgaları 'T' yerine boşluk kullanır
+            detected_at = str(detected_at)
+        params = (detected_at, watermark[1])
+    query += ' ORDER BY "detectedAt", id'
+
+    if is_sqlite:
+        cur = conn.cursor()
+    else:
+        cur = conn.cursor(name="decode_images_export")
+        cur.itersize = batch_size
+
+    try:
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cur.close()
+
+
+def claim_hash(output_dir: Path, digest: str) -> bool:
+    """
+    İçerik özetini kaydeder. Özet daha önce (bu veya önceki çalıştırmada)
+    görüldüyse False döner. Dosya O_EXCL ile oluşturulduğu için paralel
+    işçiler arasında da güvenlidir. Görüntü dosyası yazıldıktan sonra
+    çağrılır; arada kesilen bir çalıştırma görüntüyü kaybetmez.
+    """
+    marker = output_dir / HASHES_DIR / digest[:2] / digest
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+def parse_timestamp(value: str) -> datetime:
+    """SQLite metin zaman damgasını çözer ('2024-01-01 10:00:00.000 +00:00' biçimi dahil)"""
+    return datetime.fromisoformat(value.replace(" +", "+").replace(" -", "-"))
+
+
+def export_row(row, output_dir: Path, dedupe: bool):
+    """Bir tespitin görüntülerini çözüp diske yazar"""
+    detection_id, image_data, detected_at = row
+    if isinstance(detected_at, str):
+        detected_at = parse_timestamp(detected_at)
+
+    # Base64 görüntüyü çöz
+    if isinstance(image_data, str):
+        image_data = json.loads(image_data)
+    if not image_data:
+        return 0, 0
+
+    written = skipped = 0
+    # Original ve annotated görüntüleri kaydet
+    for img_type in IMAGE_TYPES:
+        img_base64 = image_data.get(img_type)
+        if not img_base64:
+            continue
+
+        # Base64 başlığını kaldır
+        if ',' in img_base64:
+            img_base64 = img_base64.split(',')[1]
+
+        img_bytes = base64.b64decode(img_base64)
+
+        # Görüntüyü kaydet
+        path = output_dir / f"{detection_id}_{img_type}_{detected_at.strftime('%Y%m%d_%H%M%S')}.jpg"
+        with open(path, 'wb') as f:
+            f.write(img_bytes)
+
+        # Aynı içerik daha önce yazıldıysa bu kopya silinir
+        if dedupe and not claim_hash(output_dir, hashlib.sha256(img_bytes).hexdigest()):
+            path.unlink(missing_ok=True)
+            skipped += 1
+            continue
+        written += 1
+    return written, skipped
+
+
+def export(conn, output_dir: Path, batch_size: int, workers: int, dedupe: bool,
+           incremental: bool, is_sqlite: bool):
+    """
+    Yeni tespitlerin görüntülerini dışa aktarır.
+
+    Her parça işçilere dağıtılır; parça tamamen yazıldıktan sonra watermark
+    güncellenir. Böylece bellekte en fazla bir parça tutulur ve yarıda kalan
+    bir çalıştırma kaldığı yerden devam eder.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    watermark = load_watermark(output_dir) if incremental else None
+
+    total_rows = total_written = total_skipped = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rows in iter_batches(conn, watermark, batch_size, is_sqlite):
+            for written, skipped in pool.map(lambda row: export_row(row, output_dir, dedupe), rows):
+                total_written += written
+                total_skipped += skipped
+            total_rows += len(rows)
+
+            last_id, _, last_detected_at = rows[-1]
+            if incremental:
+                save_watermark(output_dir, last_detected_at, last_id)
+            print(f"İşlenen tespit: {total_rows}, kaydedilen: {total_written}, atlanan (aynı içerik): {total_skipped}")
+
+    return total_rows, total_written, total_skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tespit görüntülerini veritabanından dışa aktarır")
+    parser.add_argument("--output", default="decoded_images", help="Çıktı klasörü")
+    parser.add_argument("--batch-size", type=int, default=500, help="Tek seferde okunan kayıt sayısı")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Paralel işçi sayısı")
+    parser.add_argument("--full", action="store_true", help="Watermark'ı yok say, tüm tabloyu dışa aktar")
+    parser.add_argument("--no-dedupe", action="store_true", help="Aynı içerikli görüntüleri de yaz")
+    parser.add_argument("--sqlite", help="PostgreSQL yerine SQLite veritabanı dosyası (test için)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.sqlite) if args.sqlite else connect_postgres()
+    try:
+        rows, written, skipped = export(
+            conn,
+            Path(args.output),
+            batch_size=args.batch_size,
+            workers=args.workers,
+            dedupe=not args.no_dedupe,
+            incremental=not args.full,
+            is_sqlite=bool(args.sqlite)
+        )
+    finally:
+        conn.close()
+
+    print(f"Tüm görüntüler başarıyla çözüldü ve kaydedildi. ({rows} tespit, {written} görüntü, {skipped} atlandı)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import { AppDataSource } from '../config/database';
 import { Camera } from '../models/Camera';
 import { Venue } from '../models/Venue';
 import { AuthError } from '../errors/AuthError';
+import { wsService } from '../app';
 
 export class CameraController {
     private cameraRepository = AppDataSource.getRepository(Camera);
@@ -200,6 +201,9 @@ export class CameraController {
             Object.assign(camera, updateData);
             await this.cameraRepository.save(camera);
 
+            // Çalışan AI servislerine yeni ayarları bildir
+            wsService.sendCameraConfigUpdate(camera);
+
             res.json({
                 ...camera,
                 message: 'Kamera başarıyla güncellendi'
@@ -284,6 +288,7 @@ export class CameraController {
             }
 
             await this.cameraRepository.save(camera);
+            wsService.sendCameraConfigUpdate(camera);
 
             res.json({
                 ...camera,
@@ -1,10 +1,17 @@
 import { Request, Response } from 'express';
+import { In } from 'typeorm';
 import { AppDataSource } from '../config/database';
 import { DetectionEvent } from '../models/DetectionEvent';
 import { Venue } from '../models/Venue';
 import { AuthError } from '../errors/AuthError';
 import { CreateDetectionDto, UpdateDetectionDto, DetectionQueryParams } from '../dtos/detection.dto';
 import { wsService } from '../app';
+import { promises as fs } from 'fs';
+import path from 'path';
+
+// Olay kliplerinin saklandığı klasör
+const CLIP_STORAGE_DIR = process.env.CLIP_STORAGE_DIR || path.join(process.cwd(), 'clips');
+const CLIP_ID_PATTERN = /^[A-Za-z0-9-]{1,64}$/;
 
 export class DetectionController {
     private detectionRepository = AppDataSource.getRepository(DetectionEvent);
@@ -169,6 +176,40 @@ export class DetectionController {
     // Yeni tespit oluşturma
     public createDetection = async (req: Request, res: Response): Promise<void> => {
         try {
+            // Toplu gönderim: AI servisi birden fazla tespiti tek istekte gönderebilir
+            if (Array.isArray(req.body)) {
+                const detectionsData: CreateDetectionDto[] = req.body;
+                const venueIds = [...new Set(detectionsData.map(item => item.venueId))];
+                const venues = await this.venueRepository.findBy({ id: In(venueIds) });
+
+                if (venues.length !== venueIds.length) {
+                    throw new AuthError(
+                        'Venue not found',
+                        404,
+                        'Mekan bulunamadı'
+                    );
+                }
+
+                const detections = this.detectionRepository.create(
+                    detectionsData.map(item => ({
+                        ...item,
+                        detectedAt: new Date(),
+                        status: 'pending' as const
+                    }))
+                );
+
+                await this.detectionRepository.save(detections);
+
+                detections.forEach(detection => wsService.sendDetectionNotification(detection));
+
+                res.status(201).json({
+                    count: detections.length,
+                    ids: detections.map(detection => detection.id),
+                    message: 'Tespitler başarıyla kaydedildi'
+                });
+                return;
+            }
+
             const detectionData: CreateDetectionDto = req.body;
 
             // Mekan kontrolü
@@ -217,6 +258,91 @@ export class DetectionController {
         }
     };
 
+    // Binary tespit oluşturma: görüntü base64 yerine ham JPEG olarak gelir
+    public createDetectionBinary = async (req: Request, res: Response): Promise<void> => {
+        const body = req.body as Buffer;
+
+        if (!Buffer.isBuffer(body) || body.length < 4) {
+            res.status(400).json({
+                success: false,
+                message: 'Geçersiz tespit verisi'
+            });
+            return;
+        }
+
+        try {
+            const headerLength = body.readUInt32BE(0);
+            const detectionData = JSON.parse(body.subarray(4, 4 + headerLength).toString('utf-8'));
+            const image = body.subarray(4 + headerLength).toString('base64');
+
+            const { variants = ['originalImage', 'processedImage', 'annotatedImage'], ...imageData } =
+                detectionData.imageData || {};
+            variants.forEach((variant: string) => {
+                imageData[variant] = image;
+            });
+            detectionData.imageData = imageData;
+
+            req.body = detectionData;
+        } catch (error) {
+            res.status(400).json({
+                success: false,
+                message: 'Geçersiz tespit verisi'
+            });
+            return;
+        }
+
+        await this.createDetection(req, res);
+    };
+
+    // Olay klibi parçası: parçalar sırayla yazılır, son parçada MP4 dosyası birleştirilir
+    public uploadClipChunk = async (req: Request, res: Response): Promise<void> => {
+        const { eventId } = req.params;
+        const index = parseInt(req.header('X-Chunk-Index') || '', 10);
+        const count = parseInt(req.header('X-Chunk-Count') || '', 10);
+        const body = req.body as Buffer;
+
+        if (!CLIP_ID_PATTERN.test(eventId) || !Buffer.isBuffer(body) ||
+            !Number.isInteger(index) || !Number.isInteger(count) || index < 0 || index >= count) {
+            res.status(400).json({
+                success: false,
+                message: 'Geçersiz klip verisi'
+            });
+            return;
+        }
+
+        try {
+            const partsDir = path.join(CLIP_STORAGE_DIR, `${eventId}.parts`);
+            await fs.mkdir(partsDir, { recursive: true });
+            // Aynı parça tekrar gönderilirse üzerine yazılır
+            await fs.writeFile(path.join(partsDir, `${index}`), body);
+
+            const received = (await fs.readdir(partsDir)).length;
+            if (received < count) {
+                res.status(202).json({ success: true, data: { received, count } });
+                return;
+            }
+
+            const clipPath = path.join(CLIP_STORAGE_DIR, `${eventId}.mp4`);
+            const chunks: Buffer[] = [];
+            for (let i = 0; i < count; i++) {
+                chunks.push(await fs.readFile(path.join(partsDir, `${i}`)));
+            }
+            await fs.writeFile(clipPath, Buffer.concat(chunks));
+            const metadata = req.header('X-Clip-Metadata');
+            if (metadata) {
+                await fs.writeFile(path.join(CLIP_STORAGE_DIR, `${eventId}.json`), metadata);
+            }
+            await fs.rm(partsDir, { recursive: true, force: true });
+
+            res.status(201).json({ success: true, data: { eventId, size: chunks.reduce((sum, chunk) => sum + chunk.length, 0) } });
+        } catch (error) {
+            res.status(500).json({
+                success: false,
+                message: 'Klip kaydedilirken bir hata oluştu'
+            });
+        }
+    };
+
     // Tespit güncelleme (işleme alma, yanlış alarm olarak işaretleme)
     public updateDetection = async (req: Request, res: Response): Promise<void> => {
         try {
@@ -18,10 +18,16 @@ export interface CreateDetectionDto {
         confidence: number;
         detectionSequences: number;
         fps: number;
+        // Güvene göre sıralı en iyi kutular (PAYLOAD_MAX_DETECTIONS)
+        detections?: {
+            boundingBox: { x1: number; y1: number; x2: number; y2: number };
+            confidence: number;
+            center: { x: number; y: number };
+        }[];
     };
     imageData: {
-        originalImage: string;
-        processedImage: string;
+        originalImage?: string;
+        processedImage?: string;
         annotatedImage: string;
         confidence: number;
     };
@@ -61,6 +67,12 @@ export interface DetectionResponseDto {
         confidence: number;
         detectionSequences: number;
         fps: number;
+        // Güvene göre sıralı en iyi kutular (PAYLOAD_MAX_DETECTIONS)
+        detections?: {
+            boundingBox: { x1: number; y1: number; x2: number; y2: number };
+            confidence: number;
+            center: { x: number; y: number };
+        }[];
     };
     status: 'pending' | 'notified' | 'handled' | 'false_alarm';
     detectedAt: Date;
@@ -68,8 +80,8 @@ export interface DetectionResponseDto {
     handledAt?: Date;
     notes?: string;
     imageData: {
-        originalImage: string;
-        processedImage: string;
+        originalImage?: string;
+        processedImage?: string;
         annotatedImage: string;
         confidence: number;
     };
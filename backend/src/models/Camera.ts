@@ -36,6 +36,19 @@ export class Camera {
     @Column({ default: true })
     smokeDetectionEnabled: boolean;
 
+    // AI servisinin çalışma sırasında uyguladığı tespit ayarları
+    @Column({ type: 'json', nullable: true })
+    detectionSettings: {
+        confidenceThreshold?: number;
+        alertCooldown?: number;
+        detectionThreshold?: number;
+        releaseThreshold?: number;
+        longWindowThreshold?: number;
+        eventKeyframeInterval?: number;
+        eventEndTimeout?: number;
+        resolution?: string;
+    };
+
     @Column({
         type: 'enum',
         enum: ['active', 'inactive', 'maintenance'],
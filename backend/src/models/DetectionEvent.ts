@@ -37,6 +37,12 @@ export class DetectionEvent {
         confidence: number;
         detectionSequences: number;
         fps: number;
+        // Güvene göre sıralı en iyi kutular (PAYLOAD_MAX_DETECTIONS)
+        detections?: {
+            boundingBox: { x1: number; y1: number; x2: number; y2: number };
+            confidence: number;
+            center: { x: number; y: number };
+        }[];
     };
 
     @Column({ type: 'timestamp' })
@@ -68,8 +74,8 @@ export class DetectionEvent {
 
     @Column({ type: 'json' })
     imageData: {
-        originalImage: string;
-        processedImage: string;
+        originalImage?: string;
+        processedImage?: string;
         annotatedImage: string;
         confidence: number;
     };
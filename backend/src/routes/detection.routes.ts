@@ -1,4 +1,4 @@
-import { Router } from 'express';
+import express, { Router } from 'express';
 import { DetectionController } from '../controllers/detection.controller';
 import { authenticateToken, authorize } from '../middleware/auth.middleware';
 import { UserRole } from '../models/enums/UserRole';
@@ -15,6 +15,20 @@ router.get('/:id', authenticateToken, detectionController.getDetectionById);
 
 // AI system route - requires special authentication
 router.post('/', authenticateToken, detectionController.createDetection);
+// Binary gövde: [4 byte JSON uzunluğu][JSON][JPEG] (base64 yerine ham görüntü)
+router.post(
+    '/binary',
+    authenticateToken,
+    express.raw({ type: 'application/octet-stream', limit: '50mb' }),
+    detectionController.createDetectionBinary
+);
+// Olay klibi: ham MP4 parçaları (X-Chunk-Index / X-Chunk-Count başlıklarıyla)
+router.post(
+    '/clips/:eventId/chunks',
+    authenticateToken,
+    express.raw({ type: 'application/octet-stream', limit: '10mb' }),
+    detectionController.uploadClipChunk
+);
 
 // Security staff and admin routes
 router.put(
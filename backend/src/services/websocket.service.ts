@@ -1,10 +1,17 @@
 import WebSocket from 'ws';
 import { Server } from 'http';
 import { DetectionEvent } from '../models/DetectionEvent';
+import { Camera } from '../models/Camera';
 import { UserRole } from '../models/enums/UserRole';
+import { verifyToken } from '../utils/jwt.utils';
+
+// Kullanıcı arayüzü bağlantıları '?token=' ile, AI servisi '/ai' yolunda
+// HTTP istekleriyle aynı 'Authorization: Bearer <JWT>' başlığıyla bağlanır
+type ClientKind = 'user' | 'ai';
 
 interface WebSocketClient {
     ws: WebSocket;
+    kind: ClientKind;
     userId: string;
     role: UserRole;
     venueId?: string;
@@ -21,6 +28,11 @@ export class WebSocketService {
 
     private initialize() {
         this.wss.on('connection', (ws: WebSocket, req: any) => {
+            if (req.url?.startsWith('/ai')) {
+                this.registerAiClient(ws, req);
+                return;
+            }
+
             // Token ve kullanıcı bilgilerini al
             const token = req.url?.split('token=')[1];
             if (!token) {
@@ -34,30 +46,14 @@ export class WebSocketService {
                 const clientId = req.headers['sec-websocket-key'];
 
                 // Client'ı kaydet
-                this.clients.set(clientId, {
+                this.registerClient(clientId, {
                     ws,
+                    kind: 'user',
                     userId,
                     role: role as UserRole,
                     venueId: venueId === 'undefined' ? undefined : venueId
                 });
 
-                console.log(`Yeni WebSocket bağlantısı: ${clientId} (${role})`);
-
-                ws.send(JSON.stringify({
-                    type: 'connection',
-                    message: 'WebSocket bağlantısı başarılı'
-                }));
-
-                ws.on('close', () => {
-                    this.clients.delete(clientId);
-                    console.log(`WebSocket bağlantısı kapandı: ${clientId}`);
-                });
-
-                ws.on('error', (error) => {
-                    console.error(`WebSocket hatası (${clientId}):`, error);
-                    this.clients.delete(clientId);
-                });
-
             } catch (error) {
                 console.error('WebSocket bağlantı hatası:', error);
                 ws.close(1008, 'Yetkilendirme başarısız');
@@ -65,10 +61,59 @@ export class WebSocketService {
         });
     }
 
-    // Yetkili client'lara mesaj gönder
-    private sendToAuthorizedClients(data: any, venueId?: string) {
+    // AI servisi bağlantısı: REST uçlarıyla aynı JWT doğrulaması
+    private registerAiClient(ws: WebSocket, req: any) {
+        const authHeader = req.headers['authorization'];
+        const token = authHeader && authHeader.split(' ')[1];
+        if (!token) {
+            ws.close(1008, 'Yetkilendirme başarısız');
+            return;
+        }
+
+        try {
+            const decoded = verifyToken(token);
+            this.registerClient(req.headers['sec-websocket-key'], {
+                ws,
+                kind: 'ai',
+                userId: decoded.userId,
+                role: decoded.role,
+                venueId: decoded.venueId
+            });
+        } catch (error) {
+            console.error('AI servisi WebSocket yetkilendirme hatası:', error);
+            ws.close(1008, 'Yetkilendirme başarısız');
+        }
+    }
+
+    private registerClient(clientId: string, client: WebSocketClient) {
+        const { ws } = client;
+        this.clients.set(clientId, client);
+
+        console.log(`Yeni WebSocket bağlantısı: ${clientId} (${client.kind === 'ai' ? 'ai' : client.role})`);
+
+        ws.send(JSON.stringify({
+            type: 'connection',
+            message: 'WebSocket bağlantısı başarılı'
+        }));
+
+        ws.on('close', () => {
+            this.clients.delete(clientId);
+            console.log(`WebSocket bağlantısı kapandı: ${clientId}`);
+        });
+
+        ws.on('error', (error) => {
+            console.error(`WebSocket hatası (${clientId}):`, error);
+            this.clients.delete(clientId);
+        });
+    }
+
+    // Mekanı görme yetkisi olan client'lara mesaj gönder
+    private sendToClients(kind: ClientKind, data: any, venueId?: string) {
         this.clients.forEach((client) => {
             const { ws, role, venueId: clientVenueId } = client;
+            if (client.kind !== kind) {
+                return;
+            }
 
             // Sistem yöneticileri her şeyi görebilir
             if (role === UserRole.SYSTEM_ADMIN) {
@@ -87,6 +132,16 @@ export class WebSocketService {
         });
     }
 
+    // Yetkili kullanıcı client'larına mesaj gönder
+    private sendToAuthorizedClients(data: any, venueId?: string) {
+        this.sendToClients('user', data, venueId);
+    }
+
+    // AI servisi bağlantılarına mesaj gönder
+    private sendToAiClients(data: any, venueId?: string) {
+        this.sendToClients('ai', data, venueId);
+    }
+
     // Yeni tespit bildirimi gönder
     public sendDetectionNotification(detection: DetectionEvent) {
         const notificationData = {
@@ -108,6 +163,17 @@ export class WebSocketService {
         this.sendToAuthorizedClients(notificationData, detection.venueId);
     }
 
+    // Kamera ayarı güncellemesi gönder (AI servisi yeniden başlatılmadan uygular)
+    public sendCameraConfigUpdate(camera: Camera) {
+        const configData = {
+            type: 'camera_config',
+            data: camera
+        };
+
+        this.sendToAiClients(configData, camera.venueId);
+        this.sendToAuthorizedClients(configData, camera.venueId);
+    }
+
     // İstatistik güncellemesi gönder
     public sendStatisticsUpdate(statistics: any, venueId?: string) {
         const statsData = {